@@ -29,7 +29,7 @@ from app.config import settings
 
 # Override the sqlalchemy.url with our settings
 # Convert async URL to sync URL for Alembic
-sync_url = settings.DATABASE_URL.replace("+asyncpg", "").replace("?ssl=require", "?sslmode=require")
+sync_url = settings.DATABASE_URL.replace("+asyncpg", "").replace("+aiosqlite", "").replace("?ssl=require", "?sslmode=require")
 config.set_main_option("sqlalchemy.url", sync_url)
 
 # other values from the config, defined by the needs of env.py,
@@ -77,7 +77,10 @@ def run_migrations_online() -> None:
 
     with connectable.connect() as connection:
         context.configure(
-            connection=connection, target_metadata=target_metadata
+            connection=connection,
+            target_metadata=target_metadata,
+            # SQLite can't ALTER columns or constraints, autogenerate batch operations for it
+            render_as_batch=connection.dialect.name == "sqlite",
         )
 
         with context.begin_transaction():
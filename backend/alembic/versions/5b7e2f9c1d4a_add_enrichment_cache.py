@@ -0,0 +1,39 @@
+"""add_enrichment_cache
+
+Revision ID: 5b7e2f9c1d4a
+Revises: 0c8b3cd35538
+Create Date: 2026-10-16 10:12:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e2f9c1d4a'
+down_revision: Union[str, None] = '0c8b3cd35538'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the domain-keyed website enrichment cache."""
+    op.create_table(
+        'enrichment_cache',
+        sa.Column('domain', sa.String(), nullable=False),
+        sa.Column('emails', sa.JSON(), nullable=False),
+        sa.Column('phones', sa.JSON(), nullable=False),
+        sa.Column('found', sa.Boolean(), nullable=False),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('domain')
+    )
+    op.create_index(op.f('ix_enrichment_cache_expires_at'), 'enrichment_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the website enrichment cache."""
+    op.drop_index(op.f('ix_enrichment_cache_expires_at'), table_name='enrichment_cache')
+    op.drop_table('enrichment_cache')
@@ -0,0 +1,51 @@
+"""add_job_queue
+
+Revision ID: 8d3a6e1f4b27
+Revises: 5b7e2f9c1d4a
+Create Date: 2026-10-16 14:37:05.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d3a6e1f4b27'
+down_revision: Union[str, None] = '5b7e2f9c1d4a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the durable job queue claimed by workers with row leases."""
+    op.create_table(
+        'job_queue',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=True),
+        sa.Column('kind', sa.String(), nullable=False),
+        sa.Column('payload', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('attempts', sa.Integer(), nullable=False),
+        sa.Column('available_at', sa.DateTime(), nullable=False),
+        sa.Column('locked_by', sa.String(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['search_jobs.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_job_queue_job_id'), 'job_queue', ['job_id'], unique=False)
+    op.create_index(op.f('ix_job_queue_status'), 'job_queue', ['status'], unique=False)
+    op.create_index(op.f('ix_job_queue_lease_expires_at'), 'job_queue', ['lease_expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the job queue."""
+    op.drop_index(op.f('ix_job_queue_lease_expires_at'), table_name='job_queue')
+    op.drop_index(op.f('ix_job_queue_status'), table_name='job_queue')
+    op.drop_index(op.f('ix_job_queue_job_id'), table_name='job_queue')
+    op.drop_table('job_queue')
@@ -0,0 +1,30 @@
+"""add_search_job_cacheable
+
+Revision ID: a9d3e5c71b24
+Revises: f2b86d1e0a45
+Create Date: 2026-10-17 14:36:52.108734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9d3e5c71b24'
+down_revision: Union[str, None] = 'f2b86d1e0a45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Flag jobs whose results the query result cache may serve."""
+    with op.batch_alter_table('search_jobs') as batch_op:
+        batch_op.add_column(sa.Column('cacheable', sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the query result cache flag."""
+    with op.batch_alter_table('search_jobs') as batch_op:
+        batch_op.drop_column('cacheable')
@@ -0,0 +1,41 @@
+"""add_job_checkpoints
+
+Revision ID: c4f19b7a2e63
+Revises: 8d3a6e1f4b27
+Create Date: 2026-10-16 21:05:48.907126
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4f19b7a2e63'
+down_revision: Union[str, None] = '8d3a6e1f4b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add per-listing checkpoints for resuming interrupted search jobs."""
+    op.create_table(
+        'job_checkpoints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('place_key', sa.String(), nullable=False),
+        sa.Column('business', sa.JSON(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['search_jobs.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('job_id', 'place_key', name='uq_job_checkpoints_job_place')
+    )
+    op.create_index(op.f('ix_job_checkpoints_job_id'), 'job_checkpoints', ['job_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the search job checkpoints."""
+    op.drop_index(op.f('ix_job_checkpoints_job_id'), table_name='job_checkpoints')
+    op.drop_table('job_checkpoints')
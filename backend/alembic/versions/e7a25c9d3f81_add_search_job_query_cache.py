@@ -0,0 +1,36 @@
+"""add_search_job_query_cache
+
+Revision ID: e7a25c9d3f81
+Revises: c4f19b7a2e63
+Create Date: 2026-10-16 21:48:12.604377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a25c9d3f81'
+down_revision: Union[str, None] = 'c4f19b7a2e63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Track normalized query keys and completion times for the query result cache."""
+    with op.batch_alter_table('search_jobs') as batch_op:
+        batch_op.add_column(sa.Column('query_key', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('completed_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('cached_from_job_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_search_jobs_query_key'), ['query_key'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the query result cache columns."""
+    with op.batch_alter_table('search_jobs') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_search_jobs_query_key'))
+        batch_op.drop_column('cached_from_job_id')
+        batch_op.drop_column('completed_at')
+        batch_op.drop_column('query_key')
@@ -0,0 +1,38 @@
+"""add_worker_metrics
+
+Revision ID: f2b86d1e0a45
+Revises: e7a25c9d3f81
+Create Date: 2026-10-17 10:12:37.418205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b86d1e0a45'
+down_revision: Union[str, None] = 'e7a25c9d3f81'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add the metrics snapshots published by job worker processes."""
+    op.create_table(
+        'worker_metrics',
+        sa.Column('worker_id', sa.String(), nullable=False),
+        sa.Column('role', sa.String(), nullable=False),
+        sa.Column('stats', sa.JSON(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('worker_id')
+    )
+    op.create_index(op.f('ix_worker_metrics_updated_at'), 'worker_metrics', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Drop the worker metrics snapshots."""
+    op.drop_index(op.f('ix_worker_metrics_updated_at'), table_name='worker_metrics')
+    op.drop_table('worker_metrics')
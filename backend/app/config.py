@@ -2,6 +2,7 @@ from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
     DATABASE_URL: str = "postgresql+asyncpg://user:password@db:5432/scraper_db"
+    DATABASE_POOL_SIZE: int = 0  # Connections per process; 0 means 5, or enough for JOB_WORKER_CONCURRENCY jobs where they run
     TWILIO_ACCOUNT_SID: str
     TWILIO_AUTH_TOKEN: str
     TWILIO_WHATSAPP_NUMBER: str
@@ -41,6 +42,100 @@ class Settings(BaseSettings):
     ADMIN_EMAIL: str = "admin@scrappy.com"
     ADMIN_PASSWORD: str = "change-this-password"
 
+    # Browser Pool Configuration
+    BROWSER_POOL_SIZE: int = 2  # Long-lived Chromium processes per worker
+    BROWSER_POOL_CONTEXTS_PER_BROWSER: int = 2  # Concurrent jobs per browser
+    BROWSER_POOL_MAX_JOBS_PER_BROWSER: int = 50  # Recycle a browser after this many jobs
+    BROWSER_POOL_HEALTH_CHECK_INTERVAL: int = 60  # seconds
+    BROWSER_POOL_ACQUIRE_TIMEOUT: int = 300  # seconds to wait for a free slot
+
+    # Google Maps Scraper Configuration
+    MAPS_SCRAPER_ENGINE: str = "async"  # 'async' (event loop + browser pool) or 'sync' (thread fallback)
+    MAPS_SYNC_FALLBACK_WORKERS: int = 2  # Threads shared by all sync fallback scrapes
+    MAPS_DETAIL_TABS: int = 1  # Default tabs per job for opening detail pages concurrently
+    MAPS_MAX_DETAIL_TABS: int = 8  # Upper bound for a job's detail_tabs
+    MAPS_PARSE_NETWORK_PAYLOADS: bool = True  # Decode businesses from search XHRs, DOM is the fallback
+    MAPS_PAYLOAD_DUMP_DIR: str = ""  # Save raw search/place XHR bodies here, for refreshing the decoder's test fixture
+    MAPS_READY_TIMEOUT_MS: int = 30000  # Cap for the search box to become usable
+    MAPS_RESULTS_TIMEOUT_MS: int = 45000  # One deadline for any result selector to appear
+    MAPS_DETAIL_TIMEOUT_MS: int = 10000  # One deadline for any detail-panel selector to appear
+    MAPS_SETTLE_TIMEOUT_MS: int = 3000  # Cap for search XHRs to go quiet after results appear
+    MAPS_SCROLL_TIMEOUT_MS: int = 4000  # Cap for new results to render after a scroll
+    MAPS_POLITENESS_MIN_MS: int = 250  # Random pause between page actions (0 disables)
+    MAPS_POLITENESS_MAX_MS: int = 1000
+    MAPS_BLOCK_RESOURCES: bool = True  # Abort requests not needed to read the side panel
+    MAPS_BLOCKED_RESOURCE_TYPES: str = "image,media,font"  # Comma-separated Playwright resource types
+    MAPS_EXTRA_BLOCKED_URL_PATTERNS: str = ""  # Comma-separated URL fragments added to the defaults
+
+    # HTTP Client Configuration (website enrichment)
+    HTTP_MAX_CONNECTIONS: int = 100  # Total open connections in the shared client
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20  # Idle connections kept for reuse
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0  # seconds an idle connection is kept
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 4  # Concurrent requests to one host
+    HTTP_TIMEOUT: float = 30.0  # seconds
+    HTTP_CONNECT_TIMEOUT: float = 10.0  # seconds
+    HTTP_ENABLE_HTTP2: bool = True  # Negotiate HTTP/2 when the server supports it
+
+    # Website Enrichment Configuration
+    ENRICHMENT_CONCURRENCY: int = 10  # Websites scraped in parallel across all jobs
+    ENRICHMENT_MAX_PER_HOST: int = 2  # Websites on one host scraped in parallel
+    ENRICHMENT_MAX_BODY_BYTES: int = 2_000_000  # Stop reading a page after this many bytes
+    ENRICHMENT_EARLY_EXIT_EMAILS: int = 1  # Stop reading a page once this many emails...
+    ENRICHMENT_EARLY_EXIT_PHONES: int = 1  # ...and this many phones were found (callers use the first of each)
+    ENRICHMENT_ALLOWED_CONTENT_TYPES: str = "text/html,application/xhtml+xml,text/plain"  # Others are skipped
+    ENRICHMENT_CRAWL_PAGES: int = 3  # Likely contact pages fetched when the homepage has no email (0 disables)
+    ENRICHMENT_CRAWL_HTML_BYTES: int = 500_000  # Homepage characters kept for link parsing
+    ENRICHMENT_LATENCY_WINDOW: int = 50  # Recent fetch times kept per host for adaptive timeouts
+    ENRICHMENT_LATENCY_MIN_SAMPLES: int = 5  # Samples needed before a host's own percentiles are used
+    ENRICHMENT_TIMEOUT_MULTIPLIER: float = 3.0  # Fetch timeout = p95 fetch time x this, capped at HTTP_TIMEOUT
+    ENRICHMENT_MIN_TIMEOUT: float = 5.0  # seconds, floor for adaptive timeouts
+    ENRICHMENT_HEDGING_ENABLED: bool = True  # Race an http:// or www. variant when the first attempt stalls
+    ENRICHMENT_HEDGE_DELAY: float = 3.0  # seconds before hedging, until enough latency samples exist
+    ENRICHMENT_HEDGE_PERCENTILE: float = 90  # Hedge once the first attempt is slower than this percentile
+    ENRICHMENT_RENDER_ENABLED: bool = True  # Render JS-only sites in a headless browser when static HTML has no email
+    ENRICHMENT_RENDER_CONCURRENCY: int = 2  # Rendered fetches in parallel across all jobs
+    ENRICHMENT_RENDER_TIMEOUT_MS: int = 15000  # Navigation timeout for a rendered fetch
+    ENRICHMENT_RENDER_IDLE_SECONDS: int = 60  # Return the shared browser context to the pool after this idle time
+    ENRICHMENT_RENDER_ACQUIRE_TIMEOUT: float = 5.0  # seconds to wait for a render slot/browser context before keeping the static result
+    ENRICHMENT_CACHE_ENABLED: bool = True  # Reuse contact info per registrable domain across jobs
+    ENRICHMENT_CACHE_MAX_ENTRIES: int = 10000  # In-memory LRU size
+    ENRICHMENT_CACHE_MEMORY_TTL: int = 3600  # seconds an entry stays in memory
+    ENRICHMENT_CACHE_TTL: int = 604800  # seconds a DB entry with contacts stays valid (7 days)
+    ENRICHMENT_CACHE_NEGATIVE_TTL: int = 86400  # seconds a "nothing found" DB entry stays valid
+
+    # Host Health Configuration (website enrichment)
+    HOST_DNS_TIMEOUT: float = 3.0  # seconds before a website's DNS lookup counts as failed
+    HOST_DNS_CACHE_SIZE: int = 10000  # Hosts kept in the DNS check and negative caches
+    HOST_DNS_MAX_TTL: int = 3600  # Upper bound on how long a passed DNS check is reused (the HTTP client resolves on its own)
+    HOST_NEGATIVE_TTL: int = 3600  # seconds NXDOMAIN/connection-refused hosts are skipped
+    HOST_CIRCUIT_FAILURE_THRESHOLD: int = 3  # Consecutive timeouts/connection errors before a host is skipped
+    HOST_CIRCUIT_COOLDOWN: int = 300  # seconds a host's circuit stays open before a trial request
+
+    # Job Queue Configuration
+    JOB_WORKER_CONCURRENCY: int = 2  # Scrape jobs run at once per worker process
+    JOB_WORKERS_IN_API: bool = False  # Also run queue workers inside the API process (single-process deployments)
+    JOB_WORKER_PROCESS: bool = False  # Set by `python -m app.worker`, not meant to be configured
+    JOB_LEASE_SECONDS: int = 120  # A job whose worker stops heartbeating is reclaimed after this
+    JOB_HEARTBEAT_INTERVAL: int = 30  # seconds between lease renewals
+    JOB_POLL_INTERVAL: float = 2.0  # seconds an idle worker waits before polling the queue again
+    JOB_MAX_ATTEMPTS: int = 3  # Runs per job before it is marked failed
+    JOB_RETRY_BACKOFF: int = 60  # seconds, multiplied by the attempt number
+    JOB_CHECKPOINTS_ENABLED: bool = True  # Checkpoint each listing so an interrupted job resumes where it stopped
+    WORKER_METRICS_INTERVAL: int = 15  # seconds between metrics snapshots published by job worker processes
+
+    # Search Pipeline Configuration
+    PIPELINE_QUEUE_SIZE: int = 20  # Businesses buffered between stages; a full queue pauses the stage before it
+    PIPELINE_ENRICH_CONCURRENCY: int = 10  # Websites enriched at once per job (ENRICHMENT_CONCURRENCY still caps all jobs)
+    PIPELINE_PERSIST_CONCURRENCY: int = 2  # Businesses saved at once per job, each holds a DB connection
+
+    # Query Result Cache Configuration
+    QUERY_CACHE_ENABLED: bool = True  # Serve identical searches from a recent completed job's results
+    QUERY_CACHE_TTL: int = 21600  # seconds a completed search's results are reused (6 hours)
+
+    # Phone Normalization Configuration
+    DEFAULT_PHONE_REGION: str = "US"  # ISO region for national numbers when the query/address names no country
+    PHONE_NORMALIZATION_CACHE_SIZE: int = 50000  # Memoized (phone, region) parses
+
     class Config:
         env_file = ".env"
 
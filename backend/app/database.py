@@ -4,10 +4,27 @@ from sqlalchemy import text
 from app.config import settings
 import asyncio
 
+API_POOL_SIZE = 5  # Smaller pool for cloud DB
+
+def runs_job_workers() -> bool:
+    """Whether this process runs the job queue workers (the worker, or the API with JOB_WORKERS_IN_API)"""
+    return settings.JOB_WORKER_PROCESS or settings.JOB_WORKERS_IN_API
+
+def default_pool_size() -> int:
+    """
+    Connections a process can need at once: a few for API requests, plus, where
+    job workers run, per running job its enrichment cache lookups, persist
+    workers, checkpoint write and job row session
+    """
+    if not runs_job_workers():
+        return API_POOL_SIZE
+    per_job = settings.PIPELINE_ENRICH_CONCURRENCY + settings.PIPELINE_PERSIST_CONCURRENCY + 2
+    return API_POOL_SIZE + settings.JOB_WORKER_CONCURRENCY * per_job
+
 # Create engine with improved connection pooling for cloud databases
 engine = create_async_engine(
     settings.DATABASE_URL,
-    pool_size=5,           # Smaller pool for cloud DB
+    pool_size=settings.DATABASE_POOL_SIZE or default_pool_size(),  # Opened on demand, idle processes stay small
     max_overflow=0,        # No overflow for stability
     pool_pre_ping=True,    # Validates connections before use
     pool_recycle=300,      # Recycle connections every 5 minutes
@@ -20,6 +37,23 @@ AsyncSessionLocal = sessionmaker(
     expire_on_commit=False
 )
 
+# Job queue claims, lease heartbeats and worker metrics get their own small pool,
+# so they never wait behind busy scrape jobs and let leases expire
+queue_engine = create_async_engine(
+    settings.DATABASE_URL,
+    pool_size=settings.JOB_WORKER_CONCURRENCY + 1,  # a claim or heartbeat per worker, plus metrics
+    max_overflow=0,
+    pool_pre_ping=True,
+    pool_recycle=300,
+    echo=False
+)
+
+QueueSessionLocal = sessionmaker(
+    queue_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
 Base = declarative_base()
 
 async def get_db():
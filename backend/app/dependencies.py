@@ -7,13 +7,11 @@ from app.utils.loggers import logger
 import re
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from app.services.auth import auth_service
+from app.services.phone_normalization import normalize_phone
 
 # Email validation regex
 EMAIL_REGEX = r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$"
 
-# Phone validation regex (supports various formats)
-PHONE_REGEX = r"^(\+?1[-.\s]?)?(\(?[0-9]{3}\)?[-.\s]?[0-9]{3}[-.\s]?[0-9]{4}|\+?[1-9]\d{1,14})$"
-
 security = HTTPBearer()
 
 async def get_search_job(
@@ -51,25 +49,17 @@ def validate_email(email: str) -> bool:
     """Validate email format"""
     return bool(re.match(EMAIL_REGEX, email))
 
-def validate_phone(phone: str) -> bool:
+def validate_phone(phone: str, region: str = None) -> bool:
     """Validate phone format"""
-    # Remove common phone formatting characters
-    clean_phone = re.sub(r'[-.\s()]', '', phone)
-    return bool(re.match(PHONE_REGEX, clean_phone))
+    return normalize_phone(phone, region) is not None
 
-def sanitize_phone(phone: str) -> str:
-    """Sanitize phone number to standard format"""
-    # Remove all non-digit characters except +
-    clean = re.sub(r'[^\d+]', '', phone)
-    
-    # Add country code if missing
-    if not clean.startswith('+'):
-        if len(clean) == 10:
-            clean = '+1' + clean  # US default
-        elif len(clean) == 11 and clean.startswith('1'):
-            clean = '+' + clean
-    
-    return clean
+def sanitize_phone(phone: str, region: str = None) -> str:
+    """Sanitize phone number to E.164, national numbers are read in region (DEFAULT_PHONE_REGION if None)"""
+    normalized = normalize_phone(phone, region)
+    if normalized:
+        return normalized
+    # Not a valid number - keep just the digits and + so callers still get a comparable string
+    return re.sub(r'[^\d+]', '', phone)
 
 def validate_message_template(template: str) -> bool:
     """Validate message template has required placeholders"""
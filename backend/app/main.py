@@ -4,9 +4,12 @@ import sys
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import RedirectResponse
-from app.routers import search, export, auth
+from app.routers import search, export, auth, metrics
 from app.dependencies import require_auth
 from app.config import settings
+from app.worker import start_worker, stop_worker
+from app.services.worker_metrics import worker_metrics
+from app.utils.loggers import logger
 
 # Windows-specific event loop fix - MUST BE AT TOP LEVEL
 if sys.platform == "win32":
@@ -37,6 +40,30 @@ app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(search.router, prefix="/api/search", dependencies=[Depends(require_auth)])
 app.include_router(import_module.router, prefix="/api/import", dependencies=[Depends(require_auth)])
 app.include_router(export.router, prefix="/api/export", dependencies=[Depends(require_auth)])
+app.include_router(metrics.router, prefix="/api/metrics", tags=["Metrics"], dependencies=[Depends(require_auth)])
+
+@app.on_event("startup")
+async def startup():
+    # Scrape jobs run in `python -m app.worker`; single-process deployments can run them here
+    if settings.JOB_WORKERS_IN_API:
+        await start_worker(role="api")
+        return
+
+    try:
+        live_workers = await worker_metrics.live_workers()
+    except Exception as e:
+        logger.warning(f"Could not check for running job workers: {str(e)}")
+        return
+    if not live_workers:
+        logger.warning(
+            "No job worker is running and JOB_WORKERS_IN_API is false: search jobs will stay queued "
+            "until `python -m app.worker` is started (or set JOB_WORKERS_IN_API=true for a single process)"
+        )
+
+@app.on_event("shutdown")
+async def shutdown():
+    if settings.JOB_WORKERS_IN_API:
+        await stop_worker()
 
 @app.get("/")
 async def root():
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, ForeignKey, Float, Text
+from sqlalchemy import Column, Integer, String, JSON, DateTime, Boolean, ForeignKey, Float, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 from app.database import Base
 import datetime
 
+
 class SearchJob(Base):
     __tablename__ = "search_jobs"
     
@@ -15,10 +16,15 @@ class SearchJob(Base):
     prewritten_message = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.datetime.utcnow)
     status = Column(String, default="pending")  # pending, processing, completed, failed
+    query_key = Column(String, nullable=True, index=True)  # Normalized search options for the result cache
+    completed_at = Column(DateTime, nullable=True)  # When the results were scraped
+    cached_from_job_id = Column(Integer, nullable=True)  # Job the results were copied from on a cache hit
+    cacheable = Column(Boolean, default=False)  # Completed with real listings, not fallback sample data
     
     results = relationship("ScrapeResult", back_populates="job")
     messages = relationship("OutreachMessage", back_populates="job")
 
+
 class ScrapeResult(Base):
     __tablename__ = "scrape_results"
     
@@ -52,6 +58,7 @@ class ScrapeResult(Base):
     
     job = relationship("SearchJob", back_populates="results")
 
+
 class OutreachMessage(Base):
     __tablename__ = "outreach_messages"
     
@@ -64,4 +71,55 @@ class OutreachMessage(Base):
     sent_at = Column(DateTime, nullable=True)
     error = Column(String, nullable=True)
     
-    job = relationship("SearchJob", back_populates="messages")
\ No newline at end of file
+    job = relationship("SearchJob", back_populates="messages")
+
+
+class EnrichmentCacheEntry(Base):
+    __tablename__ = "enrichment_cache"
+    
+    domain = Column(String, primary_key=True)  # Normalized registrable domain
+    emails = Column(JSON, nullable=False, default=list)
+    phones = Column(JSON, nullable=False, default=list)
+    found = Column(Boolean, nullable=False, default=False)  # False marks a negative result
+    fetched_at = Column(DateTime, default=datetime.datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class JobQueueEntry(Base):
+    __tablename__ = "job_queue"
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("search_jobs.id"), index=True)
+    kind = Column(String, nullable=False, default="search")  # Handler that runs the entry
+    payload = Column(JSON, nullable=False, default=dict)  # Handler arguments, e.g. the SearchRequest
+    status = Column(String, nullable=False, default="queued", index=True)  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)  # Retry backoff
+    locked_by = Column(String, nullable=True)  # Worker holding the lease
+    lease_expires_at = Column(DateTime, nullable=True, index=True)
+    heartbeat_at = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class JobCheckpoint(Base):
+    __tablename__ = "job_checkpoints"
+    __table_args__ = (UniqueConstraint("job_id", "place_key", name="uq_job_checkpoints_job_place"),)
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("search_jobs.id"), index=True, nullable=False)
+    place_key = Column(String, nullable=False)  # place_id, else place URL, else name|address
+    business = Column(JSON, nullable=False)  # Scraped business, final values once done
+    status = Column(String, nullable=False, default="extracted")  # extracted, done
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, onupdate=datetime.datetime.utcnow)
+
+
+class WorkerMetrics(Base):
+    __tablename__ = "worker_metrics"
+    
+    worker_id = Column(String, primary_key=True)  # host:pid of the process
+    role = Column(String, nullable=False, default="worker")  # worker, or api when it runs job workers itself
+    stats = Column(JSON, nullable=False, default=dict)  # Latest /api/metrics-style snapshot of the process
+    started_at = Column(DateTime, default=datetime.datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.datetime.utcnow, index=True)
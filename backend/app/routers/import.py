@@ -7,6 +7,7 @@ from app.database import get_db
 from app.models import SearchJob, OutreachMessage
 from app.schemas import GoogleSheetImportRequest
 from app.utils.loggers import logger
+from app.services.phone_normalization import normalize_phones, region_hint
 
 router = APIRouter()
 
@@ -25,19 +26,28 @@ async def import_csv(file: UploadFile = File(...), db: AsyncSession = Depends(ge
     db.add(job)
     await db.commit()
     
-    for row in reader:
+    rows = list(reader)
+    # Normalize every phone to E.164 in one pass, reading national numbers in the row's country
+    phones = normalize_phones(
+        [row.get("phone") for row in rows],
+        [region_hint(row.get("country"), row.get("address")) for row in rows]
+    )
+    
+    for row, phone in zip(rows, phones):
         # Add each row as an outreach target
         if "phone" in row or "email" in row:
             message = "Custom message"  # Use default or template
             
-            if row.get("phone"):
+            if phone:
                 outreach = OutreachMessage(
                     job_id=job.id,
                     contact_method="whatsapp",
-                    recipient=row["phone"],
+                    recipient=phone,
                     message=message
                 )
                 db.add(outreach)
+            elif row.get("phone"):
+                logger.warning(f"Skipping invalid phone number in CSV import: {row['phone']}")
                 
             if row.get("email"):
                 outreach = OutreachMessage(
@@ -71,9 +81,14 @@ async def import_google_sheets(request: GoogleSheetImportRequest, db: AsyncSessi
         db.add(job)
         await db.commit()
         
+        phones = normalize_phones(
+            [contact.get('phone') for contact in contacts],
+            [region_hint(contact.get('address')) for contact in contacts]
+        )
+        
         # Process each contact
         imported_count = 0
-        for contact in contacts:
+        for contact, phone in zip(contacts, phones):
             message = request.message_template or "Custom message from Google Sheets import"
             
             # Format message with contact info
@@ -86,11 +101,11 @@ async def import_google_sheets(request: GoogleSheetImportRequest, db: AsyncSessi
             )
             
             # Add WhatsApp message if phone exists
-            if contact.get('phone'):
+            if phone:
                 outreach = OutreachMessage(
                     job_id=job.id,
                     contact_method="whatsapp",
-                    recipient=contact['phone'],
+                    recipient=phone,
                     message=formatted_message
                 )
                 db.add(outreach)
@@ -142,11 +157,15 @@ async def send_bulk_messages(
         db.add(job)
         await db.commit()
         
+        phones = normalize_phones(
+            [contact.get('phone') for contact in contacts],
+            [region_hint(contact.get('country'), contact.get('address')) for contact in contacts]
+        )
+        
         message_count = 0
-        for contact in contacts:
+        for contact, phone in zip(contacts, phones):
             name = contact.get('name', 'valued customer')
             email = contact.get('email')
-            phone = contact.get('phone')
             
             # Format message
             formatted_message = message_template.format(
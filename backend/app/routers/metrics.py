@@ -0,0 +1,27 @@
+from fastapi import APIRouter
+from app.config import settings
+from app.services.job_queue import job_queue
+from app.services.worker_metrics import process_id, process_stats, worker_metrics
+from app.utils.loggers import logger
+
+router = APIRouter()
+
+@router.get("/")
+async def get_metrics():
+    """
+    Runtime statistics for shared scraping resources
+    The top-level sections cover this API process only; scrape jobs run in the
+    worker processes, whose latest snapshots are under "workers"
+    """
+    try:
+        workers = await worker_metrics.live_workers()
+    except Exception as e:
+        logger.warning(f"Could not read worker metrics: {str(e)}")
+        workers = {}
+    stats = process_stats()
+    stats["job_queue"]["depth"] = await job_queue.depth()
+    return {
+        "process": {"id": process_id(), "role": "api", "runs_jobs": settings.JOB_WORKERS_IN_API},
+        **stats,
+        "workers": workers,
+    }
@@ -9,10 +9,15 @@ class SearchRequest(BaseModel):
     mode: Literal["scrape_only", "scrape_and_contact"] = "scrape_only"
     message_type: Optional[Literal["whatsapp", "email", "both"]] = None
     prewritten_message: Optional[str] = None
+    depth: Literal["full", "feed"] = "full"  # 'feed' reads result cards without opening each listing
+    deep_fetch_contacts: bool = False  # With depth='feed', open only listings missing website/phone
+    detail_tabs: Optional[int] = None  # Tabs for opening detail pages concurrently (default MAPS_DETAIL_TABS)
+    force_refresh: bool = False  # Scrape again even if a recent identical search is cached
 
 class SearchJobResponse(BaseModel):
     job_id: int
     status: str
+    cached: bool = False  # Results were copied from a recent identical search
 
 class ScrapeResultResponse(BaseModel):
     id: int
@@ -38,6 +43,7 @@ class ScrapeResultResponse(BaseModel):
     
     # Metadata
     source: str
+    place_id: Optional[str] = None
 
     class Config:
         from_attributes = True
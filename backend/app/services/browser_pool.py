@@ -0,0 +1,250 @@
+"""
+Long-lived Chromium pool shared by all Google Maps scrape jobs.
+
+Browsers are launched once per worker process and each job gets its own
+isolated BrowserContext, so the cold-start cost is paid once instead of once
+per query.
+"""
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from playwright.async_api import Browser, BrowserContext
+from app.config import settings
+from app.services.playwright_setup import (
+    get_playwright,
+    get_browser_args,
+    create_browser_context,
+    close_playwright,
+)
+from app.utils.loggers import logger
+
+
+@dataclass
+class PooledBrowser:
+    """A pooled browser and its usage counters"""
+    browser: Browser
+    slot: int
+    launched_at: float = field(default_factory=time.time)
+    jobs_served: int = 0
+    active_contexts: int = 0
+    retiring: bool = False
+
+    @property
+    def healthy(self) -> bool:
+        return self.browser.is_connected() and not self.retiring
+
+
+class BrowserPool:
+    """Fixed-size pool of Chromium browsers handing out one context per job"""
+
+    def __init__(
+        self,
+        size: int = 2,
+        contexts_per_browser: int = 2,
+        max_jobs_per_browser: int = 50,
+        health_check_interval: int = 60,
+        acquire_timeout: int = 300,
+    ):
+        self.size = max(1, size)
+        self.contexts_per_browser = max(1, contexts_per_browser)
+        self.max_jobs_per_browser = max(1, max_jobs_per_browser)
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self.browsers: List[Optional[PooledBrowser]] = []
+        self.lock = asyncio.Lock()
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.health_task: Optional[asyncio.Task] = None
+        self.started = False
+        self.stats: Dict[str, int] = {
+            "launched": 0,
+            "recycled": 0,
+            "unhealthy_replaced": 0,
+            "contexts_served": 0,
+        }
+
+    async def start(self):
+        """Launch all browsers - call this on application startup"""
+        # Checked under the lock so concurrent first acquire() calls launch one set of browsers
+        async with self.lock:
+            if self.started:
+                return
+
+            self.semaphore = asyncio.Semaphore(self.size * self.contexts_per_browser)
+            self.browsers = [None] * self.size
+            for slot in range(self.size):
+                try:
+                    self.browsers[slot] = await self._launch(slot)
+                except Exception as e:
+                    # Leave the slot empty, it is relaunched on first use
+                    logger.error(f"Failed to launch pooled browser {slot}: {e}")
+
+            self.health_task = asyncio.create_task(self._health_loop())
+            self.started = True
+        logger.info(
+            f"Browser pool started: {self.size} browsers x "
+            f"{self.contexts_per_browser} contexts"
+        )
+
+    async def stop(self):
+        """Close all browsers and the Playwright driver - call this on shutdown"""
+        if not self.started:
+            return
+
+        self.started = False
+        if self.health_task:
+            self.health_task.cancel()
+            try:
+                await self.health_task
+            except asyncio.CancelledError:
+                pass
+            self.health_task = None
+
+        async with self.lock:
+            for pooled in self.browsers:
+                if pooled:
+                    await self._close(pooled)
+            self.browsers = []
+
+        await close_playwright()
+        logger.info("Browser pool stopped")
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        """
+        Lease an isolated BrowserContext for the duration of one job
+        Waits up to timeout (default acquire_timeout) for a free slot
+
+        Usage:
+            async with browser_pool.acquire() as context:
+                page = await context.new_page()
+        """
+        if not self.started:
+            await self.start()
+
+        await asyncio.wait_for(
+            self.semaphore.acquire(), timeout=self.acquire_timeout if timeout is None else timeout
+        )
+        pooled = None
+        context: Optional[BrowserContext] = None
+        try:
+            async with self.lock:
+                pooled = await self._pick_browser()
+                pooled.active_contexts += 1
+                pooled.jobs_served += 1
+
+            context = await create_browser_context(pooled.browser)
+            self.stats["contexts_served"] += 1
+            yield context
+        finally:
+            if context:
+                try:
+                    await context.close()
+                except Exception as e:
+                    logger.warning(f"Error closing pooled context: {e}")
+            if pooled:
+                async with self.lock:
+                    pooled.active_contexts -= 1
+                    await self._maybe_recycle(pooled)
+            self.semaphore.release()
+
+    def get_stats(self) -> Dict:
+        """Get current pool statistics"""
+        return {
+            "started": self.started,
+            "size": self.size,
+            "contexts_per_browser": self.contexts_per_browser,
+            "max_jobs_per_browser": self.max_jobs_per_browser,
+            "browsers": [
+                {
+                    "slot": pooled.slot,
+                    "connected": pooled.browser.is_connected(),
+                    "jobs_served": pooled.jobs_served,
+                    "active_contexts": pooled.active_contexts,
+                    "age_seconds": round(time.time() - pooled.launched_at, 1),
+                }
+                for pooled in self.browsers if pooled
+            ],
+            **self.stats,
+        }
+
+    async def _launch(self, slot: int) -> PooledBrowser:
+        """Launch a browser for the given slot"""
+        playwright = await get_playwright()
+        browser = await playwright.chromium.launch(headless=True, args=get_browser_args())
+        self.stats["launched"] += 1
+        logger.info(f"Launched pooled browser {slot}")
+        return PooledBrowser(browser=browser, slot=slot)
+
+    async def _close(self, pooled: PooledBrowser):
+        """Close a pooled browser, ignoring errors from dead processes"""
+        try:
+            await pooled.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser {pooled.slot}: {e}")
+
+    async def _pick_browser(self) -> PooledBrowser:
+        """Pick the least loaded healthy browser, relaunching dead slots. Caller holds the lock."""
+        for slot, pooled in enumerate(self.browsers):
+            if pooled is None or (not pooled.browser.is_connected() and pooled.active_contexts == 0):
+                if pooled is not None:
+                    logger.warning(f"Pooled browser {slot} disconnected, relaunching")
+                    self.stats["unhealthy_replaced"] += 1
+                    await self._close(pooled)
+                self.browsers[slot] = await self._launch(slot)
+
+        candidates = [
+            pooled for pooled in self.browsers
+            if pooled.healthy and pooled.active_contexts < self.contexts_per_browser
+        ]
+        if not candidates:
+            # Every slot is retiring; the semaphore guarantees capacity so borrow any live one
+            candidates = [pooled for pooled in self.browsers if pooled.browser.is_connected()]
+        if not candidates:
+            raise RuntimeError("No healthy browsers available in pool")
+
+        return min(candidates, key=lambda pooled: pooled.active_contexts)
+
+    async def _maybe_recycle(self, pooled: PooledBrowser):
+        """Replace a browser once it has served its quota and is idle. Caller holds the lock."""
+        if pooled.jobs_served >= self.max_jobs_per_browser:
+            pooled.retiring = True
+
+        if (pooled.retiring or not pooled.browser.is_connected()) and pooled.active_contexts == 0:
+            if pooled.browser.is_connected():
+                logger.info(f"Recycling pooled browser {pooled.slot} after {pooled.jobs_served} jobs")
+                self.stats["recycled"] += 1
+            else:
+                self.stats["unhealthy_replaced"] += 1
+            await self._close(pooled)
+            if not self.started:
+                return
+            try:
+                self.browsers[pooled.slot] = await self._launch(pooled.slot)
+            except Exception as e:
+                logger.error(f"Failed to relaunch pooled browser {pooled.slot}: {e}")
+                self.browsers[pooled.slot] = None
+
+    async def _health_loop(self):
+        """Periodically replace idle browsers whose process has died"""
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            try:
+                async with self.lock:
+                    for pooled in list(self.browsers):
+                        if pooled and not pooled.browser.is_connected():
+                            await self._maybe_recycle(pooled)
+            except Exception as e:
+                logger.warning(f"Browser pool health check failed: {e}")
+
+
+# Global browser pool instance
+browser_pool = BrowserPool(
+    size=settings.BROWSER_POOL_SIZE,
+    contexts_per_browser=settings.BROWSER_POOL_CONTEXTS_PER_BROWSER,
+    max_jobs_per_browser=settings.BROWSER_POOL_MAX_JOBS_PER_BROWSER,
+    health_check_interval=settings.BROWSER_POOL_HEALTH_CHECK_INTERVAL,
+    acquire_timeout=settings.BROWSER_POOL_ACQUIRE_TIMEOUT,
+)
@@ -0,0 +1,299 @@
+"""
+Contact extraction from website HTML.
+
+Sources are read from most to least reliable: JSON-LD (Organization /
+ContactPoint email and telephone), mailto:/tel: links and Cloudflare-protected
+emails first; a regex scan over visible text (scripts, styles and comments
+removed, entities and "[at]"/"[dot]" obfuscations decoded) is only the
+fallback. All patterns are compiled once at import, and each is shaped so the
+regex engine can skip ahead on a literal or a short character class instead of
+attempting a match at every offset of a large page.
+
+ContactScanner applies the same extraction to a streamed body, processing the
+page up to the last complete tag so nothing is cut mid-element.
+"""
+import html
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from app.utils.loggers import logger
+
+
+MAX_EMAILS = 5
+MAX_PHONES = 3
+
+EMAIL_PATTERN = re.compile(r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b")
+# Emails are only searched for in a window around each "@"; 64 is the longest valid local part
+EMAIL_WINDOW_BEFORE = 64
+EMAIL_WINDOW_AFTER = 255
+# Loose phone candidate; digit count and separators are checked in clean_phone.
+# The lookbehind sits after the first character so it only runs on digits, "+" and "("
+PHONE_PATTERN = re.compile(r"[+(\d](?<![\w+][+(\d])[\d\s().\-/]{6,20}\d(?!\w)")
+# Free-text candidates with enough digits that are really dates, year ranges or IP addresses
+NOT_PHONE_PATTERN = re.compile(
+    r"(?:(?:19|20)\d{2}[-./]\d{1,2}[-./]\d{1,2}"  # 2024-01-15
+    r"|\d{1,2}[-./]\d{1,2}[-./](?:19|20)\d{2}"  # 15.01.2024, 01/15/2024
+    r"|(?:19|20)\d{2}\s*[-/]\s*(?:19|20)\d{2}"  # 1998 - 2023
+    r"|\d{1,3}(?:\.\d{1,3}){3})(?!\d)"  # 192.168.1.10
+)
+PHONE_GROUP_SEPARATOR_PATTERN = re.compile(r"[\s().\-/]+")
+
+JSON_LD_PATTERN = re.compile(
+    r"<script[^>]+type\s*=\s*[\"']application/ld\+json[\"'][^>]*>(.*?)</script\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+# Case-sensitive literals are found with a fast substring search; the href context is checked in code
+MAILTO_PATTERN = re.compile(r"mailto:([^\"'?\s<>]+)")
+TEL_PATTERN = re.compile(r"tel:([^\"'<>]+)")
+CFEMAIL_PATTERN = re.compile(r"data-cfemail\s*=\s*[\"']([0-9a-fA-F]+)[\"']")
+
+NON_VISIBLE_PATTERN = re.compile(
+    r"<(script|style|noscript|template|svg)\b.*?</\1\s*>|<!--.*?-->",
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+
+# "name [at] domain [dot] com", "name(at)domain(dot)com", "name {at} domain {dot} com".
+# Plain " at "/" dot " is left alone, it turns ordinary prose into fake emails
+OBFUSCATED_AT_PATTERN = re.compile(r"\s*[\[({]\s*at\s*[\])}]\s*", re.IGNORECASE)
+OBFUSCATED_DOT_PATTERN = re.compile(r"\s*[\[({]\s*dot\s*[\])}]\s*", re.IGNORECASE)
+OBFUSCATION_HINT_PATTERN = re.compile(r"[\[({]\s*at\s*[\])}]", re.IGNORECASE)
+
+# Things shaped like emails that are really asset names ("logo@2x.png") or placeholders
+JUNK_EMAIL_SUFFIXES = (".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".css", ".js")
+JUNK_EMAIL_DOMAINS = {"example.com", "domain.com", "email.com", "yourdomain.com", "sentry.io"}
+
+# Raw-text elements whose content must not be split between stream segments
+RAW_OPEN_PATTERN = re.compile(r"<(script|style|noscript|template|svg)\b|<!--", re.IGNORECASE)
+RAW_CLOSE_PATTERN = re.compile(r"</(script|style|noscript|template|svg)\s*>|-->", re.IGNORECASE)
+
+
+def clean_email(value: str) -> Optional[str]:
+    """Normalize an email candidate, None if it is junk"""
+    email = html.unescape(value).strip().strip(".").lower()
+    if not EMAIL_PATTERN.fullmatch(email):
+        return None
+    if email.endswith(JUNK_EMAIL_SUFFIXES) or email.split("@", 1)[1] in JUNK_EMAIL_DOMAINS:
+        return None
+    return email
+
+
+def clean_phone(value: str, strict: bool = False) -> Optional[str]:
+    """
+    Reduce a phone candidate to "+<digits>" or national "<digits>", None if it is
+    not plausibly a phone number. Conversion to E.164 needs a region, so it is left
+    to app.services.phone_normalization.
+    strict (used for free text) also requires a separator or a leading +, and
+    rejects dates, year ranges, IP addresses and runs of single digits, so bare
+    IDs and timestamps are not mistaken for phones
+    """
+    value = html.unescape(value).strip()
+    digits = re.sub(r"\D", "", value)
+    has_plus = value.startswith(("+", "00"))
+    if strict:
+        if not has_plus and not re.search(r"[\s().\-/]", value):
+            return None
+        if NOT_PHONE_PATTERN.match(value.lstrip("(")):
+            return None
+        # Phone numbers group digits in twos and more; only country, trunk and area codes
+        # stand alone, as in "+33 (0)1 23 45 67 89", never a run like "1.2.3.4567"
+        groups = [group for group in PHONE_GROUP_SEPARATOR_PATTERN.split(value.lstrip("+")) if group]
+        if sum(len(group) == 1 for group in groups) > 2:
+            return None
+    if value.startswith("00"):
+        digits = digits[2:]
+
+    if not 7 <= len(digits) <= 15:
+        return None
+    return f"+{digits}" if has_plus else digits
+
+
+def decode_cfemail(encoded: str) -> str:
+    """Decode a Cloudflare email-protection hex string"""
+    try:
+        key = int(encoded[:2], 16)
+        return "".join(chr(int(encoded[i:i + 2], 16) ^ key) for i in range(2, len(encoded), 2))
+    except ValueError:
+        return ""
+
+
+def visible_text(markup: str) -> str:
+    """Strip scripts, styles, comments and tags, and decode entities"""
+    text = NON_VISIBLE_PATTERN.sub(" ", markup)
+    text = TAG_PATTERN.sub(" ", text)
+    return html.unescape(text) if "&" in text else text
+
+
+def deobfuscate(text: str) -> str:
+    """Rewrite "[at]"/"[dot]" style obfuscations into plain email syntax"""
+    if not OBFUSCATION_HINT_PATTERN.search(text):
+        return text
+    text = OBFUSCATED_AT_PATTERN.sub("@", text)
+    return OBFUSCATED_DOT_PATTERN.sub(".", text)
+
+
+def find_emails(text: str) -> List[str]:
+    """Find emails by matching only around each "@", so "@"-free pages cost one substring search"""
+    emails = []
+    at = text.find("@")
+    while at != -1:
+        next_from = at + 1
+        start = max(0, at - EMAIL_WINDOW_BEFORE)
+        for match in EMAIL_PATTERN.finditer(text, start, at + EMAIL_WINDOW_AFTER):
+            if match.start() <= at < match.end():
+                emails.append(match.group(0))
+                next_from = match.end()
+                break
+        at = text.find("@", next_from)
+    return emails
+
+
+def _href_values(pattern: re.Pattern, markup: str) -> List[str]:
+    """Values of pattern matches that sit at the start of an attribute, e.g. href="tel:..." """
+    return [
+        match.group(1) for match in pattern.finditer(markup)
+        if match.start() > 0 and markup[match.start() - 1] in "\"'= "
+    ]
+
+
+def _walk_json_ld(node: Any) -> Iterator[Tuple[str, str]]:
+    """Yield (key, value) for every email/telephone in a JSON-LD document, including ContactPoints"""
+    if isinstance(node, list):
+        for item in node:
+            yield from _walk_json_ld(item)
+    elif isinstance(node, dict):
+        for key, value in node.items():
+            if key in ("email", "telephone"):
+                for item in (value if isinstance(value, list) else [value]):
+                    if isinstance(item, str):
+                        yield key, item
+            elif isinstance(value, (dict, list)):
+                yield from _walk_json_ld(value)
+
+
+def structured_contacts(markup: str) -> Tuple[List[str], List[str]]:
+    """Emails and phones from JSON-LD, mailto:/tel: links and Cloudflare-protected emails"""
+    emails: List[str] = []
+    phones: List[str] = []
+
+    for block in (JSON_LD_PATTERN.findall(markup) if "ld+json" in markup else []):
+        try:
+            data = json.loads(block.strip())
+        except ValueError:
+            continue
+        for key, value in _walk_json_ld(data):
+            if key == "email":
+                emails.append(value.replace("mailto:", ""))
+            else:
+                phones.append(value)
+
+    emails.extend(_href_values(MAILTO_PATTERN, markup))
+    if "data-cfemail" in markup:
+        emails.extend(decode_cfemail(encoded) for encoded in CFEMAIL_PATTERN.findall(markup))
+    phones.extend(_href_values(TEL_PATTERN, markup))
+
+    return (
+        [email for email in map(clean_email, emails) if email],
+        [phone for phone in map(clean_phone, phones) if phone],
+    )
+
+
+def text_contacts(markup: str) -> Tuple[List[str], List[str]]:
+    """Emails and phones found by scanning the visible text"""
+    text = deobfuscate(visible_text(markup))
+    emails = [email for email in map(clean_email, find_emails(text)) if email]
+    phones = [phone for phone in (clean_phone(match, strict=True) for match in PHONE_PATTERN.findall(text)) if phone]
+    return emails, phones
+
+
+class ContactScanner:
+    """
+    Accumulates contacts across one or more HTML segments
+    Structured sources always rank ahead of the text scan, which only runs while
+    the structured sources have not found enough.
+    enough turns true at stop_emails emails and stop_phones phones (default: the
+    max_* counts), so a stream can stop before the full counts are collected
+    """
+
+    def __init__(
+        self,
+        max_emails: int = MAX_EMAILS,
+        max_phones: int = MAX_PHONES,
+        max_pending: int = 262_144,
+        stop_emails: Optional[int] = None,
+        stop_phones: Optional[int] = None,
+    ):
+        self.max_emails = max_emails
+        self.max_phones = max_phones
+        self.max_pending = max_pending
+        self.stop_emails = max_emails if stop_emails is None else min(stop_emails, max_emails)
+        self.stop_phones = max_phones if stop_phones is None else min(stop_phones, max_phones)
+        self.pending = ""
+        # insertion-ordered sets
+        self.structured_emails: Dict[str, None] = {}
+        self.structured_phones: Dict[str, None] = {}
+        self.text_emails: Dict[str, None] = {}
+        self.text_phones: Dict[str, None] = {}
+
+    @property
+    def enough(self) -> bool:
+        emails = len(self.structured_emails.keys() | self.text_emails.keys())
+        phones = len(self.structured_phones.keys() | self.text_phones.keys())
+        return emails >= self.stop_emails and phones >= self.stop_phones
+
+    def scan(self, markup: str):
+        """Extract from a complete HTML segment"""
+        emails, phones = structured_contacts(markup)
+        self.structured_emails.update(dict.fromkeys(emails))
+        self.structured_phones.update(dict.fromkeys(phones))
+
+        if len(self.structured_emails) >= self.max_emails and len(self.structured_phones) >= self.max_phones:
+            return
+        emails, phones = text_contacts(markup)
+        self.text_emails.update(dict.fromkeys(emails))
+        self.text_phones.update(dict.fromkeys(phones))
+
+    def feed(self, chunk: str):
+        """Add a streamed chunk, scanning everything up to the last safe cut point"""
+        self.pending += chunk
+        cut = self._safe_cut(self.pending)
+        if cut == 0 and len(self.pending) > self.max_pending:
+            # No safe point in a very long run of text; scan it whole rather than buffer forever
+            cut = len(self.pending)
+        if cut:
+            segment, self.pending = self.pending[:cut], self.pending[cut:]
+            self.scan(segment)
+
+    def finish(self) -> Dict[str, List[str]]:
+        """Scan whatever is left and return the best contacts found"""
+        if self.pending:
+            segment, self.pending = self.pending, ""
+            self.scan(segment)
+        emails = list(dict.fromkeys([*self.structured_emails, *self.text_emails]))
+        phones = list(dict.fromkeys([*self.structured_phones, *self.text_phones]))
+        return {"emails": emails[:self.max_emails], "phones": phones[:self.max_phones]}
+
+    @staticmethod
+    def _safe_cut(markup: str) -> int:
+        """End of the last complete tag that is not inside a script, style or comment; 0 if none"""
+        cut = markup.rfind(">") + 1
+        if not cut:
+            return 0
+        last_open = None
+        for last_open in RAW_OPEN_PATTERN.finditer(markup, 0, cut):
+            pass
+        if last_open is not None:
+            closed = RAW_CLOSE_PATTERN.search(markup, last_open.end())
+            if closed is None or closed.end() > cut:
+                return last_open.start()
+        return cut
+
+
+def extract_contacts(markup: str, max_emails: int = MAX_EMAILS, max_phones: int = MAX_PHONES) -> Dict[str, List[str]]:
+    """Extract emails and phones from a complete HTML document"""
+    scanner = ContactScanner(max_emails=max_emails, max_phones=max_phones)
+    try:
+        scanner.scan(markup)
+    except Exception as e:
+        logger.warning(f"Contact extraction failed: {str(e)}")
+    return scanner.finish()
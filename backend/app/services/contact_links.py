@@ -0,0 +1,99 @@
+"""
+Link scoring for the website contact crawl.
+
+When a homepage has no email, the pages most likely to list one are linked
+from it as "Contact", "About", "Impressum" and so on. Links are parsed from the
+homepage HTML and ranked by keyword weight in their URL path and anchor text,
+so only the top few pages need to be fetched.
+"""
+from typing import Dict, List, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from bs4 import BeautifulSoup
+from app.utils.loggers import logger
+
+try:
+    import lxml  # noqa: F401 - faster parser for BeautifulSoup
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+# Keyword -> weight; matched against the lowercased path and anchor text
+CONTACT_KEYWORDS: Dict[str, int] = {
+    "contact": 10,
+    "kontakt": 10,
+    "contacto": 10,
+    "contatti": 10,
+    "impressum": 9,
+    "get-in-touch": 8,
+    "reach-us": 7,
+    "email": 7,
+    "about": 6,
+    "imprint": 6,
+    "legal": 3,
+    "team": 3,
+    "staff": 3,
+    "location": 3,
+    "store": 2,
+    "support": 2,
+    "help": 1,
+}
+
+# Links that never lead to a contact page on the same site
+SKIPPED_EXTENSIONS = (".pdf", ".jpg", ".jpeg", ".png", ".gif", ".svg", ".webp", ".zip", ".mp4", ".mp3", ".css", ".js")
+SKIPPED_SCHEMES = ("mailto:", "tel:", "javascript:", "#")
+
+
+def _same_site(host: str, base_host: str) -> bool:
+    host = host[4:] if host.startswith("www.") else host
+    base_host = base_host[4:] if base_host.startswith("www.") else base_host
+    return host == base_host
+
+
+def score_link(path: str, text: str) -> int:
+    """Score a link by contact keywords in its path and anchor text"""
+    path = path.lower()
+    text = text.lower()
+    score = 0
+    for keyword, weight in CONTACT_KEYWORDS.items():
+        if keyword in path:
+            score += weight
+        if keyword.replace("-", " ") in text:
+            score += weight
+    # Prefer shallow pages, /contact over /blog/2019/how-to-contact-us
+    return score - path.strip("/").count("/") if score else 0
+
+
+def rank_contact_links(html: str, base_url: str, limit: int = 3) -> List[str]:
+    """Return up to limit same-site URLs from html, most likely contact pages first"""
+    try:
+        soup = BeautifulSoup(html, HTML_PARSER)
+    except Exception as e:
+        logger.warning(f"Could not parse links from {base_url}: {str(e)}")
+        return []
+
+    base_host = (urlsplit(base_url).hostname or "").lower()
+    base_key = urlsplit(base_url)._replace(fragment="", query="").geturl().rstrip("/")
+    scored: Dict[str, Tuple[int, int]] = {}  # url -> (score, position)
+
+    for position, anchor in enumerate(soup.find_all("a", href=True)):
+        href = anchor["href"].strip()
+        if not href or href.lower().startswith(SKIPPED_SCHEMES):
+            continue
+
+        parts = urlsplit(urljoin(base_url, href))
+        if parts.scheme not in ("http", "https") or not _same_site((parts.hostname or "").lower(), base_host):
+            continue
+        if parts.path.lower().endswith(SKIPPED_EXTENSIONS):
+            continue
+
+        url = urlunsplit((parts.scheme, parts.netloc, parts.path, parts.query, "")).rstrip("/")
+        if url == base_key:
+            continue
+
+        score = score_link(parts.path, anchor.get_text(" ", strip=True))
+        if score > 0 and score > scored.get(url, (0, 0))[0]:
+            scored[url] = (score, position)
+
+    ranked = sorted(scored.items(), key=lambda item: (-item[1][0], item[1][1]))
+    return [url for url, _ in ranked[:limit]]
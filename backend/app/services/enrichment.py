@@ -0,0 +1,171 @@
+"""
+Concurrent website enrichment for scrape jobs.
+
+Websites are fetched in parallel under a global concurrency cap instead of one
+at a time inside the save loop. Results are looked up in the domain-keyed
+enrichment cache first, so only misses touch the network.
+
+A fetch takes its host slot before a global slot. Many businesses on the same
+site (e.g. a chain) then queue behind each other without holding global slots
+that other hosts could use. A host's slot only exists while a fetch holds or
+waits for it.
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+from app.config import settings
+from app.services.scraper import scrape_website
+from app.services.enrichment_cache import enrichment_cache
+from app.services.phone_normalization import unique_phones
+from app.services.host_health import host_health
+from app.utils.host_slots import HostSlots
+from app.utils.loggers import logger
+
+
+EMPTY_CONTACT_INFO = {"emails": [], "phones": []}
+
+
+def normalize_website(url: str) -> str:
+    """Normalize a website URL so equivalent spellings share one fetch"""
+    url = (url or "").strip()
+    if url and not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+    return url.rstrip("/")
+
+
+def website_host(url: str) -> str:
+    """Host used for per-host fairness, ignoring a leading www."""
+    host = (urlsplit(normalize_website(url)).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class WebsiteEnricher:
+    """Fans website contact scraping out under global and per-host limits"""
+
+    def __init__(self, concurrency: int = 10, per_host: int = 2):
+        self.concurrency = max(1, concurrency)
+        self.per_host = max(1, per_host)
+        self.semaphore: Optional[asyncio.Semaphore] = None
+        self.host_slots = HostSlots(self.per_host)
+        self.in_flight = 0
+        self.stats: Dict[str, int] = {
+            "websites_enriched": 0,
+            "websites_failed": 0,
+            "emails_found": 0,
+        }
+
+    async def enrich(self, url: str) -> Dict[str, list]:
+        """Scrape one website for contact info, waiting for a host slot then a global slot"""
+        cached = await enrichment_cache.get(url)
+        if cached is not None:
+            return cached
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+
+        async with self.host_slots.hold(website_host(url)):
+            # Another page on this domain may have been fetched while we queued for the host
+            cached = await enrichment_cache.get(url, count_miss=False)
+            if cached is not None:
+                return cached
+
+            async with self.semaphore:
+                self.in_flight += 1
+                try:
+                    contact_info = await scrape_website(url)
+                except Exception as e:
+                    logger.warning(f"Failed to scrape website {url}: {str(e)}")
+                    self.stats["websites_failed"] += 1
+                    return EMPTY_CONTACT_INFO
+                finally:
+                    self.in_flight -= 1
+
+        if contact_info.get("failed"):
+            # Not "nothing found": leave it uncached so the next job tries the site again
+            self.stats["websites_failed"] += 1
+            return EMPTY_CONTACT_INFO
+
+        self.stats["websites_enriched"] += 1
+        if contact_info.get("emails"):
+            self.stats["emails_found"] += 1
+        await enrichment_cache.set(url, contact_info)
+        return contact_info
+
+    def batch(self, region: Optional[str] = None) -> "EnrichmentBatch":
+        """Start a batch for one job, phones found are normalized to E.164 using region"""
+        return EnrichmentBatch(self, region)
+
+    def get_stats(self) -> Dict:
+        """Get enrichment statistics"""
+        return {
+            "concurrency": self.concurrency,
+            "per_host": self.per_host,
+            "in_flight": self.in_flight,
+            "hosts_active": len(self.host_slots),
+            **self.stats,
+            # Dead or failing hosts skipped without a full HTTP timeout
+            "host_health": host_health.get_stats(),
+        }
+
+
+class EnrichmentBatch:
+    """
+    Enrichment tasks for one job, awaited per business with contacts() or all at once with join()
+    Each distinct website is fetched once even if several businesses share it
+    """
+
+    def __init__(self, enricher: WebsiteEnricher, region: Optional[str] = None):
+        self.enricher = enricher
+        self.region = region
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.started_at = time.monotonic()
+
+    def submit(self, url: str) -> str:
+        """Start enriching url in the background, returns the key to look the result up by"""
+        key = normalize_website(url)
+        if key and key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(self.enricher.enrich(url))
+        return key
+
+    async def contacts(self, url: str) -> Dict[str, list]:
+        """Enrich one website and wait for it, sharing the fetch with other businesses on the same site"""
+        key = self.submit(url)
+        if not key:
+            return EMPTY_CONTACT_INFO
+        try:
+            # Shielded so one cancelled waiter doesn't cancel the fetch for the others
+            result = await asyncio.shield(self.tasks[key])
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            return EMPTY_CONTACT_INFO
+        return {"emails": result["emails"], "phones": unique_phones(result["phones"], self.region)}
+
+    async def join(self) -> Dict[str, Dict[str, list]]:
+        """Wait for every submitted website, returns contact info keyed by submit() key"""
+        if not self.tasks:
+            return {}
+
+        results = await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+        joined = {
+            key: {
+                "emails": result["emails"],
+                "phones": unique_phones(result["phones"], self.region),
+            } if isinstance(result, dict) else EMPTY_CONTACT_INFO
+            for key, result in zip(self.tasks.keys(), results)
+        }
+        logger.info(f"Enriched {len(joined)} websites in {time.monotonic() - self.started_at:.1f}s")
+        return joined
+
+    def cancel(self):
+        """Cancel enrichment that has not finished yet"""
+        for task in self.tasks.values():
+            task.cancel()
+
+
+# Global website enricher instance
+website_enricher = WebsiteEnricher(
+    concurrency=settings.ENRICHMENT_CONCURRENCY,
+    per_host=settings.ENRICHMENT_MAX_PER_HOST,
+)
@@ -0,0 +1,194 @@
+"""
+Two-tier cache for website enrichment results, keyed by registrable domain.
+
+Chains, franchises and shared website builders come up again and again across
+jobs. The first tier is a bounded in-memory LRU with a short TTL; the second is
+the enrichment_cache table, which survives restarts and is shared by every
+worker. Domains where nothing was found are cached as negative results with
+their own, shorter TTL; sites that could not be read at all are not cached.
+"""
+import datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from cachetools import TTLCache
+from sqlalchemy import delete
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import EnrichmentCacheEntry
+from app.utils.loggers import logger
+
+
+# Public suffixes with two labels, so "shop.co.uk" is registrable and not "co.uk"
+MULTI_PART_SUFFIXES = {
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "me.uk", "ltd.uk", "plc.uk",
+    "com.au", "net.au", "org.au", "co.nz", "org.nz", "co.za", "co.in",
+    "net.in", "org.in", "co.jp", "com.br", "com.mx", "com.sg", "com.my",
+    "com.cn", "com.hk", "com.tr", "com.ar", "co.id", "co.il", "co.kr",
+}
+
+# Website builders where every customer lives under one registrable domain;
+# these keep their full host and site path so businesses don't share entries
+SHARED_HOSTING_DOMAINS = {
+    "wixsite.com", "wordpress.com", "blogspot.com", "weebly.com", "squarespace.com",
+    "godaddysites.com", "business.site", "square.site", "webflow.io", "netlify.app",
+    "github.io", "myshopify.com", "jimdosite.com", "carrd.co", "sites.google.com",
+}
+
+
+def registrable_domain(url: str) -> str:
+    """
+    Normalize a website URL to the key its contact info is cached under
+    e.g. "https://www.Joes-Pizza.com/locations/austin" -> "joes-pizza.com"
+    """
+    url = (url or "").strip()
+    if not url:
+        return ""
+    if not url.startswith(("http://", "https://")):
+        url = f"https://{url}"
+
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower().rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+
+    labels = host.split(".")
+    keep = 3 if ".".join(labels[-2:]) in MULTI_PART_SUFFIXES else 2
+    domain = ".".join(labels[-keep:])
+
+    if domain in SHARED_HOSTING_DOMAINS or host in SHARED_HOSTING_DOMAINS:
+        segments = [segment for segment in parts.path.split("/") if segment]
+        # sites.google.com/view/<site> style paths carry the site name in the second segment
+        site_path = segments[:2] if segments and segments[0] in ("view", "site") else segments[:1]
+        return "/".join([host, *site_path])
+    return domain
+
+
+class EnrichmentCache:
+    """In-memory LRU in front of the enrichment_cache table"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_entries: int = 10000,
+        memory_ttl: int = 3600,
+        ttl: int = 604800,
+        negative_ttl: int = 86400,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.memory: TTLCache = TTLCache(maxsize=max(1, max_entries), ttl=memory_ttl)
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "stores": 0,
+            "db_errors": 0,
+        }
+
+    async def get(self, url: str, count_miss: bool = True) -> Optional[Dict[str, List[str]]]:
+        """Get cached contact info for url's domain, None on a miss (not counted with count_miss=False, for re-checks)"""
+        domain = registrable_domain(url)
+        if not self.enabled or not domain:
+            return None
+
+        now = datetime.datetime.utcnow()
+        entry = self.memory.get(domain)
+        if entry is not None and entry["expires_at"] > now:
+            self.stats["memory_hits"] += 1
+            return self._hit(entry)
+
+        try:
+            async with AsyncSessionLocal() as db:
+                row = await db.get(EnrichmentCacheEntry, domain)
+        except Exception as e:
+            logger.warning(f"Enrichment cache lookup failed for {domain}: {str(e)}")
+            self.stats["db_errors"] += 1
+            row = None
+
+        if row is not None and row.expires_at > now:
+            # Carry the row's expiry so a promoted entry never outlives it in memory
+            entry = {
+                "emails": list(row.emails or []),
+                "phones": list(row.phones or []),
+                "found": row.found,
+                "expires_at": row.expires_at,
+            }
+            self.memory[domain] = entry
+            self.stats["db_hits"] += 1
+            return self._hit(entry)
+
+        if count_miss:
+            self.stats["misses"] += 1
+        return None
+
+    async def set(self, url: str, contact_info: Dict[str, List[str]]):
+        """Store contact info for url's domain in both tiers"""
+        domain = registrable_domain(url)
+        if not self.enabled or not domain:
+            return
+
+        emails = list(contact_info.get("emails") or [])
+        phones = list(contact_info.get("phones") or [])
+        found = bool(emails or phones)
+        now = datetime.datetime.utcnow()
+        expires_at = now + datetime.timedelta(seconds=self.ttl if found else self.negative_ttl)
+        self.memory[domain] = {"emails": emails, "phones": phones, "found": found, "expires_at": expires_at}
+        self.stats["stores"] += 1
+
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.merge(EnrichmentCacheEntry(
+                    domain=domain,
+                    emails=emails,
+                    phones=phones,
+                    found=found,
+                    fetched_at=now,
+                    expires_at=expires_at,
+                ))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist enrichment cache entry for {domain}: {str(e)}")
+            self.stats["db_errors"] += 1
+
+    async def purge_expired(self) -> int:
+        """Delete expired rows from the DB tier, returns how many were removed"""
+        if not self.enabled:
+            return 0
+
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                delete(EnrichmentCacheEntry).where(EnrichmentCacheEntry.expires_at <= datetime.datetime.utcnow())
+            )
+            await db.commit()
+        if result.rowcount:
+            logger.info(f"Purged {result.rowcount} expired enrichment cache entries")
+        return result.rowcount or 0
+
+    def get_stats(self) -> Dict:
+        """Get cache statistics"""
+        lookups = self.stats["memory_hits"] + self.stats["db_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["db_hits"]
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self.memory),
+            "memory_max_entries": self.memory.maxsize,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            **self.stats,
+        }
+
+    def _hit(self, entry: Dict) -> Dict[str, List[str]]:
+        if not entry["found"]:
+            self.stats["negative_hits"] += 1
+        return {"emails": list(entry["emails"]), "phones": list(entry["phones"])}
+
+
+# Global enrichment cache instance
+enrichment_cache = EnrichmentCache(
+    enabled=settings.ENRICHMENT_CACHE_ENABLED,
+    max_entries=settings.ENRICHMENT_CACHE_MAX_ENTRIES,
+    memory_ttl=settings.ENRICHMENT_CACHE_MEMORY_TTL,
+    ttl=settings.ENRICHMENT_CACHE_TTL,
+    negative_ttl=settings.ENRICHMENT_CACHE_NEGATIVE_TTL,
+)
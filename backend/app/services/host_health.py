@@ -0,0 +1,243 @@
+"""
+Host health tracking for website enrichment.
+
+Many Maps websites are dead, parked or very slow, and each used to cost a full
+HTTP timeout. Before a site is fetched its host is checked here. This is a
+liveness gate, not a resolver for the HTTP client, which still resolves hosts
+itself:
+
+- a DNS check with a short timeout finds NXDOMAIN in milliseconds instead of
+  inside the HTTP client; a passed check is reused for the record's TTL, so a
+  live host costs one extra lookup per TTL, not one per fetch;
+- hosts that don't exist (NXDOMAIN, no address records) or refused
+  connections are kept in a negative cache and skipped until it expires;
+  SERVFAIL and DNS timeouts are transient and only count towards the circuit;
+- a per-host circuit breaker opens after repeated timeouts/connection errors and
+  short-circuits the host for a cooldown, then lets one trial request through.
+"""
+import asyncio
+import socket
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+import httpx
+from cachetools import TTLCache
+from app.config import settings
+from app.utils.loggers import logger
+
+try:
+    import dns.asyncresolver
+    import dns.exception
+    import dns.resolver
+    DNSPYTHON_AVAILABLE = True
+except ImportError:
+    DNSPYTHON_AVAILABLE = False
+
+
+class TransientLookupError(Exception):
+    """DNS failed in a way that says nothing about the host (SERVFAIL, temporary resolver failure)"""
+
+
+@dataclass
+class HostCircuit:
+    """Failure counter and breaker state for one host"""
+    failures: int = 0
+    opened_at: Optional[float] = None
+    trial_started_at: Optional[float] = None  # set while the half-open trial request runs
+
+
+class HostHealth:
+    """DNS liveness checks, negative cache and per-host circuit breakers"""
+
+    def __init__(
+        self,
+        dns_timeout: float = 3.0,
+        dns_cache_size: int = 10000,
+        dns_max_ttl: int = 3600,
+        negative_ttl: int = 3600,
+        failure_threshold: int = 3,
+        cooldown: int = 300,
+    ):
+        self.dns_timeout = dns_timeout
+        self.dns_max_ttl = dns_max_ttl
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+
+        # Hosts whose DNS check passed: host -> (addresses, expires_at); record TTLs vary
+        # so expiry is kept per entry. Only used to skip repeat checks, httpx resolves on its own
+        self.live_hosts: TTLCache = TTLCache(maxsize=max(1, dns_cache_size), ttl=dns_max_ttl)
+        self.negative: TTLCache = TTLCache(maxsize=max(1, dns_cache_size), ttl=negative_ttl)  # host -> reason
+        # Entries outlive an open circuit's cooldown and its trial, and are refreshed on every failure
+        self.circuits: TTLCache = TTLCache(maxsize=max(1, dns_cache_size), ttl=max(1, cooldown) * 2)  # host -> HostCircuit
+        self.resolver = None
+        if DNSPYTHON_AVAILABLE:
+            self.resolver = dns.asyncresolver.Resolver()
+            self.resolver.lifetime = dns_timeout
+        else:
+            logger.warning("dnspython is not installed, host checks will use the system resolver")
+
+        self.stats: Dict[str, int] = {
+            "dns_lookups": 0,
+            "dns_checks_reused": 0,
+            "dns_failures": 0,
+            "negative_cached": 0,
+            "negative_short_circuits": 0,
+            "circuits_opened": 0,
+            "circuit_short_circuits": 0,
+        }
+
+    async def check(self, url: str) -> Optional[str]:
+        """
+        Decide whether url's host is worth fetching
+        Returns None to go ahead, or the reason the fetch is short-circuited
+        """
+        host = self._host(url)
+        if not host:
+            return None
+
+        reason = self.negative.get(host)
+        if reason:
+            self.stats["negative_short_circuits"] += 1
+            return f"negative cache: {reason}"
+
+        circuit = self.circuits.get(host)
+        if circuit and circuit.opened_at is not None:
+            now = time.monotonic()
+            # A trial that never reported back (e.g. cancelled) stops blocking after one cooldown
+            trial_running = circuit.trial_started_at is not None and now - circuit.trial_started_at < self.cooldown
+            if now - circuit.opened_at < self.cooldown or trial_running:
+                self.stats["circuit_short_circuits"] += 1
+                return "circuit open"
+            # Cooldown is over: half-open, let this one request through as a trial
+            circuit.trial_started_at = now
+
+        addresses, failure = await self.check_dns(host)
+        if not addresses:
+            return f"dns: {failure}"
+        return None
+
+    async def check_dns(self, host: str) -> Tuple[List[str], Optional[str]]:
+        """Check that host resolves, reusing a passed check until its TTL; returns (addresses, failure reason)"""
+        cached = self.live_hosts.get(host)
+        if cached and cached[1] > time.monotonic():
+            self.stats["dns_checks_reused"] += 1
+            return cached[0], None
+
+        self.stats["dns_lookups"] += 1
+        try:
+            addresses, ttl = await self._lookup(host)
+        except asyncio.TimeoutError:
+            self.stats["dns_failures"] += 1
+            self.record_failure(host, "dns timeout")
+            return [], "timeout"
+        except TransientLookupError as e:
+            self.stats["dns_failures"] += 1
+            self.record_failure(host, f"dns {e}")
+            return [], str(e)
+        except LookupError as e:
+            self.stats["dns_failures"] += 1
+            self._mark_negative(host, str(e) or "nxdomain")
+            return [], str(e) or "nxdomain"
+
+        self.live_hosts[host] = (addresses, time.monotonic() + min(ttl, self.dns_max_ttl))
+        return addresses, None
+
+    def record_success(self, url: str):
+        """Close the host's circuit after a successful fetch"""
+        self.circuits.pop(self._host(url), None)
+
+    def record_failure(self, url: str, error):
+        """
+        Count a failed fetch against the host
+        Refused connections go straight to the negative cache, timeouts and other
+        transport errors count towards opening the circuit
+        """
+        host = self._host(url)
+        if not host:
+            return
+
+        if isinstance(error, httpx.ConnectError) and "refused" in str(error).lower():
+            self._mark_negative(host, "connection refused")
+            return
+
+        circuit = self.circuits.get(host) or HostCircuit()
+        self.circuits[host] = circuit  # (re)starts the entry's TTL
+        circuit.failures += 1
+        was_trial = circuit.trial_started_at is not None
+        circuit.trial_started_at = None
+        if was_trial or circuit.failures >= self.failure_threshold:
+            circuit.opened_at = time.monotonic()
+            self.stats["circuits_opened"] += 1
+            logger.info(f"Circuit opened for {host} after {circuit.failures} failures ({error})")
+
+    def get_stats(self) -> Dict:
+        """Get host health statistics"""
+        now = time.monotonic()
+        return {
+            "dns_live_hosts": len(self.live_hosts),
+            "negative_cached_hosts": len(self.negative),
+            "open_circuits": sum(
+                1 for circuit in self.circuits.values()
+                if circuit.opened_at is not None and now - circuit.opened_at < self.cooldown
+            ),
+            **self.stats,
+        }
+
+    async def _lookup(self, host: str) -> Tuple[List[str], int]:
+        """
+        Resolve A (then AAAA) records
+        Raises LookupError for hosts that don't exist and TransientLookupError when
+        the resolver could not give an answer
+        """
+        if self.resolver is None:
+            loop = asyncio.get_running_loop()
+            try:
+                infos = await asyncio.wait_for(
+                    loop.getaddrinfo(host, None, type=socket.SOCK_STREAM), timeout=self.dns_timeout
+                )
+            except socket.gaierror as e:
+                if e.errno == socket.EAI_AGAIN:
+                    raise TransientLookupError("temporary failure") from e
+                raise LookupError("nxdomain") from e
+            return list(dict.fromkeys(info[4][0] for info in infos)), self.dns_max_ttl
+
+        servfail = False
+        for record_type in ("A", "AAAA"):
+            try:
+                answer = await self.resolver.resolve(host, record_type)
+                return [record.to_text() for record in answer], answer.rrset.ttl
+            except dns.resolver.NXDOMAIN as e:
+                raise LookupError("nxdomain") from e
+            except dns.resolver.NoAnswer:
+                continue
+            except dns.resolver.NoNameservers:
+                servfail = True
+                continue
+            except dns.exception.Timeout as e:
+                raise asyncio.TimeoutError() from e
+        if servfail:
+            raise TransientLookupError("servfail")
+        raise LookupError("no address records")
+
+    def _mark_negative(self, host: str, reason: str):
+        self.negative[host] = reason
+        self.stats["negative_cached"] += 1
+        logger.info(f"Skipping {host} for {int(self.negative.ttl)}s: {reason}")
+
+    @staticmethod
+    def _host(url: str) -> str:
+        if "://" not in url:
+            url = f"https://{url}"
+        return (urlsplit(url).hostname or "").lower()
+
+
+# Global host health instance
+host_health = HostHealth(
+    dns_timeout=settings.HOST_DNS_TIMEOUT,
+    dns_cache_size=settings.HOST_DNS_CACHE_SIZE,
+    dns_max_ttl=settings.HOST_DNS_MAX_TTL,
+    negative_ttl=settings.HOST_NEGATIVE_TTL,
+    failure_threshold=settings.HOST_CIRCUIT_FAILURE_THRESHOLD,
+    cooldown=settings.HOST_CIRCUIT_COOLDOWN,
+)
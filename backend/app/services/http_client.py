@@ -0,0 +1,166 @@
+"""
+Process-wide pooled HTTP client for website enrichment.
+
+One httpx.AsyncClient is created at startup and shared by every request, so
+connections, TLS sessions and HTTP/2 streams are reused across websites
+instead of paying a full handshake per URL. httpx only caps connections
+globally, so a per-host semaphore keeps a single slow site from taking the
+whole pool. A host's semaphore is dropped once no request holds or waits for
+it, so the client doesn't grow with every site it ever fetched.
+"""
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+import httpx
+from app.config import settings
+from app.utils.host_slots import HostSlots
+from app.utils.loggers import logger
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+
+class HttpClient:
+    """Shared httpx client with global and per-host connection limits"""
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        max_connections_per_host: int = 4,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.max_connections_per_host = max(1, max_connections_per_host)
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        if http2 and not HTTP2_AVAILABLE:
+            logger.warning("h2 is not installed, the shared HTTP client will use HTTP/1.1")
+
+        self.client: Optional[httpx.AsyncClient] = None
+        self.host_slots = HostSlots(self.max_connections_per_host)
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "errors": 0,
+            "http2_responses": 0,
+        }
+
+    async def start(self):
+        """Create the shared client - call this on application startup"""
+        if self.client is not None:
+            return
+
+        self.client = httpx.AsyncClient(
+            http2=self.http2,
+            limits=self.limits,
+            timeout=self.timeout,
+            headers=DEFAULT_HEADERS,
+            follow_redirects=True,
+        )
+        logger.info(
+            f"HTTP client started: http2={self.http2}, "
+            f"{self.limits.max_connections} connections, {self.max_connections_per_host} per host"
+        )
+
+    async def stop(self):
+        """Close the shared client and its connections - call this on shutdown"""
+        if self.client is None:
+            return
+
+        client, self.client = self.client, None
+        await client.aclose()
+        self.host_slots.clear()
+        logger.info("HTTP client stopped")
+
+    async def get_client(self) -> httpx.AsyncClient:
+        """Get the shared client, starting it if the app startup hook did not run (e.g. scripts)"""
+        if self.client is None:
+            await self.start()
+        return self.client
+
+    @asynccontextmanager
+    async def host_slot(self, url: str):
+        """Hold one of the per-host connection slots for url's host"""
+        async with self.host_slots.hold((urlsplit(url).hostname or "").lower()):
+            yield
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        """GET url on the shared client, respecting the per-host limit"""
+        client = await self.get_client()
+        async with self.host_slot(url):
+            self.stats["requests"] += 1
+            try:
+                response = await client.get(url, **kwargs)
+            except Exception:
+                self.stats["errors"] += 1
+                raise
+        if response.http_version == "HTTP/2":
+            self.stats["http2_responses"] += 1
+        return response
+
+    @asynccontextmanager
+    async def stream(self, url: str, **kwargs):
+        """
+        Open a streamed GET on the shared client, holding the host slot until the body is closed
+
+        Usage:
+            async with http_client.stream(url) as response:
+                async for chunk in response.aiter_text():
+                    ...
+        """
+        client = await self.get_client()
+        async with self.host_slot(url):
+            self.stats["requests"] += 1
+            async with AsyncExitStack() as stack:
+                try:
+                    response = await stack.enter_async_context(client.stream("GET", url, **kwargs))
+                except Exception:
+                    self.stats["errors"] += 1
+                    raise
+                if response.http_version == "HTTP/2":
+                    self.stats["http2_responses"] += 1
+                yield response
+
+    def get_stats(self) -> Dict:
+        """Get shared client statistics"""
+        return {
+            "started": self.client is not None,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "hosts_active": len(self.host_slots),
+            **self.stats,
+        }
+
+
+# Global shared HTTP client instance
+http_client = HttpClient(
+    max_connections=settings.HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    max_connections_per_host=settings.HTTP_MAX_CONNECTIONS_PER_HOST,
+    timeout=settings.HTTP_TIMEOUT,
+    connect_timeout=settings.HTTP_CONNECT_TIMEOUT,
+    http2=settings.HTTP_ENABLE_HTTP2,
+)
@@ -0,0 +1,140 @@
+"""
+Per-listing checkpoints for resumable search jobs.
+
+Every business a job scrapes is checkpointed as "extracted", with its data, as
+soon as it leaves the scraper, and marked "done" in the same transaction that
+saves its ScrapeResult. When a job runs again after a crash or a deploy (its
+queue lease expired and another worker claimed it), it resumes from them:
+
+- listings that are done are skipped by the scraper and never reopened;
+- listings that were extracted but not saved are replayed into the pipeline
+  from their checkpoint, without the browser;
+- the Google Sheets export still covers every business of the job.
+
+Checkpoints are deleted once the job completes.
+"""
+import datetime
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Set
+from sqlalchemy import delete
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.database import AsyncSessionLocal
+from app.models import JobCheckpoint
+from app.services.scraper import place_key
+from app.utils.loggers import logger
+
+
+@dataclass
+class JobProgress:
+    """What earlier runs of a job already finished"""
+    done: List[Dict] = field(default_factory=list)  # Saved businesses, final values
+    pending: List[Dict] = field(default_factory=list)  # Extracted but not saved
+    keys: Set[str] = field(default_factory=set)  # place_key of every checkpoint
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.keys)
+
+    @property
+    def skip_places(self) -> FrozenSet[str]:
+        """place_ids and URLs the scraper doesn't need to open again"""
+        places = set(self.keys)
+        for business in (*self.done, *self.pending):
+            places.update(value for value in (business.get("place_id"), business.get("place_url")) if value)
+        return frozenset(places)
+
+
+class JobCheckpoints:
+    """Reads and writes job_checkpoints rows"""
+
+    def __init__(self):
+        self.stats: Dict[str, int] = {
+            "extracted": 0,
+            "done": 0,
+            "jobs_resumed": 0,
+            "listings_skipped": 0,
+            "listings_replayed": 0,
+        }
+
+    async def load(self, job_id: int) -> JobProgress:
+        """Load the checkpoints left by earlier runs of job_id"""
+        progress = JobProgress()
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                select(JobCheckpoint).where(JobCheckpoint.job_id == job_id).order_by(JobCheckpoint.id)
+            )
+            for checkpoint in result.scalars().all():
+                progress.keys.add(checkpoint.place_key)
+                if checkpoint.status == "done":
+                    progress.done.append(checkpoint.business)
+                else:
+                    progress.pending.append(checkpoint.business)
+
+        if progress.resumed:
+            self.stats["jobs_resumed"] += 1
+            self.stats["listings_skipped"] += len(progress.done)
+            self.stats["listings_replayed"] += len(progress.pending)
+            logger.info(
+                f"Resuming job {job_id}: {len(progress.done)} listings already saved, "
+                f"{len(progress.pending)} to replay from checkpoints"
+            )
+        return progress
+
+    async def record_extracted(self, job_id: int, business: Dict):
+        """Checkpoint a business as soon as it is scraped"""
+        async with AsyncSessionLocal() as db:
+            db.add(JobCheckpoint(
+                job_id=job_id,
+                place_key=place_key(business),
+                business=_json_safe(business),
+                status="extracted",
+            ))
+            try:
+                await db.commit()
+            except IntegrityError:
+                # Already checkpointed, e.g. a replayed listing
+                await db.rollback()
+                return
+        self.stats["extracted"] += 1
+
+    async def mark_done(self, db: AsyncSession, job_id: int, business: Dict):
+        """Mark a business done in the caller's session, so it commits together with its ScrapeResult"""
+        key = place_key(business)
+        result = await db.execute(
+            select(JobCheckpoint).where(JobCheckpoint.job_id == job_id, JobCheckpoint.place_key == key)
+        )
+        checkpoint = result.scalar_one_or_none()
+        if checkpoint is None:
+            checkpoint = JobCheckpoint(job_id=job_id, place_key=key)
+            db.add(checkpoint)
+        checkpoint.business = _json_safe(business)
+        checkpoint.status = "done"
+        checkpoint.updated_at = datetime.datetime.utcnow()
+        self.stats["done"] += 1
+
+    async def clear(self, job_id: int):
+        """Delete a finished job's checkpoints"""
+        try:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(JobCheckpoint).where(JobCheckpoint.job_id == job_id))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Could not clear checkpoints for job {job_id}: {str(e)}")
+
+    def get_stats(self) -> Dict:
+        """Get checkpoint statistics"""
+        return dict(self.stats)
+
+
+def _json_safe(business: Dict) -> Dict:
+    """Business fields as plain JSON values"""
+    return {
+        key: value if value is None or isinstance(value, (str, int, float, bool)) else str(value)
+        for key, value in business.items()
+    }
+
+
+# Global job checkpoints instance
+job_checkpoints = JobCheckpoints()
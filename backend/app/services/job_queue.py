@@ -0,0 +1,417 @@
+"""
+Durable, database-backed job queue for scrape jobs.
+
+Jobs are rows in the job_queue table instead of FastAPI background tasks, so
+they survive restarts and deploys and run on a bounded pool of workers:
+
+- a worker claims the oldest available entry with SELECT ... FOR UPDATE SKIP
+  LOCKED, so concurrent workers neither block on nor double-claim a row. The
+  claim is also a guarded UPDATE, which keeps SQLite (no row locks) correct
+  for local runs;
+- a claim is a lease that the worker heartbeats while the job runs. An entry
+  whose lease expired (worker crashed or was killed) is claimed again;
+- entries that raise are retried with backoff up to JOB_MAX_ATTEMPTS.
+
+The entry's SearchJob status is updated in the same transaction whenever an
+entry is requeued (back to "pending", which the dashboard keeps polling) or
+fails for good, so a job never stays "processing" after its worker gave up on it.
+
+Handlers are registered per entry kind with register_job_handler and get the
+entry's job_id and payload.
+"""
+import asyncio
+import datetime
+import os
+import socket
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.config import settings
+from app.database import QueueSessionLocal
+from app.models import JobQueueEntry, SearchJob
+from app.utils.loggers import logger
+
+
+JobHandler = Callable[[Optional[int], Dict], Awaitable[None]]
+
+# kind -> handler, filled in by the modules that own each kind of job
+job_handlers: Dict[str, JobHandler] = {}
+
+
+def register_job_handler(kind: str):
+    """Decorator registering the coroutine that runs queue entries of this kind"""
+    def decorator(handler: JobHandler) -> JobHandler:
+        job_handlers[kind] = handler
+        return handler
+    return decorator
+
+
+@dataclass
+class ClaimedJob:
+    """A queue entry leased to one worker"""
+    id: int
+    job_id: Optional[int]
+    kind: str
+    payload: Dict
+    attempts: int
+
+
+class JobQueue:
+    """Enqueue, claim, heartbeat and settle job_queue rows"""
+
+    def __init__(self, lease_seconds: int = 120, max_attempts: int = 3, retry_backoff: int = 60):
+        self.lease = datetime.timedelta(seconds=lease_seconds)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_backoff = retry_backoff
+        self.stats: Dict[str, int] = {
+            "enqueued": 0,
+            "claimed": 0,
+            "reclaimed_expired": 0,
+            "completed": 0,
+            "retried": 0,
+            "failed": 0,
+            "released": 0,
+            "leases_lost": 0,
+        }
+
+    async def enqueue(self, db: AsyncSession, job_id: Optional[int], payload: Dict, kind: str = "search") -> JobQueueEntry:
+        """Add an entry in the caller's session, so it commits together with the job row"""
+        entry = JobQueueEntry(
+            job_id=job_id,
+            kind=kind,
+            payload=payload,
+            status="queued",
+            attempts=0,
+            available_at=datetime.datetime.utcnow(),
+        )
+        db.add(entry)
+        self.stats["enqueued"] += 1
+        return entry
+
+    async def claim(self, worker_id: str) -> Optional[ClaimedJob]:
+        """Lease the oldest claimable entry to worker_id, None if there is nothing to run"""
+        now = datetime.datetime.utcnow()
+        claimable = or_(
+            and_(JobQueueEntry.status == "queued", JobQueueEntry.available_at <= now),
+            and_(JobQueueEntry.status == "running", JobQueueEntry.lease_expires_at < now),
+        )
+
+        while True:
+            async with QueueSessionLocal() as db:
+                result = await db.execute(
+                    select(JobQueueEntry)
+                    .where(claimable)
+                    .order_by(JobQueueEntry.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                entry = result.scalar_one_or_none()
+                if entry is None:
+                    await db.rollback()
+                    return None
+
+                expired = entry.status == "running"
+                guard = and_(JobQueueEntry.id == entry.id, JobQueueEntry.attempts == entry.attempts, claimable)
+                if expired and entry.attempts >= self.max_attempts:
+                    # Its worker died on the last attempt
+                    error = f"Lease expired after {entry.attempts} attempts ({entry.locked_by})"
+                    failed = await db.execute(
+                        update(JobQueueEntry)
+                        .where(guard)
+                        .values(
+                            status="failed",
+                            locked_by=None,
+                            lease_expires_at=None,
+                            last_error=error,
+                            finished_at=now,
+                        )
+                        .execution_options(synchronize_session=False)
+                    )
+                    if failed.rowcount != 1:
+                        await db.rollback()
+                        return None
+                    await self._set_job_status(db, entry.job_id, f"failed: {error}")
+                    await db.commit()
+                    self.stats["failed"] += 1
+                    logger.error(f"Queue entry {entry.id} (job {entry.job_id}) failed: lease expired on its last attempt")
+                    # Other entries may be ready, look again instead of idling a poll interval
+                    continue
+
+                claimed = await db.execute(
+                    update(JobQueueEntry)
+                    .where(guard)
+                    .values(
+                        status="running",
+                        locked_by=worker_id,
+                        attempts=entry.attempts + 1,
+                        lease_expires_at=now + self.lease,
+                        heartbeat_at=now,
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                if claimed.rowcount != 1:
+                    # Another worker claimed it between the select and the update (SQLite)
+                    await db.rollback()
+                    return None
+                await db.commit()
+                break
+
+        self.stats["claimed"] += 1
+        if expired:
+            self.stats["reclaimed_expired"] += 1
+            logger.warning(f"Reclaimed queue entry {entry.id} (job {entry.job_id}) from expired lease of {entry.locked_by}")
+        return ClaimedJob(
+            id=entry.id,
+            job_id=entry.job_id,
+            kind=entry.kind,
+            payload=entry.payload or {},
+            attempts=entry.attempts + 1,
+        )
+
+    async def heartbeat(self, claimed: ClaimedJob, worker_id: str) -> bool:
+        """Extend the lease, False if worker_id no longer holds it"""
+        now = datetime.datetime.utcnow()
+        return await self._settle(
+            claimed,
+            worker_id,
+            lease_expires_at=now + self.lease,
+            heartbeat_at=now,
+        )
+
+    async def complete(self, claimed: ClaimedJob, worker_id: str):
+        """Mark an entry done"""
+        if await self._settle(claimed, worker_id, status="done", finished_at=datetime.datetime.utcnow()):
+            self.stats["completed"] += 1
+
+    async def fail(self, claimed: ClaimedJob, worker_id: str, error: str, retry: bool = True):
+        """Requeue an entry with backoff, or mark it failed once it is out of attempts"""
+        now = datetime.datetime.utcnow()
+        if retry and claimed.attempts < self.max_attempts:
+            delay = datetime.timedelta(seconds=self.retry_backoff * claimed.attempts)
+            if await self._settle(
+                claimed,
+                worker_id,
+                job_status="pending",
+                status="queued",
+                available_at=now + delay,
+                last_error=error[:2000],
+            ):
+                self.stats["retried"] += 1
+                logger.warning(f"Queue entry {claimed.id} (job {claimed.job_id}) will retry in {delay.seconds}s: {error}")
+            return
+
+        if await self._settle(
+            claimed,
+            worker_id,
+            job_status=f"failed: {error}",
+            status="failed",
+            finished_at=now,
+            last_error=error[:2000],
+        ):
+            self.stats["failed"] += 1
+            logger.error(f"Queue entry {claimed.id} (job {claimed.job_id}) failed after {claimed.attempts} attempts: {error}")
+
+    async def release(self, claimed: ClaimedJob, worker_id: str):
+        """Hand an unfinished entry back to the queue on shutdown, without using up an attempt"""
+        if await self._settle(
+            claimed,
+            worker_id,
+            job_status="pending",
+            status="queued",
+            attempts=claimed.attempts - 1,
+            available_at=datetime.datetime.utcnow(),
+        ):
+            self.stats["released"] += 1
+
+    async def depth(self) -> Dict[str, int]:
+        """Entry counts per status"""
+        try:
+            async with QueueSessionLocal() as db:
+                result = await db.execute(
+                    select(JobQueueEntry.status, func.count()).group_by(JobQueueEntry.status)
+                )
+                return {status: count for status, count in result.all()}
+        except Exception as e:
+            logger.warning(f"Could not count job queue entries: {str(e)}")
+            return {}
+
+    def get_stats(self) -> Dict:
+        """Get job queue statistics"""
+        return {
+            "lease_seconds": int(self.lease.total_seconds()),
+            "max_attempts": self.max_attempts,
+            **self.stats,
+        }
+
+    async def _settle(self, claimed: ClaimedJob, worker_id: str, job_status: Optional[str] = None, **values) -> bool:
+        """Update an entry only while worker_id still holds its lease, and its SearchJob's status with it"""
+        if values.get("status") in ("queued", "done", "failed"):
+            values.setdefault("locked_by", None)
+            values.setdefault("lease_expires_at", None)
+
+        async with QueueSessionLocal() as db:
+            result = await db.execute(
+                update(JobQueueEntry)
+                .where(
+                    JobQueueEntry.id == claimed.id,
+                    JobQueueEntry.locked_by == worker_id,
+                    JobQueueEntry.status == "running",
+                )
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1 and job_status:
+                await self._set_job_status(db, claimed.job_id, job_status)
+            await db.commit()
+
+        if result.rowcount != 1:
+            self.stats["leases_lost"] += 1
+            logger.warning(f"Worker {worker_id} no longer holds the lease on queue entry {claimed.id}")
+            return False
+        return True
+
+    @staticmethod
+    async def _set_job_status(db: AsyncSession, job_id: Optional[int], status: str):
+        if job_id is None:
+            return
+        await db.execute(
+            update(SearchJob)
+            .where(SearchJob.id == job_id)
+            .values(status=status)
+            .execution_options(synchronize_session=False)
+        )
+
+
+class JobWorkerPool:
+    """Fixed number of worker loops that claim and run queue entries"""
+
+    def __init__(self, queue: JobQueue, concurrency: int = 2, poll_interval: float = 2.0, heartbeat_interval: int = 30):
+        self.queue = queue
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+
+        self.tasks: List[asyncio.Task] = []
+        self.running: Dict[str, ClaimedJob] = {}  # worker_id -> entry being run
+        self.stopping = False
+
+    async def start(self):
+        """Start the worker loops - call this on startup of the process that runs jobs"""
+        if self.tasks:
+            return
+
+        self.stopping = False
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.tasks = [
+            asyncio.create_task(self._worker_loop(f"{prefix}:{index}"))
+            for index in range(self.concurrency)
+        ]
+        logger.info(f"Job workers started: {self.concurrency} on {prefix}")
+
+    async def stop(self):
+        """Stop the worker loops, handing running entries back to the queue"""
+        if not self.tasks:
+            return
+
+        self.stopping = True
+        tasks, self.tasks = self.tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info("Job workers stopped")
+
+    def get_stats(self) -> Dict:
+        """Get worker pool statistics"""
+        return {
+            "workers": len(self.tasks),
+            "busy": len(self.running),
+            "running_jobs": [claimed.job_id for claimed in self.running.values()],
+        }
+
+    async def _worker_loop(self, worker_id: str):
+        while not self.stopping:
+            try:
+                claimed = await self.queue.claim(worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Worker {worker_id} could not claim a job: {str(e)}")
+                claimed = None
+
+            if claimed is None:
+                await asyncio.sleep(self.poll_interval)
+                continue
+            try:
+                await self._run(claimed, worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # e.g. the DB went away while settling the entry; its lease expires and
+                # another claim picks it up, this worker keeps going
+                logger.exception(f"Worker {worker_id} could not settle job {claimed.job_id}")
+
+    async def _run(self, claimed: ClaimedJob, worker_id: str):
+        """Run one entry with a heartbeat, then settle it"""
+        handler = job_handlers.get(claimed.kind)
+        if handler is None:
+            await self.queue.fail(claimed, worker_id, f"No handler registered for '{claimed.kind}'", retry=False)
+            return
+
+        logger.info(f"Worker {worker_id} running job {claimed.job_id} (attempt {claimed.attempts})")
+        self.running[worker_id] = claimed
+        job = asyncio.create_task(handler(claimed.job_id, claimed.payload))
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(claimed, worker_id, job, lease_lost))
+        try:
+            await job
+        except asyncio.CancelledError:
+            if lease_lost.is_set():
+                logger.warning(f"Job {claimed.job_id} stopped on {worker_id}: lease lost")
+                return
+            # The pool is stopping: let the job and the heartbeat unwind before the entry is
+            # handed back, so neither is still writing once the engines are closed
+            job.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(job, heartbeat, return_exceptions=True)
+            await self.queue.release(claimed, worker_id)
+            raise
+        except Exception as e:
+            logger.exception(f"Job {claimed.job_id} raised on {worker_id}")
+            await self.queue.fail(claimed, worker_id, str(e) or type(e).__name__)
+        else:
+            await self.queue.complete(claimed, worker_id)
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self.running.pop(worker_id, None)
+
+    async def _heartbeat(self, claimed: ClaimedJob, worker_id: str, job: asyncio.Task, lease_lost: asyncio.Event):
+        """Extend the lease while the job runs, cancelling the job if the lease was taken over"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                held = await self.queue.heartbeat(claimed, worker_id)
+            except Exception as e:
+                # A missed beat is fine, the lease outlasts several intervals
+                logger.warning(f"Heartbeat for job {claimed.job_id} failed: {str(e)}")
+                continue
+            if not held:
+                lease_lost.set()
+                job.cancel()
+                return
+
+
+# Global job queue and worker pool instances
+job_queue = JobQueue(
+    lease_seconds=settings.JOB_LEASE_SECONDS,
+    max_attempts=settings.JOB_MAX_ATTEMPTS,
+    retry_backoff=settings.JOB_RETRY_BACKOFF,
+)
+job_workers = JobWorkerPool(
+    job_queue,
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    heartbeat_interval=settings.JOB_HEARTBEAT_INTERVAL,
+)
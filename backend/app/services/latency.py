@@ -0,0 +1,131 @@
+"""
+Latency tracking for website enrichment.
+
+Page fetch times are kept in small rolling windows, per host and globally, and
+turned into two numbers for each fetch:
+
+- a timeout: the p95 fetch time times ENRICHMENT_TIMEOUT_MULTIPLIER, clamped
+  between ENRICHMENT_MIN_TIMEOUT and HTTP_TIMEOUT, so a slow site no longer
+  costs the full 30s and a fast one gives up long before that;
+- a hedge delay: once the first attempt is slower than this percentile, a
+  second attempt is raced against it.
+
+A host's own window is used once it has ENRICHMENT_LATENCY_MIN_SAMPLES fetches.
+Until then its timeout is the full HTTP_TIMEOUT, since other hosts' speed says
+nothing about how slow this one is, while its hedge delay comes from the global
+window, or the configured default until that exists. A fetch that times out is
+recorded for its host at the timeout it hit, so a host slower than its budget
+raises the budget instead of timing out until its circuit opens.
+"""
+import math
+from collections import deque
+from typing import Deque, Dict, Optional, Sequence
+from urllib.parse import urlsplit
+from cachetools import LRUCache
+from app.config import settings
+
+
+def percentile(samples: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of samples (pct in 0-100)"""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LatencyTracker:
+    """Rolling per-host and global fetch times with derived timeouts and hedge delays"""
+
+    def __init__(
+        self,
+        window: int = 50,
+        min_samples: int = 5,
+        multiplier: float = 3.0,
+        min_timeout: float = 5.0,
+        max_timeout: float = 30.0,
+        hedge_delay: float = 3.0,
+        hedge_percentile: float = 90,
+        max_hosts: int = 10000,
+    ):
+        self.window = max(1, window)
+        self.min_samples = max(1, min_samples)
+        self.multiplier = multiplier
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.max_timeout = max_timeout
+        self.default_hedge_delay = hedge_delay
+        self.hedge_percentile = hedge_percentile
+
+        self.hosts: LRUCache = LRUCache(maxsize=max(1, max_hosts))  # host -> deque of seconds
+        self.global_samples: Deque[float] = deque(maxlen=self.window * 20)
+        self.stats: Dict[str, int] = {
+            "samples": 0,
+            "timeouts": 0,
+            "hedges_started": 0,
+            "hedges_won": 0,
+        }
+
+    def record(self, url: str, seconds: float):
+        """Record how long a successful fetch of url took"""
+        host = self._host(url)
+        samples = self.hosts.get(host)
+        if samples is None:
+            samples = self.hosts[host] = deque(maxlen=self.window)
+        samples.append(seconds)
+        self.global_samples.append(seconds)
+        self.stats["samples"] += 1
+
+    def record_timeout(self, url: str, seconds: float):
+        """Record a fetch of url that timed out after seconds, as a sample censored at its timeout"""
+        host = self._host(url)
+        samples = self.hosts.get(host)
+        if samples is None:
+            samples = self.hosts[host] = deque(maxlen=self.window)
+        # Host window only: one slow site shouldn't stretch every other host's hedge delay
+        samples.append(seconds)
+        self.stats["timeouts"] += 1
+
+    def timeout_for(self, url: str) -> float:
+        """Total time budget for fetching url, the full budget until the host has samples of its own"""
+        samples = self.hosts.get(self._host(url))
+        if not samples or len(samples) < self.min_samples:
+            return self.max_timeout
+        timeout = percentile(samples, 95) * self.multiplier
+        return min(self.max_timeout, max(self.min_timeout, timeout))
+
+    def hedge_delay(self, url: str) -> float:
+        """How long the first attempt on url may run before a hedged attempt is started"""
+        samples = self._samples(url)
+        delay = self.default_hedge_delay if samples is None else percentile(samples, self.hedge_percentile)
+        # Always leave the hedge at least half of the budget
+        return min(max(delay, 0.5), self.timeout_for(url) / 2)
+
+    def get_stats(self) -> Dict:
+        """Get latency statistics"""
+        stats: Dict = {"hosts_tracked": len(self.hosts), **self.stats}
+        if self.global_samples:
+            for pct in (50, 90, 95, 99):
+                stats[f"p{pct}_seconds"] = round(percentile(self.global_samples, pct), 3)
+        return stats
+
+    def _samples(self, url: str) -> Optional[Sequence[float]]:
+        samples = self.hosts.get(self._host(url))
+        if samples and len(samples) >= self.min_samples:
+            return samples
+        if len(self.global_samples) >= self.min_samples:
+            return self.global_samples
+        return None
+
+    @staticmethod
+    def _host(url: str) -> str:
+        return (urlsplit(url).hostname or "").lower()
+
+
+# Global latency tracker instance
+latency_tracker = LatencyTracker(
+    window=settings.ENRICHMENT_LATENCY_WINDOW,
+    min_samples=settings.ENRICHMENT_LATENCY_MIN_SAMPLES,
+    multiplier=settings.ENRICHMENT_TIMEOUT_MULTIPLIER,
+    min_timeout=settings.ENRICHMENT_MIN_TIMEOUT,
+    max_timeout=settings.HTTP_TIMEOUT,
+    hedge_delay=settings.ENRICHMENT_HEDGE_DELAY,
+    hedge_percentile=settings.ENRICHMENT_HEDGE_PERCENTILE,
+)
@@ -0,0 +1,190 @@
+"""
+In-page extractors for Google Maps
+
+Each extractor is a single JavaScript function run with page.evaluate, so a
+whole detail panel is read in one driver round-trip instead of one
+count()/inner_text() call per field.
+"""
+import re
+from typing import Dict, Union
+
+
+# Detail panel xpaths, keyed by the raw field name returned from the page
+DETAIL_XPATHS: Dict[str, str] = {
+    "name": '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]',
+    "address": '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]',
+    "website": '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]',
+    "phone": '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]',
+    "reviews_count": '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span//span//span[@aria-label]',
+    "reviews_average": '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span[@aria-hidden]',
+    "info1": '//div[@class="LTs0Rc"][1]',  # store
+    "info2": '//div[@class="LTs0Rc"][2]',  # pickup
+    "info3": '//div[@class="LTs0Rc"][3]',  # delivery
+    "opens_at": '//button[contains(@data-item-id, "oh")]//div[contains(@class, "fontBodyMedium")]',  # time
+    "opens_at2": '//div[@class="MkV9"]//span[@class="ZDu9vd"]//span[2]',
+    "place_type": '//div[@class="LBgpqf"]//button[@class="DkEaL "]',  # type of place
+    "introduction": '//div[@class="WeS02d fontBodyMedium"]//div[@class="PYvSYb "]',
+}
+
+# Evaluated with DETAIL_XPATHS as its argument; returns {field: innerText or ""}
+DETAIL_PANEL_JS = """
+(xpaths) => {
+    const text = (xpath) => {
+        const node = document.evaluate(
+            xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+        ).singleNodeValue;
+        return node ? (node.innerText || "") : "";
+    };
+    const out = {};
+    for (const [field, xpath] of Object.entries(xpaths)) {
+        out[field] = text(xpath);
+    }
+    return out;
+}
+"""
+
+# Place URLs embed the place_id as "!19s<place_id>" in their data segment
+PLACE_ID_PATTERN = re.compile(r"!19s(ChIJ[\w-]+)")
+
+
+def place_id_from_url(url: str) -> str:
+    """Extract the Google place_id from a Maps place URL, "" if it has none"""
+    match = PLACE_ID_PATTERN.search(url or "")
+    return match.group(1) if match else ""
+
+
+def parse_reviews_count(text: str) -> int:
+    """Parse '(1,234)' style review counts"""
+    try:
+        return int(text.replace('(', '').replace(')', '').replace(',', ''))
+    except ValueError:
+        return 0
+
+
+def parse_reviews_average(text: str) -> float:
+    """Parse '4,5' or '4.5' style ratings"""
+    try:
+        return float(text.replace(' ', '').replace(',', '.'))
+    except ValueError:
+        return 0.0
+
+
+def parse_opening_hours(primary: str, secondary: str) -> str:
+    """Pick the opening hours from the hours button, falling back to the summary line"""
+    if primary:
+        opens_parts = primary.split('⋅')
+        if len(opens_parts) > 1:
+            return opens_parts[1].replace("\u202f", "")
+        return primary.replace("\u202f", "")
+    if secondary:
+        opens_parts = secondary.split('⋅')
+        if len(opens_parts) > 1:
+            return opens_parts[1].replace("\u202f", "")
+    return ""
+
+
+def parse_detail_panel(raw: Dict[str, str]) -> Dict[str, Union[str, int, float]]:
+    """Convert the raw texts returned by DETAIL_PANEL_JS into a business record"""
+    raw = {field: (raw.get(field) or "") for field in DETAIL_XPATHS}
+
+    # Extract store features (shopping, pickup, delivery)
+    store_shopping = "No"
+    in_store_pickup = "No"
+    store_delivery = "No"
+    for info in (raw["info1"], raw["info2"], raw["info3"]):
+        temp_parts = info.split('·')
+        if len(temp_parts) > 1:
+            check = temp_parts[1].replace("\n", "").lower()
+            if 'shop' in check:
+                store_shopping = "Yes"
+            elif 'pickup' in check:
+                in_store_pickup = "Yes"
+            elif 'delivery' in check:
+                store_delivery = "Yes"
+
+    return {
+        "name": raw["name"],
+        "address": raw["address"],
+        "website": raw["website"],
+        "phone": raw["phone"],
+        "reviews_count": parse_reviews_count(raw["reviews_count"]) if raw["reviews_count"] else 0,
+        "reviews_average": parse_reviews_average(raw["reviews_average"]) if raw["reviews_average"] else 0.0,
+        "store_shopping": store_shopping,
+        "in_store_pickup": in_store_pickup,
+        "store_delivery": store_delivery,
+        "place_type": raw["place_type"],
+        "opening_hours": parse_opening_hours(raw["opens_at"], raw["opens_at2"]),
+        "introduction": raw["introduction"] or "None Found",
+    }
+
+
+# Returns one raw record per result card currently rendered in the feed
+FEED_CARDS_JS = """
+() => Array.from(document.querySelectorAll('.Nv2PK')).map((card) => {
+    const text = (selector) => {
+        const node = card.querySelector(selector);
+        return node ? (node.innerText || "").trim() : "";
+    };
+    const link = card.querySelector('a.hfpxzc');
+    const website = card.querySelector('a[data-value="Website"]');
+    return {
+        name: (link && link.getAttribute('aria-label')) || text('.qBF1Pd'),
+        place_url: link ? link.href : "",
+        rating: text('.MW4etd'),
+        reviews: text('.UY7F9'),
+        rows: Array.from(card.querySelectorAll('.W4Efsd .W4Efsd')).map((row) => (row.innerText || "").trim()),
+        phone: text('.UsdlK'),
+        website: website ? website.href : "",
+    };
+})
+"""
+
+# Returns the place URL of every listing link currently rendered in the feed
+PLACE_URLS_JS = """
+() => Array.from(document.querySelectorAll('a.hfpxzc, a[href*="/maps/place/"]')).map((link) => link.href)
+"""
+
+
+def parse_feed_card(raw: Dict) -> Dict[str, Union[str, int, float]]:
+    """Convert a raw feed card from FEED_CARDS_JS into a (partial) business record"""
+    place_type = ""
+    address = ""
+    rows = [row for row in (raw.get("rows") or []) if row]
+    if rows:
+        # First row looks like "Category · $$ · 123 Main St"
+        segments = [segment.strip() for segment in rows[0].split('·') if segment.strip()]
+        if segments:
+            place_type = segments[0]
+        if len(segments) > 1 and any(char.isdigit() for char in segments[-1]):
+            address = segments[-1]
+
+    rating = raw.get("rating") or ""
+    reviews = raw.get("reviews") or ""
+
+    return {
+        "name": (raw.get("name") or "").strip(),
+        "address": address,
+        "website": raw.get("website") or "",
+        "phone": raw.get("phone") or "",
+        "reviews_count": parse_reviews_count(reviews) if reviews else 0,
+        "reviews_average": parse_reviews_average(rating) if rating else 0.0,
+        "store_shopping": "No",
+        "in_store_pickup": "No",
+        "store_delivery": "No",
+        "place_type": place_type,
+        "opening_hours": "",
+        "introduction": "None Found",
+        "place_id": place_id_from_url(raw.get("place_url")),
+        "place_url": raw.get("place_url") or "",
+    }
+
+
+def merge_details(card: Dict, details: Dict) -> Dict:
+    """Fill gaps in a feed card record with values from its detail panel"""
+    merged = dict(card)
+    for field, value in details.items():
+        if value in ("", None, 0, 0.0, "No", "None Found"):
+            continue
+        if merged.get(field) in ("", None, 0, 0.0, "No", "None Found"):
+            merged[field] = value
+    return merged
@@ -0,0 +1,267 @@
+"""
+Decoder for Google Maps' internal search/place JSON responses
+
+While the feed is scrolled, Maps fetches result pages from /search?tbm=map and
+place details from /maps/preview/place. Those payloads carry most of what we
+would otherwise read by clicking through the DOM, including the place_id.
+
+The layout is undocumented nested arrays. Place records are searched for
+anywhere in the response, so the outer nesting may change, but inside a record
+every field is read from a fixed index. Those indexes are unverified guesses,
+not checked against a captured response (the test fixture,
+tests/fixtures/maps_search_response.txt, is built at the same indexes), and
+Google can move them at any time, so each value is type- and range-checked and
+a field that fails its check is returned as None. Only a missing website or
+phone is worth opening the listing's detail panel for; other None fields get
+the scraper's defaults. The service options (shopping, pickup, delivery) are
+not decoded and start at the scraper's "No" default.
+"""
+import asyncio
+import json
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+from app.config import settings
+from app.utils.loggers import logger
+
+
+XSSI_PREFIX = ")]}'"
+
+# URL fragments of the XHRs that carry place data
+PAYLOAD_URL_MARKERS = ("tbm=map", "/maps/preview/place")
+
+# Observed indexes inside a place record (the array Maps keeps per business)
+NAME_INDEX = 11
+PLACE_ID_INDEX = 78
+ADDRESS_PATH = (39,)
+ADDRESS_PARTS_PATH = (2,)
+RATING_PATH = (4, 7)
+REVIEWS_PATH = (4, 8)
+WEBSITE_PATH = (7, 0)
+CATEGORIES_PATH = (13,)
+DESCRIPTION_PATH = (32, 1, 1)
+PHONE_PATH = (178, 0, 0)
+HOURS_PATH = (203, 1, 4, 0)
+
+# Fields a listing's detail panel is opened for when its payload lacks them
+DETAIL_FIELDS = ("website", "phone")
+
+# Not decoded from payloads; they keep their default unless a detail panel was read anyway
+SERVICE_OPTION_FIELDS = ("store_shopping", "in_store_pickup", "store_delivery")
+
+PHONE_TEXT_PATTERN = re.compile(r"^\+?[\d\s().-]{6,}$")
+
+# Used for fields that neither the payload nor the detail panel supplied
+FIELD_DEFAULTS: Dict[str, Union[str, int, float]] = {
+    "address": "",
+    "website": "",
+    "phone": "",
+    "reviews_count": 0,
+    "reviews_average": 0.0,
+    "store_shopping": "No",
+    "in_store_pickup": "No",
+    "store_delivery": "No",
+    "place_type": "",
+    "opening_hours": "",
+    "introduction": "None Found",
+}
+
+
+def _dig(data: Any, *path: int) -> Any:
+    """Safely index into nested lists, returns None when any step is missing"""
+    for index in path:
+        if not isinstance(data, list) or index >= len(data) or index < -len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def load_payload(text: str) -> Any:
+    """Strip the anti-XSSI prefix (and the tbm=map JSON wrapper) and parse"""
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-len('/*""*/')]
+    if text.startswith(XSSI_PREFIX):
+        text = text[len(XSSI_PREFIX):]
+    data = json.loads(text)
+    if isinstance(data, dict) and isinstance(data.get("d"), str):
+        return load_payload(data["d"])
+    return data
+
+
+def _is_place_record(node: Any) -> bool:
+    return (
+        isinstance(node, list)
+        and len(node) > PLACE_ID_INDEX
+        and isinstance(node[NAME_INDEX], str)
+        and isinstance(node[PLACE_ID_INDEX], str)
+        and node[PLACE_ID_INDEX].startswith("ChIJ")
+    )
+
+
+def iter_place_records(data: Any, max_depth: int = 8) -> Iterator[list]:
+    """Yield every nested array that has a name and a place_id at the record indexes"""
+    if max_depth < 0 or not isinstance(data, list):
+        return
+    if _is_place_record(data):
+        yield data
+        return
+    for child in data:
+        yield from iter_place_records(child, max_depth - 1)
+
+
+def _text(value: Any) -> Optional[str]:
+    return value.strip() if isinstance(value, str) and value.strip() else None
+
+
+def _address(record: list) -> Optional[str]:
+    address = _text(_dig(record, *ADDRESS_PATH))
+    if address:
+        return address
+    parts = _dig(record, *ADDRESS_PARTS_PATH)
+    if isinstance(parts, list) and parts and all(isinstance(part, str) for part in parts):
+        return ", ".join(parts)
+    return None
+
+
+def _rating(record: list) -> Optional[float]:
+    rating = _dig(record, *RATING_PATH)
+    if isinstance(rating, (int, float)) and not isinstance(rating, bool) and 0 <= rating <= 5:
+        return float(rating)
+    return None
+
+
+def _reviews(record: list) -> Optional[int]:
+    reviews = _dig(record, *REVIEWS_PATH)
+    if isinstance(reviews, int) and not isinstance(reviews, bool) and reviews >= 0:
+        return reviews
+    return None
+
+
+def _website(record: list) -> Optional[str]:
+    website = _text(_dig(record, *WEBSITE_PATH))
+    return website if website and website.startswith(("http://", "https://")) else None
+
+
+def _phone(record: list) -> Optional[str]:
+    phone = _text(_dig(record, *PHONE_PATH))
+    return phone if phone and PHONE_TEXT_PATTERN.match(phone) else None
+
+
+def _place_type(record: list) -> Optional[str]:
+    categories = _dig(record, *CATEGORIES_PATH)
+    if isinstance(categories, list) and categories:
+        return _text(categories[0])
+    return None
+
+
+def parse_place_record(record: list) -> Dict[str, Union[str, int, float, None]]:
+    """
+    Convert a place record into the scraper's business dict
+
+    Fields that could not be decoded, or failed their sanity check, are None;
+    see missing_fields and fill_missing. The service options are never decoded
+    and get their defaults here.
+    """
+    place_id = record[PLACE_ID_INDEX]
+    return {
+        "name": record[NAME_INDEX],
+        "address": _address(record),
+        "website": _website(record),
+        "phone": _phone(record),
+        "reviews_count": _reviews(record),
+        "reviews_average": _rating(record),
+        **{field: FIELD_DEFAULTS[field] for field in SERVICE_OPTION_FIELDS},
+        "place_type": _place_type(record),
+        "opening_hours": _text(_dig(record, *HOURS_PATH)),
+        "introduction": _text(_dig(record, *DESCRIPTION_PATH)),
+        "place_id": place_id,
+        "place_url": f"https://www.google.com/maps/place/?q=place_id:{place_id}",
+    }
+
+
+def missing_fields(business: Dict, fields: Optional[Iterable[str]] = None) -> List[str]:
+    """Fields of a decoded business the payload could not supply, only among fields if given"""
+    fields = business.keys() if fields is None else fields
+    return [field for field in fields if business.get(field) is None]
+
+
+def fill_missing(business: Dict, details: Optional[Dict] = None) -> Dict[str, Union[str, int, float]]:
+    """
+    Fill a decoded business's None fields from its detail panel, else with the scraper's defaults
+    When a detail panel was read, its service options replace the undecoded defaults too
+    """
+    filled = dict(business)
+    for field in missing_fields(business):
+        value = details.get(field) if details else None
+        filled[field] = value if value is not None else FIELD_DEFAULTS.get(field, "")
+    if details:
+        for field in SERVICE_OPTION_FIELDS:
+            if details.get(field) is not None:
+                filled[field] = details[field]
+    return filled
+
+
+def decode_payload(text: str) -> List[Dict[str, Union[str, int, float, None]]]:
+    """Decode every business in a search/place response body, [] if it is not one"""
+    try:
+        data = load_payload(text)
+    except (ValueError, TypeError):
+        return []
+
+    businesses = []
+    for record in iter_place_records(data):
+        try:
+            businesses.append(parse_place_record(record))
+        except Exception as e:
+            logger.debug(f"Skipping undecodable place record: {e}")
+    return businesses
+
+
+class PayloadCollector:
+    """Captures place payloads from a page's responses while it is being scrolled"""
+
+    def __init__(self, page):
+        self.page = page
+        self.tasks: List[asyncio.Task] = []
+        self.businesses: Dict[str, Dict] = {}  # place_id -> business, in arrival order
+        self.responses = 0
+
+    def attach(self):
+        self.page.on("response", self._on_response)
+
+    def detach(self):
+        self.page.remove_listener("response", self._on_response)
+
+    def _on_response(self, response):
+        if any(marker in response.url for marker in PAYLOAD_URL_MARKERS):
+            self.tasks.append(asyncio.create_task(self._read(response)))
+
+    async def _read(self, response):
+        try:
+            text = await response.text()
+        except Exception:
+            return
+        self.responses += 1
+        if settings.MAPS_PAYLOAD_DUMP_DIR:
+            self._dump(text)
+        for business in decode_payload(text):
+            self.businesses.setdefault(business["place_id"], business)
+
+    def _dump(self, text: str):
+        try:
+            directory = Path(settings.MAPS_PAYLOAD_DUMP_DIR)
+            directory.mkdir(parents=True, exist_ok=True)
+            (directory / f"maps-payload-{time.time_ns()}.txt").write_text(text, encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Could not save Maps payload: {e}")
+
+    async def drain(self, limit: Optional[int] = None) -> List[Dict[str, Union[str, int, float, None]]]:
+        """Stop listening, wait for pending bodies and return the decoded businesses"""
+        self.detach()
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        businesses = list(self.businesses.values())
+        logger.info(f"Decoded {len(businesses)} businesses from {self.responses} Maps payloads")
+        return businesses[:limit] if limit else businesses
@@ -0,0 +1,216 @@
+"""
+Readiness-driven waits for the Google Maps engines
+
+Each wait resolves as soon as the page is ready and is capped by a timeout, so
+no time is burnt on fixed sleeps. Politeness jitter is a separate, configurable
+policy instead of being folded into those waits.
+"""
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import List, Tuple
+from app.config import settings
+from app.utils.loggers import logger
+
+
+# URL fragments of the XHRs that return search results (place details use /maps/preview/place)
+SEARCH_URL_MARKERS = ("tbm=map",)
+
+# Number of result entries currently rendered in the feed
+FEED_COUNT_JS = """
+() => document.querySelectorAll('.Nv2PK').length
+    || document.querySelectorAll('a[href*="/maps/place/"]').length
+"""
+
+# True once Maps shows the "You've reached the end of the list." marker
+END_OF_LIST_JS = """
+() => {
+    if (document.querySelector('.HlvSq')) {
+        return true;
+    }
+    const feed = document.querySelector('div[role="feed"]');
+    return !!feed && feed.innerText.includes("reached the end of the list");
+}
+"""
+
+# Resolves when the feed grew past previousCount or the end marker appeared
+FEED_GROWTH_JS = f"""
+(previousCount) => ({FEED_COUNT_JS.strip()})() > previousCount || ({END_OF_LIST_JS.strip()})()
+"""
+
+
+@dataclass
+class PolitenessPolicy:
+    """Random pause between page actions, kept apart from readiness waits"""
+    min_ms: int = 250
+    max_ms: int = 1000
+
+    async def pause(self):
+        if self.max_ms <= 0:
+            return
+        await asyncio.sleep(self.delay_ms() / 1000)
+
+    def pause_sync(self, page):
+        """pause() for sync Playwright pages"""
+        if self.max_ms <= 0:
+            return
+        page.wait_for_timeout(self.delay_ms())
+
+    def delay_ms(self) -> int:
+        return random.randint(max(0, self.min_ms), max(self.min_ms, self.max_ms))
+
+
+async def feed_state(page) -> Tuple[int, bool]:
+    """Get the current feed count and whether the end of the list was reached"""
+    return await page.evaluate(FEED_COUNT_JS), await page.evaluate(END_OF_LIST_JS)
+
+
+async def wait_for_feed_growth(page, previous_count: int, timeout_ms: int) -> Tuple[int, bool]:
+    """
+    Wait until the feed has more than previous_count entries or the end marker shows
+    Returns the feed state when the wait resolved or hit its cap
+    """
+    try:
+        await page.wait_for_function(FEED_GROWTH_JS, arg=previous_count, timeout=timeout_ms)
+    except Exception:
+        logger.debug(f"Feed did not grow past {previous_count} within {timeout_ms}ms")
+    return await feed_state(page)
+
+
+def wait_for_feed_growth_sync(page, previous_count: int, timeout_ms: int) -> Tuple[int, bool]:
+    """wait_for_feed_growth for sync Playwright pages"""
+    try:
+        page.wait_for_function(FEED_GROWTH_JS, arg=previous_count, timeout=timeout_ms)
+    except Exception:
+        logger.debug(f"Feed did not grow past {previous_count} within {timeout_ms}ms")
+    return page.evaluate(FEED_COUNT_JS), page.evaluate(END_OF_LIST_JS)
+
+
+def any_of_selectors(page, selectors: List[str]):
+    """
+    One locator matching whichever selector appears first
+    Locator building is synchronous, so this works for sync and async pages alike
+    """
+    locator = page.locator(selectors[0])
+    for selector in selectors[1:]:
+        locator = locator.or_(page.locator(selector))
+    return locator.first
+
+
+async def wait_for_any_selector(page, selectors: List[str], timeout_ms: int) -> bool:
+    """Race all selectors under a single deadline, returns False if none matched in time"""
+    try:
+        await any_of_selectors(page, selectors).wait_for(state="visible", timeout=timeout_ms)
+        return True
+    except Exception as e:
+        logger.warning(f"None of {len(selectors)} selectors matched within {timeout_ms}ms: {str(e)}")
+        return False
+
+
+def wait_for_any_selector_sync(page, selectors: List[str], timeout_ms: int) -> bool:
+    """wait_for_any_selector for sync Playwright pages"""
+    try:
+        any_of_selectors(page, selectors).wait_for(state="visible", timeout=timeout_ms)
+        return True
+    except Exception as e:
+        logger.warning(f"None of {len(selectors)} selectors matched within {timeout_ms}ms: {str(e)}")
+        return False
+
+
+async def wait_for_selectors_or_fallback(
+    page, selectors: List[str], fallback_selectors: List[str], timeout_ms: int, fallback_timeout_ms: int
+) -> bool:
+    """
+    Race the specific selectors, and only if none matched try the loose fallback ones
+    A loose selector such as //h1 is visible before the wanted element is (the feed
+    heading, or the previous listing's panel), so it must not take part in the race
+    """
+    if await wait_for_any_selector(page, selectors, timeout_ms):
+        return True
+    return await wait_for_any_selector(page, fallback_selectors, fallback_timeout_ms)
+
+
+def wait_for_selectors_or_fallback_sync(
+    page, selectors: List[str], fallback_selectors: List[str], timeout_ms: int, fallback_timeout_ms: int
+) -> bool:
+    """wait_for_selectors_or_fallback for sync Playwright pages"""
+    if wait_for_any_selector_sync(page, selectors, timeout_ms):
+        return True
+    return wait_for_any_selector_sync(page, fallback_selectors, fallback_timeout_ms)
+
+
+class SearchRequestTracker:
+    """
+    Tracks Maps search XHRs so the page can be waited on until they settle
+    Attach it before the action that triggers the search, so a request that
+    starts right away is counted; traffic not matching url_markers is ignored
+    """
+
+    def __init__(self, page, url_markers: Tuple[str, ...] = SEARCH_URL_MARKERS):
+        self.page = page
+        self.url_markers = url_markers
+        self.inflight = set()
+        self.last_activity = time.monotonic()
+
+    def attach(self):
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_done)
+        self.page.on("requestfailed", self._on_done)
+
+    def detach(self):
+        for event, handler in (
+            ("request", self._on_request),
+            ("requestfinished", self._on_done),
+            ("requestfailed", self._on_done),
+        ):
+            try:
+                self.page.remove_listener(event, handler)
+            except Exception:
+                pass
+
+    def is_quiet(self, quiet_ms: int) -> bool:
+        """No search request in flight and none finished within quiet_ms"""
+        return not self.inflight and (time.monotonic() - self.last_activity) * 1000 >= quiet_ms
+
+    async def wait_quiet(self, quiet_ms: int = 500, timeout_ms: int = 5000) -> bool:
+        """Wait until the search requests have been quiet for quiet_ms, returns False if the cap was hit first"""
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            if self.is_quiet(quiet_ms):
+                return True
+            await asyncio.sleep(0.05)
+        logger.debug(f"{len(self.inflight)} search requests still in flight after {timeout_ms}ms")
+        return False
+
+    def wait_quiet_sync(self, quiet_ms: int = 500, timeout_ms: int = 5000) -> bool:
+        """wait_quiet for sync Playwright pages, whose events are only dispatched while the page waits"""
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            if self.is_quiet(quiet_ms):
+                return True
+            self.page.wait_for_timeout(50)
+        logger.debug(f"{len(self.inflight)} search requests still in flight after {timeout_ms}ms")
+        return False
+
+    def _matches(self, request) -> bool:
+        return request.resource_type in ("xhr", "fetch") and any(
+            marker in request.url for marker in self.url_markers
+        )
+
+    def _on_request(self, request):
+        if self._matches(request):
+            self.inflight.add(request)
+            self.last_activity = time.monotonic()
+
+    def _on_done(self, request):
+        if request in self.inflight:
+            self.inflight.discard(request)
+            self.last_activity = time.monotonic()
+
+
+# Global politeness policy for the async engine
+politeness = PolitenessPolicy(
+    min_ms=settings.MAPS_POLITENESS_MIN_MS,
+    max_ms=settings.MAPS_POLITENESS_MAX_MS,
+)
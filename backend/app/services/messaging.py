@@ -4,6 +4,7 @@ from email.mime.multipart import MIMEMultipart
 from app.config import settings
 from app.utils.loggers import logger
 from app.utils.rate_limiter import check_rate_limit
+from app.services.phone_normalization import normalize_phone
 from twilio.rest import Client
 
 twilio_client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
@@ -51,6 +52,13 @@ class MessageService:
             logger.warning(f"Rate limit exceeded for WhatsApp to {to}")
             raise Exception("Twilio rate limit exceeded")
         
+        # Twilio needs E.164; recipients from imports may still be in national format
+        number = normalize_phone(to)
+        if not number:
+            logger.warning(f"Invalid WhatsApp number: {to}")
+            raise Exception(f"WhatsApp send failed: invalid phone number {to}")
+        to = number
+        
         try:
             message = twilio_client.messages.create(
                 body=body,
@@ -0,0 +1,137 @@
+"""
+Phone number normalization on top of phonenumbers.
+
+Every phone the app stores or sends - from Maps listings, website enrichment,
+imports and outreach - goes through normalize_phone, which returns E.164
+("+15125550142") or None. National-format numbers are parsed with a region
+hint taken from the job's query or the business address, falling back to
+DEFAULT_PHONE_REGION. Parsing is memoized, since the same numbers recur across
+listings, pages and jobs.
+"""
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+import phonenumbers
+from app.config import settings
+
+
+# Country names, matched case-insensitively as whole phrases. City names are
+# left out unless they have no well-known namesake elsewhere: London, Dublin,
+# Paris or Melbourne are also US towns, and a wrong region makes every
+# national number in the job fail to parse.
+REGION_HINTS: Dict[str, str] = {
+    "united states": "US", "usa": "US", "u.s.a.": "US", "u.s.": "US",
+    "canada": "CA",
+    "united kingdom": "GB", "uk": "GB", "england": "GB", "scotland": "GB", "wales": "GB", "northern ireland": "GB",
+    "ireland": "IE",
+    "australia": "AU",
+    "new zealand": "NZ", "auckland": "NZ",
+    "india": "IN", "mumbai": "IN", "new delhi": "IN", "bangalore": "IN", "bengaluru": "IN",
+    "chennai": "IN", "kolkata": "IN",
+    "germany": "DE", "deutschland": "DE", "münchen": "DE",
+    "france": "FR",
+    "spain": "ES", "españa": "ES",
+    "italy": "IT", "italia": "IT",
+    "netherlands": "NL",
+    "belgium": "BE", "switzerland": "CH", "austria": "AT",
+    "sweden": "SE", "norway": "NO", "denmark": "DK", "finland": "FI", "poland": "PL", "portugal": "PT",
+    "brazil": "BR", "brasil": "BR", "mexico": "MX", "méxico": "MX", "argentina": "AR",
+    "south africa": "ZA", "nigeria": "NG", "kenya": "KE", "egypt": "EG",
+    "pakistan": "PK", "bangladesh": "BD", "sri lanka": "LK", "nepal": "NP",
+    "singapore": "SG", "malaysia": "MY", "philippines": "PH", "indonesia": "ID", "thailand": "TH",
+    "japan": "JP", "tokyo": "JP", "china": "CN", "hong kong": "HK", "south korea": "KR", "seoul": "KR",
+    "united arab emirates": "AE", "uae": "AE", "dubai": "AE", "abu dhabi": "AE",
+    "saudi arabia": "SA", "qatar": "QA", "turkey": "TR", "türkiye": "TR", "israel": "IL",
+    # Longer place names containing a country name; longest match wins, so "wales" never matches inside them
+    "new south wales": "AU", "new england": "US", "new mexico": "US",
+}
+
+REGION_HINT_PATTERN = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(name) for name in sorted(REGION_HINTS, key=len, reverse=True)) + r")(?!\w)",
+    re.IGNORECASE,
+)
+US_STATES = (
+    "AL|AK|AZ|AR|CA|CO|CT|DE|DC|FL|GA|HI|ID|IL|IN|IA|KS|KY|LA|ME|MD|MA|MI|MN|MS|MO|MT|NE|NV|NH|NJ|NM|NY|NC|ND|"
+    "OH|OK|OR|PA|RI|SC|SD|TN|TX|UT|VT|VA|WA|WV|WI|WY|PR"
+)
+# "TX 78704" / "TX 78704-1234" in US addresses, "M5V 2T6" Canadian postcodes
+US_STATE_ZIP_PATTERN = re.compile(r"\b(?:" + US_STATES + r")\s+\d{5}(?:-\d{4})?\b")
+CA_POSTCODE_PATTERN = re.compile(r"\b[A-Z]\d[A-Z]\s?\d[A-Z]\d\b")
+# A trailing state code without a ZIP, as in "cafes Paris TX" or "..., Austin, TX"
+US_STATE_SUFFIX_PATTERN = re.compile(r"(?:,\s*|\s)(?:" + US_STATES + r")\.?\s*$")
+
+
+@lru_cache(maxsize=4096)
+def _region_from_text(text: str) -> Optional[str]:
+    # Postal codes are the most specific hint, whatever place names come before them
+    if US_STATE_ZIP_PATTERN.search(text):
+        return "US"
+    if CA_POSTCODE_PATTERN.search(text):
+        return "CA"
+    matches = REGION_HINT_PATTERN.findall(text)
+    if matches:
+        # The country usually comes last in an address ("..., London, UK")
+        return REGION_HINTS[matches[-1].lower()]
+    if US_STATE_SUFFIX_PATTERN.search(text):
+        return "US"
+    return None
+
+
+def region_hint(*texts: Optional[str]) -> str:
+    """Region code for parsing national numbers, from the first text that names a place"""
+    for text in texts:
+        if text:
+            region = _region_from_text(text)
+            if region:
+                return region
+    return settings.DEFAULT_PHONE_REGION
+
+
+@lru_cache(maxsize=settings.PHONE_NORMALIZATION_CACHE_SIZE)
+def normalize_phone(phone: Optional[str], region: Optional[str] = None) -> Optional[str]:
+    """Convert a phone to E.164, None if it is not a valid number"""
+    if not phone:
+        return None
+    phone = phone.strip()
+    if phone.lower().startswith(("tel:", "whatsapp:")):
+        phone = phone.split(":", 1)[1]
+    if phone.startswith("00"):
+        phone = "+" + phone[2:]
+
+    try:
+        parsed = phonenumbers.parse(phone, region or settings.DEFAULT_PHONE_REGION)
+    except phonenumbers.NumberParseException:
+        return None
+    if not phonenumbers.is_valid_number(parsed):
+        return None
+    return phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+
+
+def normalize_phones(
+    phones: Sequence[Optional[str]],
+    region: Union[str, Sequence[Optional[str]], None] = None,
+) -> List[Optional[str]]:
+    """
+    Normalize many phones at once, returning a list aligned with the input
+    region is either one region for the whole batch or one per phone
+    """
+    if region is None or isinstance(region, str):
+        return [normalize_phone(phone, region) for phone in phones]
+    return [normalize_phone(phone, phone_region) for phone, phone_region in zip(phones, region)]
+
+
+def unique_phones(phones: Iterable[Optional[str]], region: Optional[str] = None) -> List[str]:
+    """Normalize phones and drop invalid ones and duplicates, keeping first-seen order"""
+    return list(dict.fromkeys(normalized for normalized in normalize_phones(list(phones), region) if normalized))
+
+
+def get_stats() -> Dict:
+    """Get normalization cache statistics"""
+    info = normalize_phone.cache_info()
+    return {
+        "default_region": settings.DEFAULT_PHONE_REGION,
+        "cache_hits": info.hits,
+        "cache_misses": info.misses,
+        "cache_size": info.currsize,
+        "cache_max_size": info.maxsize,
+    }
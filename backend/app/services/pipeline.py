@@ -0,0 +1,188 @@
+"""
+Staged asyncio pipeline with bounded queues.
+
+A source (an async iterator) feeds a chain of stages. Each stage has its own
+worker count and a bounded input queue. A worker takes an item, awaits the
+stage handler, and passes the result on, or drops the item when the handler
+returns None. Stages overlap: the first item can be persisted while later
+ones are still being scraped.
+
+Backpressure comes from the queues. When a stage falls behind, its queue
+fills, the stage feeding it blocks on put(), and in the end the source is not
+pulled. For a Maps scrape that means the browser stops scrolling instead of
+results piling up in memory.
+
+Per-stage counters (received, emitted, dropped, failed, queue depth,
+throughput) are kept for pipelines that are running and, in total per stage
+name, for the life of the process.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from app.utils.loggers import logger
+
+
+StageHandler = Callable[[Any], Awaitable[Optional[Any]]]
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+@dataclass
+class StageStats:
+    """Counters for one stage of one pipeline run"""
+    received: int = 0
+    emitted: int = 0
+    dropped: int = 0
+    failed: int = 0
+    busy_seconds: float = 0.0
+    max_queue_depth: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def to_dict(self, queue_depth: int) -> Dict:
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        return {
+            "received": self.received,
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "queue_depth": queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "items_per_second": round((self.received or self.emitted) / elapsed, 2),
+            "busy_seconds": round(self.busy_seconds, 2),
+        }
+
+
+@dataclass
+class Stage:
+    """One pipeline stage: a handler run by concurrency workers off a bounded queue"""
+    name: str
+    handler: StageHandler
+    concurrency: int = 1
+    queue_size: int = 20
+    queue: Optional[asyncio.Queue] = None
+    stats: StageStats = field(default_factory=StageStats)
+    workers_left: int = 0
+
+
+class Pipeline:
+    """A source and a chain of stages, run to completion by run()"""
+
+    # Pipelines currently running in this process, by name
+    active: Dict[str, "Pipeline"] = {}
+    # Totals per stage name across finished pipelines
+    totals: Dict[str, Dict[str, float]] = {}
+
+    def __init__(self, name: str, source_name: str = "source"):
+        self.name = name
+        self.source_name = source_name
+        self.stages: List[Stage] = []
+        self.source_stats = StageStats()
+
+    def add_stage(self, name: str, handler: StageHandler, concurrency: int = 1, queue_size: int = 20) -> "Pipeline":
+        """Append a stage; the handler returns the item for the next stage, or None to drop it"""
+        self.stages.append(Stage(name=name, handler=handler, concurrency=max(1, concurrency), queue_size=max(1, queue_size)))
+        return self
+
+    async def run(self, source: AsyncIterator[Any]) -> Dict:
+        """Feed source through every stage and wait until all items have drained, returns the stats"""
+        for stage in self.stages:
+            stage.queue = asyncio.Queue(maxsize=stage.queue_size)
+            stage.stats = StageStats()
+            stage.workers_left = stage.concurrency
+        self.source_stats = StageStats()
+
+        Pipeline.active[self.name] = self
+        tasks = [asyncio.create_task(self._feed(source))]
+        for index, stage in enumerate(self.stages):
+            tasks.extend(asyncio.create_task(self._work(index)) for _ in range(stage.concurrency))
+
+        try:
+            # The first failure (only the source and the plumbing can fail, handlers are contained) stops everything
+            done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+            for task in done:
+                if task.exception() is not None:
+                    raise task.exception()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            Pipeline.active.pop(self.name, None)
+            self._add_to_totals()
+
+        stats = self.get_stats()
+        logger.info(f"Pipeline {self.name} finished: {stats}")
+        return stats
+
+    def get_stats(self) -> Dict:
+        """Per-stage counters for this pipeline"""
+        stats = {self.source_name: self.source_stats.to_dict(0)}
+        for stage in self.stages:
+            stats[stage.name] = stage.stats.to_dict(stage.queue.qsize() if stage.queue else 0)
+        return stats
+
+    async def _feed(self, source: AsyncIterator[Any]):
+        first = self.stages[0]
+        try:
+            async for item in source:
+                self.source_stats.emitted += 1
+                await self._put(first, item)
+        finally:
+            # Close an abandoned generator now, so e.g. a Maps scrape releases its browser context
+            if hasattr(source, "aclose"):
+                await source.aclose()
+        for _ in range(first.concurrency):
+            await first.queue.put(_DONE)
+
+    async def _work(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+        while True:
+            item = await stage.queue.get()
+            if item is _DONE:
+                break
+
+            stage.stats.received += 1
+            started = time.monotonic()
+            try:
+                result = await stage.handler(item)
+            except Exception as e:
+                stage.stats.failed += 1
+                logger.error(f"Pipeline {self.name} stage {stage.name} failed on an item: {str(e)}")
+                continue
+            finally:
+                stage.stats.busy_seconds += time.monotonic() - started
+
+            if result is None:
+                stage.stats.dropped += 1
+                continue
+            stage.stats.emitted += 1
+            if next_stage:
+                await self._put(next_stage, result)
+
+        # The last worker of a stage closes the next stage's input
+        stage.workers_left -= 1
+        if stage.workers_left == 0 and next_stage:
+            for _ in range(next_stage.concurrency):
+                await next_stage.queue.put(_DONE)
+
+    @staticmethod
+    async def _put(stage: Stage, item: Any):
+        await stage.queue.put(item)  # blocks while the stage is full: backpressure
+        stage.stats.max_queue_depth = max(stage.stats.max_queue_depth, stage.queue.qsize())
+
+    def _add_to_totals(self):
+        for name, counters in self.get_stats().items():
+            totals = Pipeline.totals.setdefault(name, {})
+            for key in ("received", "emitted", "dropped", "failed", "busy_seconds"):
+                totals[key] = round(totals.get(key, 0) + counters[key], 2)
+            totals["max_queue_depth"] = max(totals.get("max_queue_depth", 0), counters["max_queue_depth"])
+
+
+def get_stats() -> Dict:
+    """Get statistics for running pipelines and totals per stage"""
+    return {
+        "running": {name: pipeline.get_stats() for name, pipeline in Pipeline.active.items()},
+        "totals": Pipeline.totals,
+    }
@@ -10,6 +10,7 @@ from app.utils.loggers import logger
 
 # Global Playwright instance to avoid multiple initializations
 _playwright_instance: Optional[Playwright] = None
+_playwright_lock: Optional[asyncio.Lock] = None  # Callers during startup share one instance
 
 
 def setup_windows_event_loop():
@@ -28,40 +29,49 @@ def setup_windows_event_loop():
             logger.warning(f"Could not set Windows event loop policy: {e}")
 
 
+def install_browsers():
+    """Install/verify Playwright's Chromium (in production, this should be done during deployment)"""
+    try:
+        import subprocess
+        result = subprocess.run(
+            [sys.executable, "-m", "playwright", "install", "chromium"], 
+            capture_output=True, 
+            text=True,
+            timeout=120  # 2 minutes timeout
+        )
+        if result.returncode == 0:
+            logger.info("Playwright browsers installed/verified successfully")
+        else:
+            logger.warning(f"Playwright install warning: {result.stderr}")
+    except Exception as install_error:
+        logger.warning(f"Could not verify Playwright installation: {install_error}")
+
+
 async def get_playwright() -> Playwright:
     """
     Get or create a Playwright instance with proper Windows configuration
     """
-    global _playwright_instance
+    global _playwright_instance, _playwright_lock
     
-    if _playwright_instance is None:
-        try:
-            # Ensure proper event loop for Windows
-            setup_windows_event_loop()
-            
-            # Install Playwright browsers if needed (in production, this should be done during deployment)
+    if _playwright_lock is None:
+        _playwright_lock = asyncio.Lock()
+    
+    async with _playwright_lock:
+        if _playwright_instance is None:
             try:
-                import subprocess
-                result = subprocess.run(
-                    [sys.executable, "-m", "playwright", "install", "chromium"], 
-                    capture_output=True, 
-                    text=True,
-                    timeout=120  # 2 minutes timeout
-                )
-                if result.returncode == 0:
-                    logger.info("Playwright browsers installed/verified successfully")
-                else:
-                    logger.warning(f"Playwright install warning: {result.stderr}")
-            except Exception as install_error:
-                logger.warning(f"Could not verify Playwright installation: {install_error}")
-            
-            # Create Playwright instance
-            _playwright_instance = await async_playwright().start()
-            logger.info("Playwright instance created successfully")
-            
-        except Exception as e:
-            logger.error(f"Failed to initialize Playwright: {e}")
-            raise
+                # Ensure proper event loop for Windows
+                setup_windows_event_loop()
+                
+                # The install check takes seconds to minutes, keep it off the event loop
+                await asyncio.to_thread(install_browsers)
+                
+                # Create Playwright instance
+                _playwright_instance = await async_playwright().start()
+                logger.info("Playwright instance created successfully")
+                
+            except Exception as e:
+                logger.error(f"Failed to initialize Playwright: {e}")
+                raise
     
     return _playwright_instance
 
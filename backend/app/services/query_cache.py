@@ -0,0 +1,127 @@
+"""
+Result cache for completed searches.
+
+A search identical to one that completed less than QUERY_CACHE_TTL seconds
+ago is not scraped again. The new SearchJob gets a copy of the earlier job's
+ScrapeResults, made with one INSERT ... SELECT in the request's transaction,
+and is returned already completed. Its Google Sheets worksheet is still
+written, by a "sheets_export" queue entry added in the same transaction, since
+gspread is blocking and must not run in the API request. Searches are identical when they scrape
+the same Maps query (after preprocess_business_query, case and whitespace
+folded) with the same limit, depth and deep_fetch_contacts.
+
+Only jobs flagged cacheable are served: a job that completed with fallback
+sample data, because Maps was blocked or the scraper failed, is never reused.
+
+The cache lives in the database, so every API process shares it, and
+force_refresh on a request skips it.
+"""
+import datetime
+from typing import Dict, Optional
+from sqlalchemy import insert, literal
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+from app.config import settings
+from app.models import SearchJob, ScrapeResult
+from app.schemas import SearchRequest
+from app.services.job_queue import job_queue
+from app.services.search_jobs import preprocess_business_query
+from app.utils.loggers import logger
+
+
+# ScrapeResult columns copied to the new job
+RESULT_COLUMNS = [
+    column.name for column in ScrapeResult.__table__.columns
+    if column.name not in ("id", "job_id")
+]
+
+
+class QueryResultCache:
+    """Materializes new jobs from the results of recent identical ones"""
+
+    def __init__(self, enabled: bool = True, ttl: int = 21600):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "forced_refreshes": 0,
+            "results_materialized": 0,
+        }
+
+    @staticmethod
+    def key(request: SearchRequest) -> str:
+        """Cache key of a search: the normalized Maps query, limit, depth and deep_fetch_contacts"""
+        query = " ".join(preprocess_business_query(request.query).lower().split())
+        # deep_fetch_contacts only changes what depth='feed' scrapes
+        deep_fetch = request.depth == "feed" and request.deep_fetch_contacts
+        return f"{query}|{request.limit}|{request.depth}|{int(deep_fetch)}"
+
+    async def materialize(self, db: AsyncSession, job: SearchJob, request: SearchRequest) -> Optional[int]:
+        """
+        Copy a fresh cached result set into job, mark it completed and queue its Sheets export
+        Returns the source job id, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        if request.force_refresh:
+            self.stats["forced_refreshes"] += 1
+            return None
+
+        fresh_after = datetime.datetime.utcnow() - datetime.timedelta(seconds=self.ttl)
+        result = await db.execute(
+            select(SearchJob)
+            .where(
+                SearchJob.query_key == job.query_key,
+                SearchJob.status == "completed",
+                SearchJob.cacheable.is_(True),
+                SearchJob.completed_at >= fresh_after,
+                SearchJob.id != job.id,
+            )
+            .order_by(SearchJob.completed_at.desc())
+            .limit(1)
+        )
+        source = result.scalar_one_or_none()
+        if source is None:
+            self.stats["misses"] += 1
+            return None
+
+        columns = [getattr(ScrapeResult, name) for name in RESULT_COLUMNS]
+        copied = await db.execute(
+            insert(ScrapeResult).from_select(
+                ["job_id", *RESULT_COLUMNS],
+                select(literal(job.id), *columns).where(ScrapeResult.job_id == source.id),
+            )
+        )
+        if not copied.rowcount:
+            self.stats["misses"] += 1
+            return None
+
+        job.status = "completed"
+        # Keep the original scrape time, so copies of copies don't outlive the TTL
+        job.completed_at = source.completed_at
+        job.cached_from_job_id = source.id
+        job.cacheable = True
+        # Not job_id, so the export's retries leave the completed job's status alone
+        await job_queue.enqueue(db, None, {"job_id": job.id, "query": request.query}, kind="sheets_export")
+        self.stats["hits"] += 1
+        self.stats["results_materialized"] += copied.rowcount
+        logger.info(f"Job {job.id} served {copied.rowcount} cached results from job {source.id}")
+        return source.id
+
+    def get_stats(self) -> Dict:
+        """Get query cache statistics"""
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "ttl": self.ttl,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            **self.stats,
+        }
+
+
+# Global query result cache instance
+query_cache = QueryResultCache(
+    enabled=settings.QUERY_CACHE_ENABLED,
+    ttl=settings.QUERY_CACHE_TTL,
+)
@@ -0,0 +1,184 @@
+"""
+Rendered (headless browser) fetches for website enrichment.
+
+The static httpx fetch is enough for most business sites, but some render
+their contact details client-side. Those sites are escalated here, and only
+when the static HTML found no email and looks like a JavaScript app shell.
+
+All rendered fetches share one BrowserContext leased from the browser pool.
+Each fetch opens its own page in it, and ENRICHMENT_RENDER_CONCURRENCY caps
+how many run at once. The lease is returned to the pool after
+ENRICHMENT_RENDER_IDLE_SECONDS without a rendered fetch, so Maps jobs get the
+slot back between bursts. Maps scrapes hold their slots for minutes, so both
+the wait for a render slot and the wait for the lease are capped at
+ENRICHMENT_RENDER_ACQUIRE_TIMEOUT; when it runs out the caller keeps its
+static result.
+"""
+import asyncio
+import re
+import time
+from contextlib import AsyncExitStack
+from typing import Dict, Optional
+from playwright.async_api import BrowserContext
+from app.config import settings
+from app.services.browser_pool import browser_pool
+from app.services.contact_extraction import visible_text
+from app.services.request_blocking import resource_blocker
+from app.utils.loggers import logger
+
+
+# Mount points and bootstrap globals of client-rendered apps and site builders
+JS_APP_MARKERS = re.compile(
+    r"<div[^>]+id=[\"'](?:root|app|__next|___gatsby|svelte)[\"'][^>]*>\s*</div>"
+    r"|__NEXT_DATA__|__NUXT__|ng-version=|window\.__INITIAL_STATE__"
+    r"|enable javascript|javascript is (?:disabled|required)",
+    re.IGNORECASE,
+)
+# Pages with less visible text than this are treated as shells whatever their markup
+MIN_VISIBLE_TEXT = 200
+
+
+def looks_js_rendered(html: str) -> bool:
+    """Whether a statically fetched page probably needs a browser to show its content"""
+    if not html:
+        return False
+    text_length = len(" ".join(visible_text(html).split()))
+    if text_length < MIN_VISIBLE_TEXT:
+        return True
+    return text_length < MIN_VISIBLE_TEXT * 10 and JS_APP_MARKERS.search(html) is not None
+
+
+class RenderedFetcher:
+    """Capped rendered page fetches on one shared, lazily leased browser context"""
+
+    def __init__(
+        self,
+        max_concurrent: int = 2,
+        timeout_ms: int = 15000,
+        idle_seconds: int = 60,
+        acquire_timeout: float = 5.0,
+    ):
+        self.max_concurrent = max(1, max_concurrent)
+        self.timeout_ms = timeout_ms
+        self.idle_seconds = idle_seconds
+        self.acquire_timeout = acquire_timeout
+
+        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.lock = asyncio.Lock()
+        self.lease: Optional[AsyncExitStack] = None
+        self.context: Optional[BrowserContext] = None
+        self.idle_task: Optional[asyncio.Task] = None
+        self.active = 0
+        self.last_used = 0.0
+        self.stats: Dict[str, int] = {
+            "rendered_fetches": 0,
+            "render_failures": 0,
+            "leases": 0,
+            "acquire_timeouts": 0,
+        }
+
+    async def fetch(self, url: str) -> str:
+        """
+        Render url in the shared context and return the resulting HTML
+        Raises asyncio.TimeoutError if no render slot or browser context frees up within acquire_timeout
+        """
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.stats["acquire_timeouts"] += 1
+            raise
+        try:
+            return await self._render(url)
+        finally:
+            self.semaphore.release()
+
+    async def _render(self, url: str) -> str:
+        try:
+            context = await self._get_context()
+        except asyncio.TimeoutError:
+            self.stats["acquire_timeouts"] += 1
+            raise
+        self.active += 1
+        page = None
+        try:
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded", timeout=self.timeout_ms)
+            try:
+                # Give client-side rendering a moment to fetch and draw the content
+                await page.wait_for_load_state("networkidle", timeout=self.timeout_ms // 3)
+            except Exception:
+                pass
+            html = await page.content()
+            self.stats["rendered_fetches"] += 1
+            return html
+        except Exception:
+            self.stats["render_failures"] += 1
+            if not context.browser or not context.browser.is_connected():
+                await self.release()
+            raise
+        finally:
+            if page:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+            self.active -= 1
+            self.last_used = time.monotonic()
+
+    async def release(self):
+        """Close the shared context and return its slot to the browser pool"""
+        async with self.lock:
+            lease, self.lease, self.context = self.lease, None, None
+            if self.idle_task and self.idle_task is not asyncio.current_task():
+                self.idle_task.cancel()
+            self.idle_task = None
+        if lease:
+            try:
+                await lease.aclose()
+            except Exception as e:
+                logger.warning(f"Error releasing rendered fetch context: {e}")
+            logger.info("Rendered fetch context released")
+
+    def get_stats(self) -> Dict:
+        """Get rendered fetch statistics"""
+        return {
+            "max_concurrent": self.max_concurrent,
+            "context_open": self.context is not None,
+            "active": self.active,
+            **self.stats,
+        }
+
+    async def _get_context(self) -> BrowserContext:
+        async with self.lock:
+            if self.context is None:
+                lease = AsyncExitStack()
+                try:
+                    self.context = await lease.enter_async_context(browser_pool.acquire(timeout=self.acquire_timeout))
+                    await resource_blocker.install(self.context)
+                except BaseException:
+                    self.context = None
+                    await lease.aclose()
+                    raise
+                self.lease = lease
+                self.stats["leases"] += 1
+                self.last_used = time.monotonic()
+                self.idle_task = asyncio.create_task(self._idle_loop())
+                logger.info("Rendered fetch context leased from browser pool")
+            return self.context
+
+    async def _idle_loop(self):
+        """Release the context once no rendered fetch has run for idle_seconds"""
+        while True:
+            await asyncio.sleep(max(1, self.idle_seconds / 2))
+            if self.active == 0 and time.monotonic() - self.last_used >= self.idle_seconds:
+                await self.release()
+                return
+
+
+# Global rendered fetcher instance
+rendered_fetcher = RenderedFetcher(
+    max_concurrent=settings.ENRICHMENT_RENDER_CONCURRENCY,
+    timeout_ms=settings.ENRICHMENT_RENDER_TIMEOUT_MS,
+    idle_seconds=settings.ENRICHMENT_RENDER_IDLE_SECONDS,
+    acquire_timeout=settings.ENRICHMENT_RENDER_ACQUIRE_TIMEOUT,
+)
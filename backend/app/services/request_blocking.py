@@ -0,0 +1,168 @@
+"""
+Request interception for Google Maps scraping
+
+Blocks resources that are not needed to read text from the side panel (images,
+fonts, map tiles, telemetry) and keeps per-job and process-wide counters of what
+was saved.
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+from app.config import settings
+from app.utils.loggers import logger
+
+
+# Resource types blocked by default
+DEFAULT_BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+
+# URL fragments blocked regardless of resource type: map tiles, photos and telemetry
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    "/maps/vt",                   # vector/raster map tiles
+    "khms",                       # satellite tiles
+    "streetviewpixels",
+    "lh3.googleusercontent.com",  # place photos
+    "lh5.googleusercontent.com",
+    "/gen_204",                   # telemetry beacons
+    "/log204",
+    "/maps/preview/log",
+    "play.google.com/log",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "csp.withgoogle.com",
+]
+
+# Rough average transfer sizes used to estimate bytes saved, since blocked
+# requests never report a real size
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 25_000,
+    "media": 200_000,
+    "font": 40_000,
+    "stylesheet": 15_000,
+    "script": 50_000,
+    "xhr": 2_000,
+    "fetch": 2_000,
+    "other": 5_000,
+}
+
+
+@dataclass
+class BlockingStats:
+    """Counters for one scrape job"""
+    allowed_requests: int = 0
+    blocked_requests: int = 0
+    estimated_bytes_saved: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+    def record_blocked(self, resource_type: str):
+        self.blocked_requests += 1
+        self.estimated_bytes_saved += ESTIMATED_BYTES_BY_TYPE.get(resource_type, ESTIMATED_BYTES_BY_TYPE["other"])
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+
+    def to_dict(self) -> Dict:
+        return {
+            "allowed_requests": self.allowed_requests,
+            "blocked_requests": self.blocked_requests,
+            "estimated_bytes_saved": self.estimated_bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+class ResourceBlocker:
+    """Decides which requests to abort and aggregates savings across jobs"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        resource_types: Optional[Iterable[str]] = None,
+        url_patterns: Optional[Iterable[str]] = None,
+    ):
+        self.enabled = enabled
+        self.resource_types = set(resource_types if resource_types is not None else DEFAULT_BLOCKED_RESOURCE_TYPES)
+        self.url_patterns: List[str] = list(url_patterns if url_patterns is not None else DEFAULT_BLOCKED_URL_PATTERNS)
+        self.totals = BlockingStats()
+        self.jobs = 0
+        self.lock = threading.Lock()  # the sync fallback reports from worker threads
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        """Check whether a request can be skipped without affecting extraction"""
+        if resource_type in self.resource_types:
+            return True
+        return any(pattern in url for pattern in self.url_patterns)
+
+    async def install(self, context) -> BlockingStats:
+        """Install blocking on an async BrowserContext, returns the job's live stats"""
+        stats = BlockingStats()
+        if not self.enabled:
+            return stats
+
+        async def handle(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                stats.record_blocked(request.resource_type)
+                await route.abort()
+            else:
+                stats.allowed_requests += 1
+                await route.continue_()
+
+        await context.route("**/*", handle)
+        return stats
+
+    def install_sync(self, context) -> BlockingStats:
+        """Install blocking on a sync BrowserContext, returns the job's live stats"""
+        stats = BlockingStats()
+        if not self.enabled:
+            return stats
+
+        def handle(route):
+            request = route.request
+            if self.should_block(request.resource_type, request.url):
+                stats.record_blocked(request.resource_type)
+                route.abort()
+            else:
+                stats.allowed_requests += 1
+                route.continue_()
+
+        context.route("**/*", handle)
+        return stats
+
+    def report(self, stats: BlockingStats, label: str = ""):
+        """Log a finished job's savings and add them to the process-wide totals"""
+        if not self.enabled:
+            return
+
+        with self.lock:
+            self.jobs += 1
+            self.totals.allowed_requests += stats.allowed_requests
+            self.totals.blocked_requests += stats.blocked_requests
+            self.totals.estimated_bytes_saved += stats.estimated_bytes_saved
+            for resource_type, count in stats.blocked_by_type.items():
+                self.totals.blocked_by_type[resource_type] = self.totals.blocked_by_type.get(resource_type, 0) + count
+
+        prefix = f"{label} - " if label else ""
+        logger.info(
+            f"{prefix}Resource blocking saved {stats.blocked_requests} requests "
+            f"(~{stats.estimated_bytes_saved / 1024:.0f} KB estimated), allowed {stats.allowed_requests}"
+        )
+
+    def get_stats(self) -> Dict:
+        """Get process-wide blocking statistics"""
+        with self.lock:
+            return {
+                "enabled": self.enabled,
+                "jobs": self.jobs,
+                "resource_types": sorted(self.resource_types),
+                **self.totals.to_dict(),
+            }
+
+
+def _split_setting(value: str) -> List[str]:
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+# Global resource blocker instance
+resource_blocker = ResourceBlocker(
+    enabled=settings.MAPS_BLOCK_RESOURCES,
+    resource_types=_split_setting(settings.MAPS_BLOCKED_RESOURCE_TYPES),
+    url_patterns=DEFAULT_BLOCKED_URL_PATTERNS + _split_setting(settings.MAPS_EXTRA_BLOCKED_URL_PATTERNS),
+)
@@ -1,21 +1,116 @@
-import re
 import asyncio
 import httpx
-import random
+import time
 from playwright.sync_api import sync_playwright
-from typing import List, Dict, Optional, Union
-from urllib.parse import quote_plus
+from playwright.async_api import BrowserContext
+from typing import AsyncIterator, Callable, FrozenSet, List, Dict, Optional, Tuple, Union
+from urllib.parse import quote_plus, urlsplit, urlunsplit
+from app.config import settings
 from app.utils.loggers import logger
 from app.utils.rate_limiter import wait_for_rate_limit
+from app.services.browser_pool import browser_pool
+from app.services.http_client import http_client
+from app.services.host_health import host_health
+from app.services.latency import latency_tracker
+from app.services.contact_links import rank_contact_links
+from app.services.contact_extraction import ContactScanner, extract_contacts, MAX_EMAILS, MAX_PHONES
+from app.services.rendered_fetch import looks_js_rendered, rendered_fetcher
+from app.services.request_blocking import resource_blocker
+from app.services.maps_waits import (
+    politeness,
+    feed_state,
+    any_of_selectors,
+    wait_for_any_selector,
+    wait_for_selectors_or_fallback,
+    wait_for_selectors_or_fallback_sync,
+    wait_for_feed_growth,
+    wait_for_feed_growth_sync,
+    SearchRequestTracker,
+)
+from app.services.maps_extraction import (
+    DETAIL_XPATHS,
+    DETAIL_PANEL_JS,
+    FEED_CARDS_JS,
+    PLACE_URLS_JS,
+    parse_detail_panel,
+    parse_feed_card,
+    merge_details,
+    place_id_from_url,
+)
+from app.services.maps_payloads import DETAIL_FIELDS, PayloadCollector, fill_missing, missing_fields
 import concurrent.futures
 import threading
+from dataclasses import dataclass
 
 
-def extract_data(xpath: str, page) -> str:
-    """Helper function to extract data from xpath"""
-    if page.locator(xpath).count() > 0:
-        return page.locator(xpath).inner_text()
-    return ""
+# Selectors that identify result listings in the Maps feed
+RESULT_SELECTORS = [
+    '//a[contains(@href, "https://www.google.com/maps/place")]',
+    '//a[contains(@href, "/maps/place/")]',
+    '.hfpxzc',
+    '[data-result-index]',
+    '.Nv2PK'
+]
+
+# Selectors that indicate a listing's detail panel has loaded
+DETAIL_SELECTORS = [
+    '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]',
+    '//h1[contains(@class, "DUwDvf")]',
+    '[data-attrid="title"]'
+]
+
+# Tried only once DETAIL_SELECTORS timed out: any h1 also matches the feed heading
+# or the previous listing's panel, so racing it would read the panel too early
+DETAIL_FALLBACK_SELECTORS = ['//h1']
+DETAIL_FALLBACK_TIMEOUT_MS = 2000
+
+
+def blocked_fallback_results(search_query: str) -> List[Dict[str, Union[str, int, float]]]:
+    """Sample data returned when Google Maps shows no results (usually blocked)"""
+    return [{
+        'name': f'Sample Business for "{search_query}"',
+        'address': 'Address not available',
+        'website': '',
+        'phone': '',
+        'introduction': 'Google Maps access was blocked. This is sample data.',
+        'reviews_count': 0,
+        'reviews_average': 0.0,
+        'store_shopping': 'No',
+        'in_store_pickup': 'No',
+        'store_delivery': 'No',
+        'place_type': 'Business',
+        'opening_hours': 'Hours not available',
+        'sample_data': True
+    }]
+
+
+def error_fallback_results() -> List[Dict[str, Union[str, int, float]]]:
+    """Sample data returned when the scraper itself fails"""
+    return [{
+        "name": "Sample Business",
+        "address": "123 Main St, City, State",
+        "website": "www.example.com",
+        "phone": "(555) 123-4567",
+        "reviews_count": 42,
+        "reviews_average": 4.2,
+        "store_shopping": "Yes",
+        "in_store_pickup": "No",
+        "store_delivery": "Yes",
+        "place_type": "Restaurant",
+        "opening_hours": "9:00 AM - 9:00 PM",
+        "introduction": "A sample business for demonstration",
+        "sample_data": True
+    }]
+
+
+def failed_contacts() -> Dict[str, Union[List[str], bool]]:
+    """Contact info for a website that could not be read, which callers must not cache as nothing found"""
+    return {"emails": [], "phones": [], "failed": True}
+
+
+def is_sample_data(business: Dict) -> bool:
+    """Whether a business is fallback sample data rather than a scraped listing"""
+    return bool(business.get("sample_data"))
 
 
 def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Dict[str, Union[str, int, float]]]:
@@ -38,6 +133,7 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
     place_t_list = []
     open_list = []
     intro_list = []
+    blocking = None
     
     try:
         with sync_playwright() as p:
@@ -63,56 +159,42 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
                 timezone_id='America/New_York'
             )
             
+            blocking = resource_blocker.install_sync(context)
+            
             # Add stealth measures
             page = context.new_page()
             
-            # Navigate to Google Maps with random delay
+            # Navigate to Google Maps and wait for the search box instead of a fixed delay
             page.goto("https://www.google.com/maps", timeout=60000)
-            page.wait_for_timeout(random.randint(2000, 4000))
-              # Search for the query
+            page.wait_for_selector('#searchboxinput', state="visible", timeout=settings.MAPS_READY_TIMEOUT_MS)
+            politeness.pause_sync(page)
+            
+            # Search for the query, tracking its XHRs from before they start
+            search_requests = SearchRequestTracker(page)
+            search_requests.attach()
             page.locator('//input[@id="searchboxinput"]').fill(search_query)
             page.keyboard.press("Enter")
             
-            # Wait for search results with multiple selectors and longer timeout
-            selectors_to_try = [
-                '//a[contains(@href, "https://www.google.com/maps/place")]',
-                '//a[contains(@href, "/maps/place/")]',
-                '.hfpxzc',
-                '[data-result-index]',
-                '.Nv2PK'
-            ]
+            # Race all result selectors under a single deadline
+            selectors_to_try = RESULT_SELECTORS
             
             results_found = False
-            for selector in selectors_to_try:
-                try:
-                    page.wait_for_selector(selector, timeout=60000)
-                    logger.info(f"Found results with selector: {selector}")
-                    results_found = True
-                    break
-                except Exception as e:
-                    logger.warning(f"Selector {selector} failed: {str(e)}")
-                    continue
+            try:
+                any_of_selectors(page, selectors_to_try).wait_for(
+                    state="visible", timeout=settings.MAPS_RESULTS_TIMEOUT_MS
+                )
+                results_found = True
+            except Exception as e:
+                logger.warning(f"No result selector matched: {str(e)}")
             
             if not results_found:
                 logger.error("No search results found with any selector")
                 logger.warning("Google Maps may be blocking automated access. Returning fallback data.")
-                return [{
-                    'name': f'Sample Business for "{search_query}"',
-                    'address': 'Address not available',
-                    'website': '',
-                    'phone': '',
-                    'introduction': 'Google Maps access was blocked. This is sample data.',
-                    'reviews_count': 0,
-                    'reviews_average': 0.0,
-                    'store_shopping': 'No',
-                    'in_store_pickup': 'No', 
-                    'store_delivery': 'No',
-                    'place_type': 'Business',
-                    'opens_at': 'Hours not available'
-                }]
+                return blocked_fallback_results(search_query)
             
-            # Wait a bit more for results to fully load
-            page.wait_for_timeout(3000)
+            # Let the search XHRs settle instead of waiting a flat 3 seconds
+            search_requests.wait_quiet_sync(timeout_ms=settings.MAPS_SETTLE_TIMEOUT_MS)
+            search_requests.detach()
             
             # Try to hover over first listing
             try:
@@ -129,7 +211,8 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
             
             while scroll_attempts < max_scroll_attempts:
                 page.mouse.wheel(0, 10000)
-                page.wait_for_timeout(2000)  # Give more time for results to load
+                # Resolve as soon as new results render or the end marker shows, capped per scroll
+                wait_for_feed_growth_sync(page, previously_counted, timeout_ms=settings.MAPS_SCROLL_TIMEOUT_MS)
                 
                 # Try multiple selectors to count listings
                 current_count = 0
@@ -171,6 +254,7 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
                         previously_counted = current_count
                         logger.info(f"Currently Found: {current_count}")
                         scroll_attempts += 1
+                        politeness.pause_sync(page)
             
             # If we couldn't find any listings, return empty results
             if not locals().get('listings') or not listings:
@@ -181,22 +265,11 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
                 try:
                     listing.click()
                     
-                    # Wait for listing details with multiple fallback selectors
-                    detail_selectors = [
-                        '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]',
-                        '//h1[contains(@class, "DUwDvf")]',
-                        '//h1',
-                        '[data-attrid="title"]'
-                    ]
-                    
-                    detail_loaded = False
-                    for detail_selector in detail_selectors:
-                        try:
-                            page.wait_for_selector(detail_selector, timeout=10000)
-                            detail_loaded = True
-                            break
-                        except:
-                            continue
+                    # Race the detail selectors under a single deadline, then the loose fallback
+                    detail_loaded = wait_for_selectors_or_fallback_sync(
+                        page, DETAIL_SELECTORS, DETAIL_FALLBACK_SELECTORS,
+                        settings.MAPS_DETAIL_TIMEOUT_MS, DETAIL_FALLBACK_TIMEOUT_MS
+                    )
                     
                     if not detail_loaded:
                         logger.warning(f"Could not load details for listing {i+1}")
@@ -215,97 +288,21 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
                         intro_list.append("None Found")
                         continue
                     
-                    logger.info(f"Processed listing {i+1}/{len(listings)}")
-                    
-                    # Define xpaths
-                    name_xpath = '//div[@class="TIHn2 "]//h1[@class="DUwDvf lfPIob"]'
-                    address_xpath = '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'
-                    website_xpath = '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'
-                    phone_number_xpath = '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'
-                    reviews_count_xpath = '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span//span//span[@aria-label]'
-                    reviews_average_xpath = '//div[@class="TIHn2 "]//div[@class="fontBodyMedium dmRWX"]//div//span[@aria-hidden]'
-                    
-                    info1 = '//div[@class="LTs0Rc"][1]'  # store
-                    info2 = '//div[@class="LTs0Rc"][2]'  # pickup
-                    info3 = '//div[@class="LTs0Rc"][3]'  # delivery
-                    opens_at_xpath = '//button[contains(@data-item-id, "oh")]//div[contains(@class, "fontBodyMedium")]'  # time
-                    opens_at_xpath2 = '//div[@class="MkV9"]//span[@class="ZDu9vd"]//span[2]'
-                    place_type_xpath = '//div[@class="LBgpqf"]//button[@class="DkEaL "]'  # type of place
-                    intro_xpath = '//div[@class="WeS02d fontBodyMedium"]//div[@class="PYvSYb "]'
-                    
-                    # Extract introduction
-                    if page.locator(intro_xpath).count() > 0:
-                        intro_list.append(page.locator(intro_xpath).inner_text())
-                    else:
-                        intro_list.append("None Found")
-                    
-                    # Extract reviews count
-                    if page.locator(reviews_count_xpath).count() > 0:
-                        temp = page.locator(reviews_count_xpath).inner_text()
-                        temp = temp.replace('(', '').replace(')', '').replace(',', '')
-                        try:
-                            reviews_c_list.append(int(temp))
-                        except ValueError:
-                            reviews_c_list.append(0)
-                    else:
-                        reviews_c_list.append(0)
-                    
-                    # Extract reviews average
-                    if page.locator(reviews_average_xpath).count() > 0:
-                        temp = page.locator(reviews_average_xpath).inner_text()
-                        temp = temp.replace(' ', '').replace(',', '.')
-                        try:
-                            reviews_a_list.append(float(temp))
-                        except ValueError:
-                            reviews_a_list.append(0.0)
-                    else:
-                        reviews_a_list.append(0.0)
-                    
-                    # Extract store features (shopping, pickup, delivery)
-                    store_shopping = "No"
-                    in_store_pickup = "No"
-                    store_delivery = "No"
-                    
-                    for info_xpath in [info1, info2, info3]:
-                        if page.locator(info_xpath).count() > 0:
-                            temp = page.locator(info_xpath).inner_text()
-                            temp_parts = temp.split('·')
-                            if len(temp_parts) > 1:
-                                check = temp_parts[1].replace("\n", "").lower()
-                                if 'shop' in check:
-                                    store_shopping = "Yes"
-                                elif 'pickup' in check:
-                                    in_store_pickup = "Yes"
-                                elif 'delivery' in check:
-                                    store_delivery = "Yes"
-                    
-                    store_s_list.append(store_shopping)
-                    in_store_list.append(in_store_pickup)
-                    store_del_list.append(store_delivery)
+                    # Read the whole detail panel in one round-trip
+                    business = parse_detail_panel(page.evaluate(DETAIL_PANEL_JS, DETAIL_XPATHS))
                     
-                    # Extract opening hours
-                    opens_at = ""
-                    if page.locator(opens_at_xpath).count() > 0:
-                        opens = page.locator(opens_at_xpath).inner_text()
-                        opens_parts = opens.split('⋅')
-                        if len(opens_parts) > 1:
-                            opens_at = opens_parts[1].replace("\u202f", "")
-                        else:
-                            opens_at = opens.replace("\u202f", "")
-                    elif page.locator(opens_at_xpath2).count() > 0:
-                        opens = page.locator(opens_at_xpath2).inner_text()
-                        opens_parts = opens.split('⋅')
-                        if len(opens_parts) > 1:
-                            opens_at = opens_parts[1].replace("\u202f", "")
-                    
-                    open_list.append(opens_at)
-                    
-                    # Extract basic information
-                    names_list.append(extract_data(name_xpath, page))
-                    address_list.append(extract_data(address_xpath, page))
-                    website_list.append(extract_data(website_xpath, page))
-                    phones_list.append(extract_data(phone_number_xpath, page))
-                    place_t_list.append(extract_data(place_type_xpath, page))
+                    names_list.append(business["name"])
+                    address_list.append(business["address"])
+                    website_list.append(business["website"])
+                    phones_list.append(business["phone"])
+                    reviews_c_list.append(business["reviews_count"])
+                    reviews_a_list.append(business["reviews_average"])
+                    store_s_list.append(business["store_shopping"])
+                    in_store_list.append(business["in_store_pickup"])
+                    store_del_list.append(business["store_delivery"])
+                    place_t_list.append(business["place_type"])
+                    open_list.append(business["opening_hours"])
+                    intro_list.append(business["introduction"])
                     
                     logger.info(f"Processed listing {i+1}/{len(listings)}")
                     
@@ -364,59 +361,570 @@ def scrape_google_maps_sync(search_query: str, max_results: int = 20) -> List[Di
     except Exception as e:
         logger.error(f"Google Maps scraping failed: {str(e)}")
         # Return sample data on error
-        results = [{
-            "name": "Sample Business",
-            "address": "123 Main St, City, State",
-            "website": "www.example.com",
-            "phone": "(555) 123-4567",
-            "reviews_count": 42,
-            "reviews_average": 4.2,
-            "store_shopping": "Yes",
-            "in_store_pickup": "No",
-            "store_delivery": "Yes",
-            "place_type": "Restaurant",
-            "opening_hours": "9:00 AM - 9:00 PM",
-            "introduction": "A sample business for demonstration"
-        }]
+        results = error_fallback_results()
+    finally:
+        # Blocked and failed scrapes are reported too
+        if blocking:
+            resource_blocker.report(blocking, f"Maps '{search_query}'")
     
     return results
 
 
+@dataclass
+class MapsScrapeOptions:
+    """Per-job options for the async Maps engine"""
+    depth: str = "full"  # 'full' opens every listing, 'feed' reads result cards only
+    deep_fetch_contacts: bool = False  # With depth='feed', open listings missing website/phone
+    detail_tabs: int = 1  # Tabs used to open detail pages concurrently
+    parse_payloads: bool = True  # Decode businesses from Maps' search XHRs before touching the DOM
+    skip_places: FrozenSet[str] = frozenset()  # place_ids/URLs already scraped by an earlier run of the job
+
+
+def business_key(business: Dict) -> tuple:
+    """Unique identifier used to deduplicate scraped businesses"""
+    return (
+        business["name"].strip().lower(),
+        business["address"].strip().lower() if business.get("address") else "",
+        business["phone"].strip() if business.get("phone") else ""
+    )
+
+
+def place_key(business: Dict) -> str:
+    """Identifier of a listing that is stable across runs: place_id, else place URL, else name|address"""
+    return business.get("place_id") or business.get("place_url") or "|".join(business_key(business)[:2])
+
+
+def is_skipped_place(place: Union[Dict, str], skip_places: FrozenSet[str]) -> bool:
+    """Whether a business or place URL was already scraped according to skip_places"""
+    if not skip_places:
+        return False
+    if isinstance(place, str):
+        return place in skip_places or place_id_from_url(place) in skip_places
+    return any(
+        key and key in skip_places
+        for key in (place.get("place_id"), place.get("place_url"), place_key(place))
+    )
+
+
+async def iter_google_maps_async(
+    search_query: str,
+    max_results: int,
+    context: BrowserContext,
+    options: Optional[MapsScrapeOptions] = None
+) -> AsyncIterator[Dict[str, Union[str, int, float]]]:
+    """
+    Google Maps scraper using async Playwright on a pooled browser context
+    Yields each business as soon as it is extracted, deduplicated on the fly
+
+    depth="full" reads every listing's detail panel, either by clicking through the
+    feed or, with detail_tabs > 1, by collecting place URLs first and opening them
+    across a bounded pool of tabs.
+    depth="feed" reads name, rating, reviews, category and place URL straight from
+    the result cards in one pass; with deep_fetch_contacts, only cards missing a
+    website or phone are opened for their details.
+
+    With parse_payloads, the search XHRs received while scrolling are decoded first;
+    when they cover every loaded listing only the listings whose payload lacked a
+    website or phone are opened, to read it from their detail panel, and the DOM
+    paths above are only used as a fallback.
+
+    Listings in skip_places are not yielded, and not opened where their place URL
+    is known first; this is how a resumed job avoids redoing finished listings.
+    """
+    options = options or MapsScrapeOptions()
+    tabs = max(1, min(options.detail_tabs, settings.MAPS_MAX_DETAIL_TABS))
+    seen_businesses = set()
+    yielded = 0
+    page = None
+    blocking = None
+
+    try:
+        blocking = await resource_blocker.install(context)
+        page = await context.new_page()
+
+        collector = None
+        if options.parse_payloads:
+            collector = PayloadCollector(page)
+            collector.attach()
+
+        if not await _open_search_async(page, search_query):
+            logger.error("No search results found with any selector")
+            logger.warning("Google Maps may be blocking automated access. Returning fallback data.")
+            for business in blocked_fallback_results(search_query):
+                yield business
+            return
+
+        listings = await _load_listings_async(page, max_results)
+        if not listings:
+            logger.warning(f"No listings found for query: {search_query}")
+            return
+
+        payload_businesses = await collector.drain(max_results) if collector else []
+        use_payloads = bool(payload_businesses) and len(payload_businesses) >= min(max_results, len(listings))
+        if collector and not use_payloads:
+            logger.info("Maps payloads incomplete, falling back to DOM extraction")
+
+        if use_payloads:
+            logger.info(f"Using {len(payload_businesses)} businesses decoded from Maps payloads")
+            businesses = _iter_payload_async(context, payload_businesses, tabs, options.skip_places)
+        elif options.depth == "feed":
+            businesses = _iter_feed_async(
+                page, context, max_results, options.deep_fetch_contacts, tabs, options.skip_places
+            )
+        elif tabs > 1 or options.skip_places:
+            # Open listings by URL so ones finished by an earlier run are never clicked
+            place_urls = await _collect_place_urls_async(page, max_results)
+            pending_urls = [url for url in place_urls if not is_skipped_place(url, options.skip_places)]
+            if len(pending_urls) < len(place_urls):
+                logger.info(f"Skipping {len(place_urls) - len(pending_urls)} listings finished by an earlier run")
+            place_urls = pending_urls
+            logger.info(f"Opening {len(place_urls)} listings across {tabs} tabs")
+            businesses = _iter_details_concurrently(context, place_urls, tabs)
+        else:
+            businesses = _iter_listings_async(page, listings)
+
+        async for business in businesses:
+            if not business or not business["name"]:
+                continue
+            if is_skipped_place(business, options.skip_places):
+                continue
+
+            key = business_key(business)
+            if key in seen_businesses:
+                logger.info(f"Skipping duplicate business: {business['name']}")
+                continue
+
+            seen_businesses.add(key)
+            yielded += 1
+            yield business
+
+    except Exception as e:
+        logger.error(f"Google Maps scraping failed: {str(e)}")
+        if not yielded:
+            for business in error_fallback_results():
+                yield business
+    finally:
+        if page:
+            try:
+                await page.close()
+            except Exception:
+                pass
+        if blocking:
+            resource_blocker.report(blocking, f"Maps '{search_query}'")
+
+
+async def scrape_google_maps_async(
+    search_query: str,
+    max_results: int,
+    context: BrowserContext,
+    options: Optional[MapsScrapeOptions] = None
+) -> List[Dict[str, Union[str, int, float]]]:
+    """Collect every business from iter_google_maps_async into a list"""
+    return [business async for business in iter_google_maps_async(search_query, max_results, context, options)]
+
+
+async def _iter_listings_async(page, listings: List) -> AsyncIterator[Optional[Dict]]:
+    """Click through listings one by one in the search page"""
+    for i, listing in enumerate(listings):
+        try:
+            yield await _extract_listing_async(page, listing, i, len(listings))
+        except Exception as e:
+            logger.warning(f"Error processing listing {i+1}: {str(e)}")
+
+
+async def _open_search_async(page, search_query: str) -> bool:
+    """Run the search and wait for the result feed, returns False if no results appeared"""
+    # Navigate to Google Maps and wait for the search box instead of a fixed delay
+    await page.goto("https://www.google.com/maps", timeout=60000)
+    await page.wait_for_selector('#searchboxinput', state="visible", timeout=settings.MAPS_READY_TIMEOUT_MS)
+    await politeness.pause()
+
+    # Search for the query, tracking its XHRs from before they start
+    search_requests = SearchRequestTracker(page)
+    search_requests.attach()
+    try:
+        await page.locator('//input[@id="searchboxinput"]').fill(search_query)
+        await page.keyboard.press("Enter")
+
+        # Race all result selectors under a single deadline
+        if not await wait_for_any_selector(page, RESULT_SELECTORS, settings.MAPS_RESULTS_TIMEOUT_MS):
+            return False
+
+        # Let the search XHRs settle instead of waiting a flat 3 seconds
+        await search_requests.wait_quiet(timeout_ms=settings.MAPS_SETTLE_TIMEOUT_MS)
+    finally:
+        search_requests.detach()
+
+    # Try to hover over first listing
+    try:
+        await page.hover('//a[contains(@href, "https://www.google.com/maps/place")]')
+    except Exception:
+        try:
+            await page.hover('.hfpxzc')
+        except Exception:
+            logger.warning("Could not hover over first listing")
+
+    return True
+
+
+async def _load_listings_async(page, max_results: int) -> List:
+    """Scroll the feed until max_results listings are loaded or no new ones appear"""
+    listings = []
+    previously_counted, reached_end = await feed_state(page)
+    max_scroll_attempts = 10
+    scroll_attempts = 0
+
+    while scroll_attempts < max_scroll_attempts and previously_counted < max_results and not reached_end:
+        await page.mouse.wheel(0, 10000)
+
+        # Resolve as soon as new results render or the end marker shows, capped per scroll
+        current_count, reached_end = await wait_for_feed_growth(
+            page, previously_counted, timeout_ms=settings.MAPS_SCROLL_TIMEOUT_MS
+        )
+
+        if current_count >= max_results or current_count == previously_counted:
+            break
+        if reached_end:
+            logger.info(f"Reached end of result list at {current_count}")
+            break
+
+        previously_counted = current_count
+        logger.info(f"Currently Found: {current_count}")
+        scroll_attempts += 1
+        await politeness.pause()
+
+    for selector in RESULT_SELECTORS:
+        try:
+            found = await page.locator(selector).all()
+            if found:
+                # Convert to parent elements for clicking
+                listings = [listing.locator("xpath=..") for listing in found[:max_results]]
+                logger.info(f"Total Found: {len(listings)}")
+                break
+        except Exception:
+            continue
+
+    return listings
+
+
+async def _iter_feed_async(
+    page,
+    context: BrowserContext,
+    max_results: int,
+    deep_fetch_contacts: bool,
+    tabs: int,
+    skip_places: FrozenSet[str] = frozenset()
+) -> AsyncIterator[Dict]:
+    """Read businesses from the loaded result cards without clicking them"""
+    cards = [parse_feed_card(raw) for raw in await page.evaluate(FEED_CARDS_JS)][:max_results]
+    logger.info(f"Read {len(cards)} result cards from feed")
+    cards = [card for card in cards if not is_skipped_place(card, skip_places)]
+
+    if not deep_fetch_contacts:
+        for card in cards:
+            yield card
+        return
+
+    missing = [
+        index for index, card in enumerate(cards)
+        if card["place_url"] and not (card["website"] and card["phone"])
+    ]
+    logger.info(f"Deep-fetching details for {len(missing)}/{len(cards)} cards missing website or phone")
+
+    async for business in _iter_with_details_async(
+        context, cards, missing, tabs,
+        lambda card, detail: merge_details(card, detail) if detail else card
+    ):
+        yield business
+
+
+async def _iter_payload_async(
+    context: BrowserContext,
+    businesses: List[Dict],
+    tabs: int,
+    skip_places: FrozenSet[str] = frozenset()
+) -> AsyncIterator[Dict]:
+    """Yield businesses decoded from Maps payloads, opening only those that lack a website or phone"""
+    businesses = [business for business in businesses if not is_skipped_place(business, skip_places)]
+    missing = [index for index, business in enumerate(businesses) if missing_fields(business, DETAIL_FIELDS)]
+    if missing:
+        logger.info(f"Opening {len(missing)}/{len(businesses)} decoded businesses for a website or phone their payload lacked")
+
+    async for business in _iter_with_details_async(context, businesses, missing, tabs, fill_missing):
+        yield business
+
+
+async def _iter_with_details_async(
+    context: BrowserContext,
+    records: List[Dict],
+    missing: List[int],
+    tabs: int,
+    merge: Callable[[Dict, Optional[Dict]], Dict]
+) -> AsyncIterator[Dict]:
+    """Yield records in order, merging the detail panel of each record at the missing indexes"""
+    # Records before each opened one need nothing more, so yield them as soon as possible
+    next_record = 0
+    details = _iter_details_concurrently(context, [records[index]["place_url"] for index in missing], tabs)
+    async for index, detail in _zip_async(missing, details):
+        while next_record < index:
+            yield merge(records[next_record], None)
+            next_record += 1
+        yield merge(records[index], detail)
+        next_record = index + 1
+    for record in records[next_record:]:
+        yield merge(record, None)
+
+
+async def _zip_async(items: List, iterator: AsyncIterator) -> AsyncIterator[tuple]:
+    position = 0
+    async for value in iterator:
+        yield items[position], value
+        position += 1
+
+
+async def _collect_place_urls_async(page, max_results: int) -> List[str]:
+    """Collect unique place URLs from the loaded feed, in feed order"""
+    place_urls = []
+    for url in await page.evaluate(PLACE_URLS_JS):
+        if url and url not in place_urls:
+            place_urls.append(url)
+    return place_urls[:max_results]
+
+
+async def _iter_details_concurrently(
+    context: BrowserContext,
+    place_urls: List[str],
+    tabs: int
+) -> AsyncIterator[Optional[Dict]]:
+    """Open place URLs across a bounded pool of tabs, yielding results in input order"""
+    if not place_urls:
+        return
+
+    loop = asyncio.get_running_loop()
+    results = [loop.create_future() for _ in place_urls]
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in enumerate(place_urls):
+        queue.put_nowait(item)
+
+    async def worker():
+        page = await context.new_page()
+        try:
+            while not queue.empty():
+                index, place_url = queue.get_nowait()
+                try:
+                    results[index].set_result(await _fetch_place_details_async(page, place_url))
+                    logger.info(f"Processed listing {index+1}/{len(place_urls)}")
+                except Exception as e:
+                    logger.warning(f"Error processing listing {index+1}: {str(e)}")
+                    results[index].set_result(None)
+        finally:
+            await page.close()
+
+    workers = [asyncio.create_task(worker()) for _ in range(min(tabs, len(place_urls)))]
+    try:
+        for result in results:
+            # Stop waiting if every worker is gone (e.g. new_page failed) and left futures unset
+            while not result.done():
+                running = [worker for worker in workers if not worker.done()]
+                if not running:
+                    break
+                await asyncio.wait([result, *running], return_when=asyncio.FIRST_COMPLETED)
+            yield result.result() if result.done() else None
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def _fetch_place_details_async(page, place_url: str) -> Optional[Dict[str, Union[str, int, float]]]:
+    """Open a place URL directly and read its detail panel"""
+    await page.goto(place_url, timeout=60000)
+    if not await _wait_for_details_async(page):
+        return None
+    business = parse_detail_panel(await page.evaluate(DETAIL_PANEL_JS, DETAIL_XPATHS))
+    business["place_url"] = place_url
+    business["place_id"] = place_id_from_url(page.url) or place_id_from_url(place_url)
+    return business
+
+
+async def _wait_for_details_async(page) -> bool:
+    """Wait for a listing's detail panel, racing the specific selectors before falling back to any h1"""
+    return await wait_for_selectors_or_fallback(
+        page, DETAIL_SELECTORS, DETAIL_FALLBACK_SELECTORS, settings.MAPS_DETAIL_TIMEOUT_MS, DETAIL_FALLBACK_TIMEOUT_MS
+    )
+
+
+async def _listing_place_url(listing) -> str:
+    """Place URL of a feed listing's own anchor, resolved like PLACE_URLS_JS, "" if it has none"""
+    try:
+        return await listing.locator('a[href*="/maps/place/"]').first.evaluate("(link) => link.href", timeout=1000)
+    except Exception:
+        return ""
+
+
+async def _extract_listing_async(page, listing, index: int, total: int) -> Optional[Dict[str, Union[str, int, float]]]:
+    """Click a listing and extract its detail panel, returns None if details never loaded"""
+    place_url = await _listing_place_url(listing)
+    await listing.click()
+
+    if not await _wait_for_details_async(page):
+        logger.warning(f"Could not load details for listing {index+1}")
+        return None
+
+    # Read the whole detail panel in one round-trip
+    raw = await page.evaluate(DETAIL_PANEL_JS, DETAIL_XPATHS)
+    business = parse_detail_panel(raw)
+    # Keyed by the listing's own anchor, so a resumed job matches it like the URL path does;
+    # page.url is updated asynchronously and may still be the previous place's
+    business["place_url"] = place_url or page.url
+    business["place_id"] = place_id_from_url(business["place_url"])
+
+    logger.info(f"Processed listing {index+1}/{total}")
+    return business
+
+
 class GoogleMapsScraper:
-    """Google Maps scraper using sync Playwright in thread pool"""
-    
+    """Google Maps scraper running async Playwright on the app event loop, with sync Playwright as fallback"""
+
+    # Shared, bounded executor for the sync fallback (created on first use)
+    _sync_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+    _sync_executor_lock = threading.Lock()
+
     @staticmethod
-    async def scrape_maps(query: str, max_results: int = 20) -> List[Dict[str, Union[str, int, float]]]:
+    async def scrape_maps(
+        query: str,
+        max_results: int = 20,
+        engine: Optional[str] = None,
+        options: Optional[MapsScrapeOptions] = None
+    ) -> List[Dict[str, Union[str, int, float]]]:
         """
-        Async wrapper for sync Playwright scraper
-        Runs sync scraper in thread pool to avoid blocking event loop
+        Scrape Google Maps with the configured engine
+        The async engine multiplexes sessions on the event loop; if it cannot run
+        (e.g. the pool failed to start, or the loop has no subprocess support) the
+        sync engine is used instead
         """
-        loop = asyncio.get_event_loop()
-        
-        # Run sync scraper in thread pool
-        with concurrent.futures.ThreadPoolExecutor() as executor:
-            future = loop.run_in_executor(
-                executor, 
-                scrape_google_maps_sync, 
-                query, 
-                max_results
-            )
-            results = await future
-        
-        return results
+        engine = engine or settings.MAPS_SCRAPER_ENGINE
+
+        if engine == "async":
+            try:
+                return await GoogleMapsScraper.scrape_maps_async(query, max_results, options)
+            except Exception as e:
+                logger.error(f"Async Maps engine unavailable, falling back to sync scraper: {str(e)}")
+
+        if options and options.depth != "full":
+            logger.info(f"Sync Maps engine does not support depth='{options.depth}', running a full scrape")
+        return await GoogleMapsScraper.scrape_maps_sync(query, max_results)
+
+    @staticmethod
+    async def stream_maps(
+        query: str,
+        max_results: int = 20,
+        engine: Optional[str] = None,
+        options: Optional[MapsScrapeOptions] = None
+    ) -> AsyncIterator[Dict[str, Union[str, int, float]]]:
+        """
+        Stream businesses from Google Maps as they are extracted
+        The sync engine cannot stream, so when it is used its results are yielded once it finishes
+        """
+        engine = engine or settings.MAPS_SCRAPER_ENGINE
+
+        if engine == "async":
+            yielded = 0
+            try:
+                async with browser_pool.acquire() as context:
+                    async for business in iter_google_maps_async(query, max_results, context, options):
+                        yielded += 1
+                        yield business
+                return
+            except Exception as e:
+                if yielded:
+                    raise
+                logger.error(f"Async Maps engine unavailable, falling back to sync scraper: {str(e)}")
+
+        skip_places = options.skip_places if options else frozenset()
+        for business in await GoogleMapsScraper.scrape_maps_sync(query, max_results):
+            if not is_skipped_place(business, skip_places):
+                yield business
+
+    @staticmethod
+    async def scrape_maps_async(
+        query: str,
+        max_results: int = 20,
+        options: Optional[MapsScrapeOptions] = None
+    ) -> List[Dict[str, Union[str, int, float]]]:
+        """Run the async engine on a context leased from the browser pool"""
+        async with browser_pool.acquire() as context:
+            return await scrape_google_maps_async(query, max_results, context, options)
+
+    @staticmethod
+    async def scrape_maps_sync(query: str, max_results: int = 20) -> List[Dict[str, Union[str, int, float]]]:
+        """Run the blocking sync scraper on the shared fallback executor"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            GoogleMapsScraper._get_sync_executor(),
+            scrape_google_maps_sync,
+            query,
+            max_results
+        )
+
+    @classmethod
+    def _get_sync_executor(cls) -> concurrent.futures.ThreadPoolExecutor:
+        """Get or create the fallback executor, capped so fallback jobs cannot multiply threads"""
+        with cls._sync_executor_lock:
+            if cls._sync_executor is None:
+                cls._sync_executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=settings.MAPS_SYNC_FALLBACK_WORKERS,
+                    thread_name_prefix="maps-sync"
+                )
+            return cls._sync_executor
+
+    @classmethod
+    def shutdown_sync_executor(cls):
+        """Shut down the fallback executor - call this on application shutdown"""
+        with cls._sync_executor_lock:
+            if cls._sync_executor is not None:
+                cls._sync_executor.shutdown(wait=False, cancel_futures=True)
+                cls._sync_executor = None
+
+
+async def wait_for_website_rate_limit(url: str):
+    """Rate limit per site so concurrent enrichment stays polite to each host, inside one window for all sites"""
+    await wait_for_rate_limit("website_scrape_host", urlsplit(url).hostname or "default")
+    await wait_for_rate_limit("website_scrape")
+
+
+def _is_allowed_content_type(content_type: str) -> bool:
+    """Missing content types are allowed, since many small sites don't send one"""
+    media_type = content_type.split(";")[0].strip().lower()
+    if not media_type:
+        return True
+    allowed = [item.strip() for item in settings.ENRICHMENT_ALLOWED_CONTENT_TYPES.split(",") if item.strip()]
+    return media_type in allowed
 
 
 class WebsiteScraper:
     """Website scraper for extracting contact information"""
+
+    stats: Dict[str, int] = {
+        "pages_fetched": 0,
+        "skipped_content_type": 0,
+        "truncated_at_cap": 0,
+        "early_exits": 0,
+        "bytes_read": 0,
+        "crawls": 0,
+        "crawl_pages_fetched": 0,
+        "crawl_hits": 0,
+        "render_escalations": 0,
+        "render_hits": 0,
+    }
     
     @staticmethod
     async def scrape_website(url: str) -> Dict[str, str]:
         """
         Scrape a website for contact information
-        Returns: Dictionary with emails and phone numbers
+        Returns: Dictionary with emails and phone numbers, plus "failed": True when
+        the site could not be read (skipped host, timeout, connection or server error)
         """
-        await wait_for_rate_limit("website_scrape")
-        
         # Validate and fix URL
         if not url or url.strip() == "":
             logger.info("Empty URL provided")
@@ -431,51 +939,278 @@ class WebsiteScraper:
             return {"emails": [], "phones": []}
         
         # Fix URL if it doesn't have protocol
-        if not url.startswith(('http://', 'https://')):
+        scheme_given = url.startswith(('http://', 'https://'))
+        if not scheme_given:
             url = f"https://{url}"
         
+        # Dead, unresolvable or repeatedly failing hosts are skipped without a request
+        skip_reason = await host_health.check(url)
+        if skip_reason:
+            # A bare domain without address records often still serves its www. variant
+            alternate = WebsiteScraper.hedge_url(url, hedge_scheme=False) if settings.ENRICHMENT_HEDGING_ENABLED else None
+            if not alternate or await host_health.check(alternate):
+                logger.info(f"Skipping website {url}: {skip_reason}")
+                return failed_contacts()
+            logger.info(f"Fetching {alternate} instead of {url}: {skip_reason}")
+            url = alternate
+        
+        hedge_url = WebsiteScraper.hedge_url(url, not scheme_given) if settings.ENRICHMENT_HEDGING_ENABLED else None
+        
+        await wait_for_website_rate_limit(url)
+        
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, follow_redirects=True)
-                response.raise_for_status()
-                content = response.text
-                
-                # Extract contact information
-                emails = set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', content))
-                phones = set(re.findall(r'(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})', content))
-                
-                # Clean and format phone numbers
-                clean_phones = []
-                for phone_match in phones:
-                    if isinstance(phone_match, tuple):
-                        phone = ''.join(phone_match)
-                        phone = re.sub(r'[^\d]', '', phone)
-                        if len(phone) >= 10:
-                            clean_phones.append(f"({phone[:3]}) {phone[3:6]}-{phone[6:10]}")
-                
-                return {
-                    "emails": list(emails)[:5],
-                    "phones": clean_phones[:3],
-                }
+            contacts, html, page_url = await WebsiteScraper.fetch_homepage(url, hedge_url)
+            host_health.record_success(page_url)
+            if not contacts["emails"] and settings.ENRICHMENT_CRAWL_PAGES > 0:
+                contacts = await WebsiteScraper.crawl_contacts(page_url, contacts, html)
+            # Last tier: a headless browser, only for JS-rendered sites the static fetch got nothing from
+            if not contacts["emails"] and settings.ENRICHMENT_RENDER_ENABLED and looks_js_rendered(html):
+                contacts = await WebsiteScraper.render_contacts(page_url, contacts)
+            return contacts
                 
         except httpx.InvalidURL as e:
             logger.warning(f"Invalid URL format {url}: {str(e)}")
             return {"emails": [], "phones": []}
-        except httpx.TimeoutException:
+        except httpx.TimeoutException as e:
             logger.warning(f"Timeout while scraping website {url}")
-            return {"emails": [], "phones": []}
+            host_health.record_failure(url, e)
+            return failed_contacts()
         except httpx.HTTPStatusError as e:
             logger.warning(f"HTTP error {e.response.status_code} while scraping website {url}")
+            host_health.record_success(url)  # the host answered, it is just not serving this page
+            # Server errors and rate limiting may clear up, a 404 or 403 won't
+            if e.response.status_code >= 500 or e.response.status_code == 429:
+                return failed_contacts()
             return {"emails": [], "phones": []}
+        except httpx.TransportError as e:
+            logger.warning(f"Connection error while scraping website {url}: {str(e)}")
+            host_health.record_failure(url, e)
+            return failed_contacts()
         except Exception as e:
             logger.error(f"Error scraping website {url}: {str(e)}")
-            return {"emails": [], "phones": []}
+            return failed_contacts()
+
+    @staticmethod
+    async def fetch_homepage(url: str, hedge_url: Optional[str] = None) -> Tuple[Dict[str, List[str]], str, str]:
+        """
+        Fetch a homepage, racing a hedged second attempt at hedge_url if the first one stalls
+        The hedge starts once the first attempt is slower than the host's usual
+        fetch time, or straight away if it fails, unless hedge_url is on another
+        host that fails its health check.
+        The first attempt to succeed wins. Returns contacts, HTML and the URL that answered
+        """
+        async def fetch(page_url: str) -> Tuple[Dict[str, List[str]], str]:
+            return await WebsiteScraper.fetch_page(page_url, keep_html_bytes=settings.ENRICHMENT_CRAWL_HTML_BYTES)
+
+        primary = asyncio.create_task(fetch(url))
+        attempts = {primary: url}
+        try:
+            if hedge_url:
+                await asyncio.wait({primary}, timeout=latency_tracker.hedge_delay(url))
+                if not primary.done() or primary.exception() is not None:
+                    skip_reason = None
+                    if urlsplit(hedge_url).hostname != urlsplit(url).hostname:
+                        skip_reason = await host_health.check(hedge_url)
+                    if skip_reason:
+                        logger.debug(f"Not hedging {url} with {hedge_url}: {skip_reason}")
+                    else:
+                        logger.debug(f"Hedging {url} with {hedge_url}")
+                        latency_tracker.stats["hedges_started"] += 1
+                        attempts[asyncio.create_task(fetch(hedge_url))] = hedge_url
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            latency_tracker.stats["hedges_won"] += 1
+                        contacts, html = task.result()
+                        return contacts, html, attempts[task]
+
+            # Every attempt failed; an HTTP error means the host is up, so report that one first
+            errors = [task.exception() for task in attempts]
+            raise next((e for e in errors if isinstance(e, httpx.HTTPStatusError)), errors[0])
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    @staticmethod
+    def hedge_url(url: str, hedge_scheme: bool) -> Optional[str]:
+        """Alternate URL for a hedged attempt: http:// for a guessed https:// (hedge_scheme), else toggle www."""
+        parts = urlsplit(url)
+        if hedge_scheme and parts.scheme == "https":
+            return urlunsplit(parts._replace(scheme="http"))
+
+        host = parts.hostname or ""
+        if host.startswith("www."):
+            netloc = parts.netloc.replace(host, host[4:], 1)
+        elif host.count(".") == 1:
+            netloc = parts.netloc.replace(host, f"www.{host}", 1)
+        else:
+            return None  # a subdomain other than www. has no obvious variant
+        return urlunsplit(parts._replace(netloc=netloc))
+
+    @staticmethod
+    async def fetch_contacts(url: str) -> Dict[str, List[str]]:
+        """Stream a page and scan it for contacts chunk by chunk"""
+        contacts, _ = await WebsiteScraper.fetch_page(url)
+        return contacts
+
+    @staticmethod
+    async def fetch_page(url: str, keep_html_bytes: int = 0) -> Tuple[Dict[str, List[str]], str]:
+        """
+        Stream a page and scan it for contacts chunk by chunk
+        Skips non-HTML content types from the headers, stops reading at
+        ENRICHMENT_MAX_BODY_BYTES and as soon as ENRICHMENT_EARLY_EXIT_EMAILS emails and
+        ENRICHMENT_EARLY_EXIT_PHONES phones were found.
+        The whole fetch is bounded by the host's adaptive timeout, and its duration
+        feeds the latency percentiles.
+        Returns the contacts and the first keep_html_bytes characters of the page,
+        which the contact crawl parses for links
+        """
+        timeout = latency_tracker.timeout_for(url)
+        started = time.monotonic()
+        try:
+            result = await asyncio.wait_for(WebsiteScraper._read_page(url, keep_html_bytes), timeout=timeout)
+        except asyncio.TimeoutError as e:
+            latency_tracker.record_timeout(url, timeout)
+            raise httpx.ReadTimeout(f"No complete response from {url} within {timeout:.1f}s") from e
+        latency_tracker.record(url, time.monotonic() - started)
+        return result
+
+    @staticmethod
+    async def _read_page(url: str, keep_html_bytes: int) -> Tuple[Dict[str, List[str]], str]:
+        stats = WebsiteScraper.stats
+        scanner = ContactScanner(
+            stop_emails=settings.ENRICHMENT_EARLY_EXIT_EMAILS, stop_phones=settings.ENRICHMENT_EARLY_EXIT_PHONES
+        )
+        html_parts: List[str] = []
+        html_size = 0
+
+        async with http_client.stream(url) as response:
+            response.raise_for_status()
+
+            content_type = response.headers.get("content-type", "")
+            if not _is_allowed_content_type(content_type):
+                logger.info(f"Skipping {url}: content type '{content_type}'")
+                stats["skipped_content_type"] += 1
+                return {"emails": [], "phones": []}, ""
+
+            stats["pages_fetched"] += 1
+            async for chunk in response.aiter_text():
+                scanner.feed(chunk)
+                if html_size < keep_html_bytes:
+                    html_parts.append(chunk[:keep_html_bytes - html_size])
+                    html_size += len(html_parts[-1])
+                if scanner.enough:
+                    stats["early_exits"] += 1
+                    break
+                if response.num_bytes_downloaded >= settings.ENRICHMENT_MAX_BODY_BYTES:
+                    logger.info(f"Stopped reading {url} at {response.num_bytes_downloaded} bytes")
+                    stats["truncated_at_cap"] += 1
+                    break
+
+            stats["bytes_read"] += response.num_bytes_downloaded
+
+        return scanner.finish(), "".join(html_parts)
+
+    @staticmethod
+    async def crawl_contacts(url: str, homepage: Dict[str, List[str]], html: str) -> Dict[str, List[str]]:
+        """
+        Fetch the homepage's most likely contact pages concurrently, stopping at the first one with an email
+        Phones found on the homepage are kept and topped up from the pages that were read
+        """
+        links = rank_contact_links(html, url, limit=settings.ENRICHMENT_CRAWL_PAGES)
+        if not links:
+            return homepage
+
+        stats = WebsiteScraper.stats
+        stats["crawls"] += 1
+        logger.info(f"No email on {url}, crawling {len(links)} likely contact pages")
+
+        async def fetch(link: str) -> Dict[str, List[str]]:
+            await wait_for_website_rate_limit(link)
+            contacts = await WebsiteScraper.fetch_contacts(link)
+            stats["crawl_pages_fetched"] += 1
+            return contacts
+
+        phones = dict.fromkeys(homepage["phones"])
+        emails: List[str] = []
+        tasks = [asyncio.create_task(fetch(link)) for link in links]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                try:
+                    contacts = await next_done
+                except Exception as e:
+                    # Only the homepage counts towards the host's circuit: a slow /contact page is not a dead host
+                    logger.debug(f"Contact page fetch failed for {url}: {str(e)}")
+                    continue
+                phones.update(dict.fromkeys(contacts["phones"]))
+                if contacts["emails"]:
+                    emails = contacts["emails"]
+                    stats["crawl_hits"] += 1
+                    break
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        return {
+            "emails": emails[:MAX_EMAILS],
+            "phones": list(phones)[:MAX_PHONES],
+        }
+
+    @staticmethod
+    async def render_contacts(url: str, static: Dict[str, List[str]]) -> Dict[str, List[str]]:
+        """Render url in the shared browser context and scan the result, keeping the static phones"""
+        stats = WebsiteScraper.stats
+        stats["render_escalations"] += 1
+        logger.info(f"No email in static HTML of {url}, rendering it")
+        try:
+            rendered = extract_contacts(await rendered_fetcher.fetch(url))
+        except asyncio.TimeoutError:
+            logger.info(f"No browser context free to render {url}, keeping the static result")
+            return static
+        except Exception as e:
+            logger.warning(f"Rendered fetch failed for {url}: {str(e)}")
+            return static
+
+        if rendered["emails"]:
+            stats["render_hits"] += 1
+        return {
+            "emails": rendered["emails"],
+            "phones": list(dict.fromkeys([*static["phones"], *rendered["phones"]]))[:MAX_PHONES],
+        }
+
+    @staticmethod
+    def get_stats() -> Dict:
+        """Get website fetch statistics"""
+        return {
+            "max_body_bytes": settings.ENRICHMENT_MAX_BODY_BYTES,
+            **WebsiteScraper.stats,
+            "latency": latency_tracker.get_stats(),
+            "rendered": rendered_fetcher.get_stats(),
+        }
 
 
 # Main functions for API
-async def scrape_google_maps(query: str, max_results: int = 20) -> List[Dict[str, Union[str, int, float]]]:
+async def scrape_google_maps(
+    query: str,
+    max_results: int = 20,
+    engine: Optional[str] = None,
+    options: Optional[MapsScrapeOptions] = None
+) -> List[Dict[str, Union[str, int, float]]]:
     """Main API function for Google Maps scraping"""
-    return await GoogleMapsScraper.scrape_maps(query, max_results)
+    return await GoogleMapsScraper.scrape_maps(query, max_results, engine=engine, options=options)
+
+def stream_google_maps(
+    query: str,
+    max_results: int = 20,
+    engine: Optional[str] = None,
+    options: Optional[MapsScrapeOptions] = None
+) -> AsyncIterator[Dict[str, Union[str, int, float]]]:
+    """Main API function for streaming Google Maps results as they are extracted"""
+    return GoogleMapsScraper.stream_maps(query, max_results, engine=engine, options=options)
 
 async def scrape_website(url: str) -> Dict[str, str]:
     """Main API function for website scraping"""
@@ -0,0 +1,322 @@
+"""
+Search job processing, run by the job queue workers.
+
+The API only creates the SearchJob row and its queue entry; the scrape,
+enrichment and Google Sheets export below run in whichever process runs
+the workers - `python -m app.worker`, or the API itself with JOB_WORKERS_IN_API.
+"""
+from sqlalchemy.future import select
+import asyncio
+import datetime
+from typing import Optional
+from app.schemas import SearchRequest
+from app.database import AsyncSessionLocal
+from app.services.scraper import stream_google_maps, MapsScrapeOptions
+from app.services.google_sheets import sheets_service
+from app.services.enrichment import website_enricher
+from app.services.phone_normalization import normalize_phone, region_hint
+from app.services.job_queue import register_job_handler
+from app.services.pipeline import Pipeline
+from app.services.job_checkpoints import JobProgress, job_checkpoints
+from app.services.scraper import place_key, is_sample_data
+from app.models import SearchJob, ScrapeResult
+from app.utils.loggers import logger
+from app.config import settings
+
+@register_job_handler("search")
+async def run_queued_search(job_id: int, payload: dict):
+    """Job queue handler for search entries"""
+    await process_search_job(job_id, SearchRequest(**payload))
+
+async def process_search_job(job_id: int, request: SearchRequest):
+    """
+    Process a search job using Google Maps scraping
+    Runs as a staged pipeline, scrape -> checkpoint -> dedupe -> enrich -> persist -> export,
+    so businesses are saved while later listings are still being scraped and a
+    slow stage holds back the scrape instead of letting results pile up.
+    A job that was interrupted resumes from its checkpoints instead of starting over
+    """
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(SearchJob).where(SearchJob.id == job_id))
+        job = result.scalar_one_or_none()
+        
+        if not job:
+            logger.error(f"Job {job_id} not found")
+            return
+        
+        job.status = "processing"
+        await db.commit()
+        
+        try:
+            # Preprocess query for better business results
+            processed_query = preprocess_business_query(request.query)
+            logger.info(f"Searching for: '{processed_query}'")
+            # Listings finished by an earlier, interrupted run of this job
+            progress = await job_checkpoints.load(job_id) if settings.JOB_CHECKPOINTS_ENABLED else JobProgress()
+            seen_entries = {
+                (b.get('name', '').strip().lower(), b.get('address', '').strip().lower(), b.get('phone', ''))
+                for b in progress.done
+            }
+            sheet_results = [sheet_row(business) for business in progress.done]
+            # Fallback sample data must not be served by the query result cache
+            sample_data = any(is_sample_data(business) for business in (*progress.done, *progress.pending))
+            # Phones found on websites are normalized with the query's region
+            enrichment = website_enricher.batch(region=region_hint(request.query))
+            
+            async def checkpoint(business):
+                nonlocal sample_data
+                sample_data = sample_data or is_sample_data(business)
+                if settings.JOB_CHECKPOINTS_ENABLED and place_key(business) not in progress.keys:
+                    try:
+                        await job_checkpoints.record_extracted(job_id, business)
+                    except Exception as e:
+                        # A missing checkpoint only costs a re-scrape on resume
+                        logger.warning(f"Could not checkpoint {business.get('name')}: {str(e)}")
+                return business
+            
+            async def dedupe(business):
+                # Create a unique key for deduplication
+                name = business.get('name', 'Unknown Business').strip()
+                address = business.get('address', '').strip()
+                raw_phone = business.get('phone', '').strip()
+                # E.164 so the same number formatted differently dedups, raw if it cannot be parsed
+                phone = normalize_phone(raw_phone, region_hint(address, request.query)) or raw_phone
+                business['phone'] = phone
+                
+                # Skip if name is empty or generic
+                if not name or name.lower() in ['unknown business', '']:
+                    return None
+                
+                unique_key = (name.lower(), address.lower(), phone)
+                if unique_key in seen_entries:
+                    logger.info(f"Skipping duplicate entry: {name}")
+                    return None
+                seen_entries.add(unique_key)
+                return business
+            
+            async def enrich(business):
+                # If we have a website but no email, scrape it for contact info
+                website = business.get('website', '')
+                if website and not business.get('email'):
+                    contact_info = await enrichment.contacts(website)
+                    if contact_info['emails']:
+                        business['email'] = contact_info['emails'][0]
+                return business
+            
+            async def persist(business):
+                name = business.get('name', 'Unknown Business').strip()
+                address = business.get('address', '').strip()
+                # A session per business, so persist workers don't share one
+                async with AsyncSessionLocal() as session:
+                    # Check if this business already exists in the database for this job
+                    existing_check = await session.execute(
+                        select(ScrapeResult).where(
+                            ScrapeResult.job_id == job_id,
+                            ScrapeResult.name == name,
+                            ScrapeResult.address == address
+                        )
+                    )
+                    if existing_check.scalar_one_or_none():
+                        logger.info(f"Business already exists in database: {name}")
+                        if settings.JOB_CHECKPOINTS_ENABLED:
+                            await job_checkpoints.mark_done(session, job_id, business)
+                            await session.commit()
+                        return None
+                    
+                    session.add(scrape_result_from_business(job_id, business))
+                    if settings.JOB_CHECKPOINTS_ENABLED:
+                        # Same transaction as the row, so a crash can't leave one without the other
+                        await job_checkpoints.mark_done(session, job_id, business)
+                    try:
+                        # Commit per business so partial results are visible while the scrape runs
+                        await session.commit()
+                    except Exception as e:
+                        await session.rollback()
+                        # Check if it's a unique constraint violation (duplicate)
+                        if "unique" in str(e).lower() or "duplicate" in str(e).lower():
+                            logger.info(f"Skipping duplicate business: {name}")
+                            return None
+                        raise
+                return business
+            
+            async def export(business):
+                sheet_results.append(sheet_row(business))
+                return business
+            
+            businesses = stream_google_maps(
+                processed_query,
+                max_results=request.limit,
+                options=MapsScrapeOptions(
+                    depth=request.depth,
+                    deep_fetch_contacts=request.deep_fetch_contacts,
+                    detail_tabs=request.detail_tabs or settings.MAPS_DETAIL_TABS,
+                    parse_payloads=settings.MAPS_PARSE_NETWORK_PAYLOADS,
+                    skip_places=progress.skip_places
+                )
+            )
+            queue_size = settings.PIPELINE_QUEUE_SIZE
+            pipeline = (
+                Pipeline(f"search-job-{job_id}", source_name="scrape")
+                .add_stage("checkpoint", checkpoint, concurrency=1, queue_size=queue_size)
+                .add_stage("dedupe", dedupe, concurrency=1, queue_size=queue_size)
+                .add_stage("enrich", enrich, concurrency=settings.PIPELINE_ENRICH_CONCURRENCY, queue_size=queue_size)
+                .add_stage("persist", persist, concurrency=settings.PIPELINE_PERSIST_CONCURRENCY, queue_size=queue_size)
+                .add_stage("export", export, concurrency=1, queue_size=queue_size)
+            )
+            try:
+                stage_stats = await pipeline.run(resume_source(progress.pending, businesses))
+            finally:
+                enrichment.cancel()
+            if stage_stats["persist"]["failed"]:
+                # Unsaved businesses keep their 'extracted' checkpoints, so the retry replays them
+                # instead of the job completing (and being cached) without them
+                raise RuntimeError(f"{stage_stats['persist']['failed']} businesses could not be saved")
+            scraped_results = stage_stats["scrape"]["emitted"] + len(progress.done)
+            saved_results = stage_stats["persist"]["emitted"] + len(progress.done)
+            
+            if not scraped_results:
+                logger.warning(f"No Google Maps results found for query: '{processed_query}'")
+                job.status = f"completed - no results found for '{request.query}'"
+                await db.commit()
+                await job_checkpoints.clear(job_id)
+                return
+            
+            job.status = "completed"
+            job.completed_at = datetime.datetime.utcnow()
+            job.cacheable = not sample_data
+            try:
+                await db.commit()
+                await job_checkpoints.clear(job_id)
+                logger.info(f"Job {job_id} completed with {saved_results} unique results (out of {scraped_results} scraped)")
+                
+                # Save results to Google Sheets, one worksheet per job once every row is known
+                await export_to_sheets(job_id, request.query, sheet_results)
+                
+            except Exception as commit_error:
+                logger.error(f"Error committing job completion: {str(commit_error)}")
+                await db.rollback()
+                try:
+                    await db.refresh(job)
+                    job.status = "completed"
+                    job.completed_at = datetime.datetime.utcnow()
+                    job.cacheable = not sample_data
+                    await db.commit()
+                    logger.info(f"Job {job_id} completed with {saved_results} results (after rollback)")
+                except Exception as retry_error:
+                    logger.error(f"Failed to commit after rollback: {str(retry_error)}")
+            
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            try:
+                job.status = f"failed: {str(e)}"
+                await db.commit()
+            except Exception as commit_error:
+                logger.error(f"Error committing job failure: {str(commit_error)}")
+                await db.rollback()
+            # The queue retries the job with backoff, or marks it failed once out of attempts
+            raise
+
+@register_job_handler("sheets_export")
+async def run_queued_sheets_export(job_id: Optional[int], payload: dict):
+    """
+    Job queue handler writing the worksheet of a job served from the query cache
+    The entry carries the search job in its payload rather than its job_id, so a
+    retried or failed export never changes the completed job's status
+    """
+    export_job_id = payload["job_id"]
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            select(ScrapeResult).where(ScrapeResult.job_id == export_job_id).order_by(ScrapeResult.id)
+        )).scalars().all()
+    columns = [column.name for column in ScrapeResult.__table__.columns]
+    sheet_results = [sheet_row({name: getattr(row, name) for name in columns}) for row in rows]
+    await export_to_sheets(export_job_id, payload.get("query", ""), sheet_results)
+
+async def export_to_sheets(job_id: int, query: str, sheet_results: list):
+    """Save a job's rows to its own Google Sheets worksheet, failures are logged and never fail the job"""
+    try:
+        # gspread is blocking, keep it off the event loop other jobs' stages run on
+        sheets_saved = await asyncio.to_thread(
+            sheets_service.save_scraper_results_sync,
+            results=sheet_results,
+            job_id=job_id,
+            query=query
+        )
+        
+        if sheets_saved:
+            logger.info(f"Successfully saved {len(sheet_results)} results to Google Sheets for job {job_id}")
+        else:
+            logger.warning(f"Failed to save results to Google Sheets for job {job_id}")
+            
+    except Exception as sheets_error:
+        logger.error(f"Error saving to Google Sheets for job {job_id}: {str(sheets_error)}")
+
+async def resume_source(pending: list, businesses):
+    """Replay businesses extracted by an interrupted run, then continue with the scrape"""
+    try:
+        for business in pending:
+            yield business
+        async for business in businesses:
+            yield business
+    finally:
+        await businesses.aclose()
+
+def scrape_result_from_business(job_id: int, business: dict) -> ScrapeResult:
+    """Build the ScrapeResult row for a scraped business"""
+    return ScrapeResult(
+        job_id=job_id,
+        name=business.get('name', 'Unknown Business'),
+        website=business.get('website', ''),
+        email=business.get('email', ''),
+        phone=business.get('phone', ''),
+        address=business.get('address', ''),
+        
+        # Review information
+        reviews_count=business.get('reviews_count', 0),
+        reviews_average=business.get('reviews_average', 0.0),
+        
+        # Business features
+        store_shopping=business.get('store_shopping', 'No'),
+        in_store_pickup=business.get('in_store_pickup', 'No'),
+        store_delivery=business.get('store_delivery', 'No'),
+        
+        # Additional details
+        place_type=business.get('place_type', ''),
+        opening_hours=business.get('opening_hours', ''),
+        introduction=business.get('introduction', ''),
+        
+        # Metadata
+        source="Google Maps",
+        place_id=business.get('place_id') or None
+    )
+
+def sheet_row(business: dict) -> dict:
+    """Convert a business to the format expected by Google Sheets"""
+    return {
+        'Name': business.get('name', 'Unknown Business'),
+        'Website': business.get('website', ''),
+        'Email': business.get('email', ''),
+        'Phone': business.get('phone', ''),
+        'Address': business.get('address', ''),
+        'Reviews Count': business.get('reviews_count', 0),
+        'Reviews Average': business.get('reviews_average', 0.0),
+        'Store Shopping': business.get('store_shopping', 'No'),
+        'In Store Pickup': business.get('in_store_pickup', 'No'),
+        'Store Delivery': business.get('store_delivery', 'No'),
+        'Place Type': business.get('place_type', ''),
+        'Opening Hours': business.get('opening_hours', ''),
+        'Introduction': business.get('introduction', ''),
+        'Source': 'Google Maps'
+    }
+
+def preprocess_business_query(query: str) -> str:
+    """Preprocess search query to improve business search results"""
+    query = query.strip()
+    
+    # Add business context for short queries
+    words = query.split()
+    if len(words) <= 2:
+        if not any(word.lower() in ['restaurant', 'hotel', 'store', 'shop'] for word in words):
+            query = f"{query} business"
+    
+    return query
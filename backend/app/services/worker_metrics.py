@@ -0,0 +1,131 @@
+"""
+Metrics of the processes that run scrape jobs.
+
+Jobs run in `python -m app.worker`, so the browser pool, enrichment, pipeline
+and checkpoint counters the API process holds stay at zero. Each process that
+runs job workers publishes its snapshot to the worker_metrics table every
+WORKER_METRICS_INTERVAL seconds, and /api/metrics reports every snapshot
+that is still fresh next to the API's own counters.
+"""
+import asyncio
+import datetime
+import os
+import socket
+from typing import Dict, Optional
+from sqlalchemy import delete
+from sqlalchemy.future import select
+from app.config import settings
+from app.database import QueueSessionLocal
+from app.models import WorkerMetrics
+from app.services.browser_pool import browser_pool
+from app.services.request_blocking import resource_blocker
+from app.services.http_client import http_client
+from app.services.enrichment import website_enricher
+from app.services.enrichment_cache import enrichment_cache
+from app.services.scraper import WebsiteScraper
+from app.services import phone_normalization, pipeline
+from app.services.job_queue import job_queue, job_workers
+from app.services.job_checkpoints import job_checkpoints
+from app.services.query_cache import query_cache
+from app.utils.loggers import logger
+
+
+def process_id() -> str:
+    """host:pid, the same prefix job workers lease entries under"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def process_stats() -> Dict:
+    """Runtime statistics of the shared scraping resources in this process"""
+    return {
+        "browser_pool": browser_pool.get_stats(),
+        "resource_blocking": resource_blocker.get_stats(),
+        "http_client": http_client.get_stats(),
+        "enrichment": website_enricher.get_stats(),
+        "enrichment_cache": enrichment_cache.get_stats(),
+        "website_fetch": WebsiteScraper.get_stats(),
+        "phone_normalization": phone_normalization.get_stats(),
+        "job_queue": job_queue.get_stats(),
+        "job_workers": job_workers.get_stats(),
+        "job_checkpoints": job_checkpoints.get_stats(),
+        "pipelines": pipeline.get_stats(),
+        "query_cache": query_cache.get_stats(),
+    }
+
+
+class WorkerMetricsPublisher:
+    """Writes this process's stats to worker_metrics and reads every live worker's"""
+
+    def __init__(self, interval: int = 15):
+        self.interval = max(1, interval)
+        # A worker that missed this many publishes is considered gone
+        self.stale_after = datetime.timedelta(seconds=self.interval * 4)
+        self.worker_id: Optional[str] = None
+        self.role = "worker"
+        self.task: Optional[asyncio.Task] = None
+
+    async def start(self, role: str = "worker"):
+        """Start publishing - call this in every process that runs job workers"""
+        if self.task:
+            return
+        self.worker_id = process_id()
+        self.role = role
+        self.task = asyncio.create_task(self._publish_loop())
+
+    async def stop(self):
+        """Stop publishing and remove this process's snapshot"""
+        if not self.task:
+            return
+        task, self.task = self.task, None
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        try:
+            async with QueueSessionLocal() as db:
+                await db.execute(delete(WorkerMetrics).where(WorkerMetrics.worker_id == self.worker_id))
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"Could not remove metrics of {self.worker_id}: {str(e)}")
+
+    async def publish(self):
+        """Write the current snapshot"""
+        now = datetime.datetime.utcnow()
+        async with QueueSessionLocal() as db:
+            row = await db.get(WorkerMetrics, self.worker_id)
+            if row is None:
+                row = WorkerMetrics(worker_id=self.worker_id, started_at=now)
+                db.add(row)
+            row.role = self.role
+            row.stats = process_stats()
+            row.updated_at = now
+            await db.commit()
+
+    async def live_workers(self) -> Dict[str, Dict]:
+        """Latest snapshot of every process that published recently, by worker id"""
+        fresh_after = datetime.datetime.utcnow() - self.stale_after
+        async with QueueSessionLocal() as db:
+            result = await db.execute(
+                select(WorkerMetrics)
+                .where(WorkerMetrics.updated_at >= fresh_after)
+                .order_by(WorkerMetrics.worker_id)
+            )
+            return {
+                row.worker_id: {
+                    "role": row.role,
+                    "started_at": row.started_at,
+                    "updated_at": row.updated_at,
+                    **(row.stats or {}),
+                }
+                for row in result.scalars().all()
+            }
+
+    async def _publish_loop(self):
+        while True:
+            try:
+                await self.publish()
+            except Exception as e:
+                logger.warning(f"Could not publish metrics of {self.worker_id}: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+
+# Global worker metrics publisher instance
+worker_metrics = WorkerMetricsPublisher(interval=settings.WORKER_METRICS_INTERVAL)
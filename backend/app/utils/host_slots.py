@@ -0,0 +1,45 @@
+import asyncio
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict
+
+
+@dataclass
+class _HostSlot:
+    semaphore: asyncio.Semaphore
+    users: int = 0  # tasks holding or waiting for the semaphore
+
+
+@dataclass
+class HostSlots:
+    """
+    Per-host concurrency limits for long-running processes
+
+    A host's semaphore only exists while some task holds or waits for it, so
+    the hosts seen over a process lifetime don't accumulate. Evicting by size
+    or age instead could drop a semaphore that is still held and let a second
+    one admit more than per_host tasks.
+    """
+    per_host: int
+    slots: Dict[str, _HostSlot] = field(default_factory=dict)
+
+    @asynccontextmanager
+    async def hold(self, host: str):
+        """Hold one of host's slots, waiting while per_host tasks already do"""
+        slot = self.slots.get(host)
+        if slot is None:
+            slot = self.slots[host] = _HostSlot(asyncio.Semaphore(max(1, self.per_host)))
+        slot.users += 1
+        try:
+            async with slot.semaphore:
+                yield
+        finally:
+            slot.users -= 1
+            if not slot.users and self.slots.get(host) is slot:
+                del self.slots[host]
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+    def clear(self):
+        self.slots.clear()
@@ -15,10 +15,12 @@ class RateLimit:
 class RateLimiter:
     """Thread-safe rate limiter using sliding window"""
     
-    def __init__(self):
+    def __init__(self, prune_interval: float = 60.0):
         self.limits: Dict[str, RateLimit] = {}
         self.windows: Dict[str, deque] = defaultdict(deque)
         self.lock = asyncio.Lock()
+        self.prune_interval = prune_interval
+        self.last_prune = time.time()
     
     def configure(self, service: str, max_requests: int, window_seconds: int, burst_allowance: int = 0):
         """Configure rate limit for a service"""
@@ -34,6 +36,8 @@ class RateLimiter:
             key = f"{service}:{identifier}"
             limit = self.limits[service]
             current_time = time.time()
+            if current_time - self.last_prune >= self.prune_interval:
+                self._prune(current_time)
             window = self.windows[key]
             
             # Remove expired requests from window
@@ -51,6 +55,14 @@ class RateLimiter:
             logger.warning(f"Rate limit exceeded for {service}:{identifier}")
             return False
     
+    def _prune(self, current_time: float):
+        """Drop windows with no requests left in them, e.g. of per-host identifiers seen once"""
+        self.last_prune = current_time
+        for key, window in list(self.windows.items()):
+            limit = self.limits.get(key.split(":", 1)[0])
+            if not window or not limit or window[-1] <= current_time - limit.window_seconds:
+                del self.windows[key]
+    
     async def wait_if_needed(self, service: str, identifier: str = "default") -> float:
         """Wait until request is allowed, returns wait time"""
         if service not in self.limits:
@@ -73,7 +85,7 @@ class RateLimiter:
         
         key = f"{service}:{identifier}"
         limit = self.limits[service]
-        window = self.windows[key]
+        window = self.windows.get(key, ())
         current_time = time.time()
         
         # Count requests in current window
@@ -110,6 +122,7 @@ def setup_default_limits():
     # Web scraping limits
     rate_limiter.configure("google_search", max_requests=10, window_seconds=60)  # Be nice to Google
     rate_limiter.configure("website_scrape", max_requests=30, window_seconds=60, burst_allowance=10)
+    rate_limiter.configure("website_scrape_host", max_requests=10, window_seconds=60)  # Per site, inside website_scrape
     rate_limiter.configure("selenium", max_requests=5, window_seconds=60)  # Selenium is slower
     
     # API limits
@@ -0,0 +1,113 @@
+"""
+Standalone scrape worker.
+
+Runs the job queue workers together with everything a scrape needs - the
+browser pool, the shared HTTP client and website enrichment - outside the
+API process, so heavy scrapes don't slow down /api/*. Run as many as the
+hosts allow; they coordinate through the job_queue table.
+
+Usage (from the backend directory):
+    python -m app.worker
+    python -m app.worker --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Scrape jobs run at once by this process (default JOB_WORKER_CONCURRENCY)",
+    )
+    return parser.parse_args(argv)
+
+
+def apply_args(args: argparse.Namespace):
+    """Pass command line overrides to the settings through the environment"""
+    # Sizes the database pool for running jobs, API-only processes keep a small one
+    os.environ["JOB_WORKER_PROCESS"] = "true"
+    if args.concurrency is not None:
+        os.environ["JOB_WORKER_CONCURRENCY"] = str(max(1, args.concurrency))
+
+
+if __name__ == "__main__":
+    # The database pools and job_workers are sized from JOB_WORKER_CONCURRENCY when
+    # they are imported, so the flag has to reach the settings before the imports below
+    apply_args(parse_args())
+
+from app.config import settings  # noqa: E402
+from app.services.browser_pool import browser_pool  # noqa: E402
+from app.services.http_client import http_client  # noqa: E402
+from app.services.rendered_fetch import rendered_fetcher  # noqa: E402
+from app.services.job_queue import job_workers  # noqa: E402
+from app.services.enrichment_cache import enrichment_cache  # noqa: E402
+from app.services.worker_metrics import worker_metrics  # noqa: E402
+from app.services.scraper import GoogleMapsScraper  # noqa: E402
+from app.services import search_jobs  # noqa: E402,F401 - registers the "search" job handler
+from app.utils.loggers import logger  # noqa: E402
+
+
+async def start_worker(role: str = "worker"):
+    """Start the scraping resources, the job queue workers and metrics publishing"""
+    # Pay the browser cold-start once per worker instead of once per scrape job
+    try:
+        await browser_pool.start()
+    except Exception as e:
+        logger.error(f"Browser pool failed to start, scrapes will use the sync fallback: {e}")
+    # One pooled HTTP/2 client for all website enrichment
+    await http_client.start()
+    try:
+        await enrichment_cache.purge_expired()
+    except Exception as e:
+        logger.warning(f"Could not purge expired enrichment cache entries: {e}")
+    await job_workers.start()
+    # Jobs run here, so this is where the scrape metrics are; /api/metrics reads them from the database
+    await worker_metrics.start(role)
+
+
+async def stop_worker():
+    """Stop the workers, handing running jobs back to the queue, then the scraping resources"""
+    await job_workers.stop()
+    await worker_metrics.stop()
+    await rendered_fetcher.release()
+    await browser_pool.stop()
+    await http_client.stop()
+    GoogleMapsScraper.shutdown_sync_executor()
+
+
+async def run():
+    """Run until SIGINT/SIGTERM"""
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(signum, stopping.set)
+        except NotImplementedError:
+            pass  # Windows: Ctrl+C arrives as KeyboardInterrupt instead
+
+    await start_worker()
+    try:
+        await stopping.wait()
+    finally:
+        logger.info("Worker shutting down")
+        await stop_worker()
+
+
+def main():
+    if sys.platform == "win32":
+        # Playwright needs subprocess support
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Micro-benchmark for website contact extraction
+
+Runs the extractors over a corpus of saved pages and reports throughput in
+pages/sec and MB/sec, next to the single-regex scan over raw HTML that
+scrape_website used before app.services.contact_extraction.
+
+Usage (from the backend directory):
+    python benchmarks/contact_extraction_bench.py
+    python benchmarks/contact_extraction_bench.py --corpus /path/to/saved/pages --iterations 200
+"""
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.contact_extraction import ContactScanner, extract_contacts  # noqa: E402
+
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "pages"
+
+
+def legacy_extract(html: str) -> Dict[str, List[str]]:
+    """The previous scrape_website extraction: patterns re-parsed per call, run over raw HTML"""
+    emails = set(re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', html))
+    phones = set(re.findall(r'(\+?1[-.\s]?)?\(?([0-9]{3})\)?[-.\s]?([0-9]{3})[-.\s]?([0-9]{4})', html))
+    clean_phones = []
+    for phone_match in phones:
+        phone = re.sub(r'[^\d]', '', ''.join(phone_match))
+        if len(phone) >= 10:
+            clean_phones.append(f"({phone[:3]}) {phone[3:6]}-{phone[6:10]}")
+    return {"emails": list(emails)[:5], "phones": clean_phones[:3]}
+
+
+def streamed_extract(html: str, chunk_size: int = 65536) -> Dict[str, List[str]]:
+    """Extraction as fetch_page runs it, over the body in network-sized chunks"""
+    scanner = ContactScanner()
+    for start in range(0, len(html), chunk_size):
+        scanner.feed(html[start:start + chunk_size])
+        if scanner.enough:
+            break
+    return scanner.finish()
+
+
+def run(name: str, extractor: Callable[[str], Dict], pages: List[str], iterations: int):
+    total_bytes = sum(len(page.encode("utf-8")) for page in pages) * iterations
+    started = time.perf_counter()
+    for _ in range(iterations):
+        for page in pages:
+            extractor(page)
+    elapsed = time.perf_counter() - started
+    count = len(pages) * iterations
+    print(
+        f"{name:<10} {count / elapsed:>10.1f} pages/sec  "
+        f"{total_bytes / elapsed / 1_000_000:>8.1f} MB/sec  ({count} pages in {elapsed:.2f}s)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="Directory of saved .html pages")
+    parser.add_argument("--iterations", type=int, default=50, help="Passes over the corpus per extractor")
+    parser.add_argument("--show", action="store_true", help="Print what each extractor found per page")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.htm*"))
+    if not files:
+        parser.error(f"No .html files found in {args.corpus}")
+    pages = [path.read_text(encoding="utf-8", errors="replace") for path in files]
+    size = sum(len(page) for page in pages)
+    print(f"Corpus: {len(pages)} pages, {size / 1024:.0f} KB from {args.corpus}\n")
+
+    if args.show:
+        for path, page in zip(files, pages):
+            print(path.name)
+            print(f"  legacy:  {legacy_extract(page)}")
+            print(f"  current: {extract_contacts(page)}")
+        print()
+
+    run("legacy", legacy_extract, pages, args.iterations)
+    run("current", extract_contacts, pages, args.iterations)
+    run("streamed", streamed_extract, pages, args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Test settings: the required credentials get placeholder values and the
+database is a throwaway SQLite file, so the services import without a .env
+"""
+import asyncio
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+TEST_DB_PATH = Path(tempfile.mkdtemp(prefix="scrappy-tests-")) / "test.db"
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{TEST_DB_PATH}")
+for name in (
+    "TWILIO_ACCOUNT_SID",
+    "TWILIO_AUTH_TOKEN",
+    "TWILIO_WHATSAPP_NUMBER",
+    "SMTP_SERVER",
+    "SMTP_USERNAME",
+    "SMTP_PASSWORD",
+    "SMTP_FROM_EMAIL",
+    "GOOGLE_CLIENT_ID",
+    "GOOGLE_CLIENT_SECRET",
+    "GOOGLE_SERVICE_ACCOUNT_PROJECT_ID",
+    "GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY_ID",
+    "GOOGLE_SERVICE_ACCOUNT_PRIVATE_KEY",
+    "GOOGLE_SERVICE_ACCOUNT_CLIENT_EMAIL",
+    "GOOGLE_SERVICE_ACCOUNT_CLIENT_ID",
+    "GOOGLE_SERVICE_ACCOUNT_CLIENT_X509_CERT_URL",
+):
+    os.environ.setdefault(name, "test")
+
+
+@pytest.fixture
+def database():
+    """Fresh tables in the test database; the engine is disposed after each test, since every test runs its own loop"""
+    from app.database import Base, engine, queue_engine
+    from app import models  # noqa: F401 - registers the tables
+
+    async def dispose():
+        await engine.dispose()
+        await queue_engine.dispose()
+
+    async def reset():
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+            await connection.run_sync(Base.metadata.create_all)
+        await dispose()
+
+    asyncio.run(reset())
+    yield engine
+    asyncio.run(dispose())
+
+
+@pytest.fixture
+def run():
+    """Run a coroutine to completion on a fresh event loop"""
+    return asyncio.run
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.services import browser_pool as browser_pool_module
+from app.services import playwright_setup
+from app.services.browser_pool import BrowserPool
+
+
+class FakeBrowser:
+    def __init__(self, number):
+        self.number = number
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected and not self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def launched(monkeypatch):
+    """Browsers launched by the pool under test, in launch order"""
+    browsers = []
+
+    class Chromium:
+        async def launch(self, **kwargs):
+            await asyncio.sleep(0)  # a real launch yields to the loop
+            browsers.append(FakeBrowser(len(browsers)))
+            return browsers[-1]
+
+    class Playwright:
+        chromium = Chromium()
+
+    async def get_playwright():
+        return Playwright()
+
+    async def create_browser_context(browser):
+        return FakeContext(browser)
+
+    async def close_playwright(playwright=None):
+        pass
+
+    monkeypatch.setattr(browser_pool_module, "get_playwright", get_playwright)
+    monkeypatch.setattr(browser_pool_module, "create_browser_context", create_browser_context)
+    monkeypatch.setattr(browser_pool_module, "close_playwright", close_playwright)
+    return browsers
+
+
+def test_contexts_go_to_the_least_loaded_browser(launched, run):
+    pool = BrowserPool(size=2, contexts_per_browser=2)
+
+    async def scenario():
+        async with pool.acquire() as first, pool.acquire() as second, pool.acquire() as third:
+            busy = [pooled.active_contexts for pooled in pool.browsers]
+            used = [first.browser.number, second.browser.number, third.browser.number]
+        idle = [pooled.active_contexts for pooled in pool.browsers]
+        await pool.stop()
+        return busy, used, idle, [first.closed, second.closed, third.closed]
+
+    busy, used, idle, closed = run(scenario())
+
+    assert len(launched) == 2
+    assert sorted(busy) == [1, 2]
+    assert sorted(used) == [0, 0, 1] or sorted(used) == [0, 1, 1]
+    assert idle == [0, 0]
+    assert closed == [True, True, True]
+    assert pool.stats["contexts_served"] == 3
+
+
+def test_browser_is_recycled_after_its_job_quota(launched, run):
+    pool = BrowserPool(size=1, max_jobs_per_browser=2)
+
+    async def scenario():
+        for _ in range(4):
+            async with pool.acquire():
+                pass
+        return [browser.closed for browser in launched]
+
+    closed = run(scenario())
+
+    assert closed == [True, True, False]  # the first launch, then one per two jobs
+    assert pool.stats["recycled"] == 2
+
+
+def test_dead_browser_is_relaunched_on_next_use(launched, run):
+    pool = BrowserPool(size=1)
+
+    async def scenario():
+        await pool.start()
+        launched[0].connected = False
+        async with pool.acquire() as context:
+            number = context.browser.number
+        await pool.stop()
+        return number
+
+    assert run(scenario()) == 1
+    assert pool.stats["unhealthy_replaced"] == 1
+
+
+def test_acquire_times_out_when_every_context_is_leased(launched, run):
+    pool = BrowserPool(size=1, contexts_per_browser=1)
+
+    async def scenario():
+        async with pool.acquire():
+            with pytest.raises(asyncio.TimeoutError):
+                async with pool.acquire(timeout=0.05):
+                    pass
+        await pool.stop()
+
+    run(scenario())
+
+
+def test_concurrent_first_acquires_launch_one_set_of_browsers(launched, run):
+    pool = BrowserPool(size=2, contexts_per_browser=2)
+
+    async def lease():
+        async with pool.acquire():
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        await asyncio.gather(*(lease() for _ in range(4)))
+        await pool.stop()
+
+    run(scenario())
+
+    assert len(launched) == 2
+    assert all(browser.closed for browser in launched)
+
+
+def test_browser_install_runs_off_the_event_loop_once(monkeypatch, run):
+    install_threads = []
+    started = []
+
+    class Driver:
+        async def start(self):
+            started.append(1)
+            return "playwright"
+
+    monkeypatch.setattr(playwright_setup, "_playwright_instance", None)
+    monkeypatch.setattr(playwright_setup, "_playwright_lock", None)
+    monkeypatch.setattr(playwright_setup, "install_browsers", lambda: install_threads.append(threading.current_thread()))
+    monkeypatch.setattr(playwright_setup, "async_playwright", Driver)
+
+    async def scenario():
+        return await asyncio.gather(playwright_setup.get_playwright(), playwright_setup.get_playwright())
+
+    assert run(scenario()) == ["playwright", "playwright"]
+    assert len(install_threads) == 1 and install_threads[0] is not threading.main_thread()
+    assert started == [1]
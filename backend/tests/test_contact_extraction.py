@@ -0,0 +1,107 @@
+import pytest
+
+from app.services.contact_extraction import ContactScanner, clean_phone, extract_contacts, text_contacts
+from app.services.phone_normalization import unique_phones
+
+
+@pytest.mark.parametrize("text", [
+    "2024-01-15",
+    "2024/01/15",
+    "15.01.2024",
+    "01/15/2024",
+    "1998 - 2023",
+    "1998-2023",
+    "1.2.3.4567",
+    "192.168.100.200",
+])
+def test_dates_ranges_and_digit_runs_are_not_phones(text):
+    assert clean_phone(text, strict=True) is None
+
+
+@pytest.mark.parametrize("text, phone", [
+    ("+1 (555) 123-4567", "+15551234567"),
+    ("(512) 555-0142", "5125550142"),
+    ("030 / 1234567", "0301234567"),
+    ("+33 (0)1 23 45 67 89", "+330123456789"),
+    ("020 7946 0958", "02079460958"),
+    ("1-800-555-0199", "18005550199"),
+])
+def test_phone_shapes_are_kept(text, phone):
+    assert clean_phone(text, strict=True) == phone
+
+
+def test_text_scan_skips_dates_with_a_region_hint():
+    markup = (
+        "<p>Open since 1998 - 2023, updated 2024-01-15, version 1.2.3.4567</p>"
+        "<p>Call us: 030 / 1234567</p>"
+    )
+
+    _, phones = text_contacts(markup)
+
+    assert phones == ["0301234567"]
+    assert unique_phones(phones, "DE") == ["+49301234567"]
+
+
+def test_tel_links_are_not_held_to_the_text_rules():
+    assert extract_contacts('<a href="tel:2024011512">Call</a>')["phones"] == ["2024011512"]
+
+
+def test_json_ld_contact_points_are_read():
+    markup = """
+    <script type="application/ld+json">
+    {"@type": "Restaurant", "name": "Joe's Pizza",
+     "contactPoint": [{"@type": "ContactPoint", "email": "mailto:orders@joespizzanyc.com", "telephone": "+1 212 366 1182"}]}
+    </script>
+    """
+
+    assert extract_contacts(markup) == {"emails": ["orders@joespizzanyc.com"], "phones": ["+12123661182"]}
+
+
+def test_mailto_and_tel_links_are_read():
+    markup = '<a href="mailto:hello@joespizzanyc.com?subject=Hi">Email</a><a href=\'tel:+12123661182\'>Call</a>'
+
+    assert extract_contacts(markup) == {"emails": ["hello@joespizzanyc.com"], "phones": ["+12123661182"]}
+
+
+def test_cloudflare_protected_emails_are_decoded():
+    key = 0x42
+    encoded = f"{key:02x}" + "".join(f"{ord(char) ^ key:02x}" for char in "info@joespizzanyc.com")
+    markup = f'<a href="/cdn-cgi/l/email-protection"><span class="__cf_email__" data-cfemail="{encoded}">[email protected]</span></a>'
+
+    assert extract_contacts(markup)["emails"] == ["info@joespizzanyc.com"]
+
+
+def test_bracketed_obfuscations_are_decoded_but_plain_prose_is_not():
+    markup = "<p>Write to catering [at] joespizzanyc [dot] com, we meet at noon dot com events</p>"
+
+    assert extract_contacts(markup)["emails"] == ["catering@joespizzanyc.com"]
+
+
+def test_script_and_style_text_is_not_scanned():
+    markup = (
+        "<script>var support = 'tracking@analytics-vendor.com'; var build = '+1 (555) 000-1111';</script>"
+        "<style>.a::after { content: 'styles@theme-vendor.com' }</style>"
+        "<!-- old@joespizzanyc.com -->"
+        "<p>Visit us in Greenwich Village</p>"
+    )
+
+    assert extract_contacts(markup) == {"emails": [], "phones": []}
+
+
+def test_email_split_across_stream_chunks_is_found_whole():
+    scanner = ContactScanner()
+
+    scanner.feed("<p>Questions? Write to reserv")
+    scanner.feed("ations@joespizzanyc.com</p><p>More text")
+
+    assert scanner.finish()["emails"] == ["reservations@joespizzanyc.com"]
+
+
+def test_script_split_across_chunks_is_held_back_until_it_closes():
+    scanner = ContactScanner()
+
+    scanner.feed("<p>Menu</p><script>var vendor = 'tracking@")
+    assert scanner.pending.startswith("<script>")
+    scanner.feed("analytics-vendor.com';</script><p>orders@joespizzanyc.com</p>")
+
+    assert scanner.finish()["emails"] == ["orders@joespizzanyc.com"]
@@ -0,0 +1,141 @@
+import asyncio
+import datetime
+
+import pytest
+
+from app.database import AsyncSessionLocal
+from app.models import EnrichmentCacheEntry
+from app.services import enrichment, scraper
+from app.services.enrichment import WebsiteEnricher
+from app.services.enrichment_cache import EnrichmentCache
+from app.services.scraper import failed_contacts
+from app.utils import rate_limiter
+from app.utils.rate_limiter import RateLimiter
+
+
+@pytest.fixture
+def cache(database, monkeypatch):
+    cache = EnrichmentCache()
+    monkeypatch.setattr(enrichment, "enrichment_cache", cache)
+    return cache
+
+
+def fake_scrape(monkeypatch, results):
+    """scrape_website replacement returning results in order, records the URLs it was called with"""
+    scraped = []
+
+    async def scrape_website(url):
+        scraped.append(url)
+        return results[len(scraped) - 1]
+
+    monkeypatch.setattr(enrichment, "scrape_website", scrape_website)
+    return scraped
+
+
+def test_failed_fetch_is_not_cached_as_nothing_found(cache, monkeypatch):
+    found = {"emails": ["hi@example.com"], "phones": []}
+    scraped = fake_scrape(monkeypatch, [failed_contacts(), found])
+    enricher = WebsiteEnricher()
+
+    async def scenario():
+        first = await enricher.enrich("https://example.com")
+        second = await enricher.enrich("https://example.com")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+
+    assert first == {"emails": [], "phones": []}
+    assert second == found
+    assert len(scraped) == 2
+    assert enricher.stats["websites_failed"] == 1
+    assert cache.stats["stores"] == 1
+
+
+def test_site_without_contacts_is_cached_as_negative(cache, monkeypatch):
+    scraped = fake_scrape(monkeypatch, [{"emails": [], "phones": []}])
+    enricher = WebsiteEnricher()
+
+    async def scenario():
+        await enricher.enrich("https://example.com")
+        return await enricher.enrich("https://www.example.com/menu")
+
+    assert asyncio.run(scenario()) == {"emails": [], "phones": []}
+    assert len(scraped) == 1
+    assert cache.stats["negative_hits"] == 1
+
+
+def test_uncached_site_counts_one_miss(cache, monkeypatch):
+    fake_scrape(monkeypatch, [{"emails": ["hi@example.com"], "phones": []}])
+
+    asyncio.run(WebsiteEnricher().enrich("https://example.com"))
+
+    assert cache.stats["misses"] == 1
+    assert cache.get_stats()["hit_rate"] == 0.0
+
+
+def test_entry_read_from_the_database_expires_with_its_row(cache):
+    async def scenario():
+        await cache.set("https://example.com", {"emails": ["hi@example.com"], "phones": []})
+        async with AsyncSessionLocal() as db:
+            row = await db.get(EnrichmentCacheEntry, "example.com")
+            row.expires_at = datetime.datetime.utcnow() + datetime.timedelta(seconds=0.2)
+            await db.commit()
+        cache.memory.clear()
+
+        promoted = await cache.get("https://example.com")
+        await asyncio.sleep(0.3)
+        return promoted, await cache.get("https://example.com")
+
+    promoted, expired = asyncio.run(scenario())
+
+    assert promoted == {"emails": ["hi@example.com"], "phones": []}
+    assert expired is None
+    assert cache.stats["db_hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_host_slots_do_not_outlive_the_fetches(cache, monkeypatch):
+    found = {"emails": [], "phones": []}
+    fake_scrape(monkeypatch, [found] * 3)
+    enricher = WebsiteEnricher(per_host=1)
+
+    async def scenario():
+        await asyncio.gather(*(
+            enricher.enrich(url) for url in ("https://a.example", "https://b.example", "https://c.example")
+        ))
+
+    asyncio.run(scenario())
+
+    assert enricher.get_stats()["hosts_active"] == 0
+
+
+def test_website_rate_limit_keeps_one_window_for_all_hosts(monkeypatch):
+    limiter = RateLimiter()
+    limiter.configure("website_scrape", max_requests=2, window_seconds=60)
+    limiter.configure("website_scrape_host", max_requests=10, window_seconds=60)
+    monkeypatch.setattr(scraper, "wait_for_rate_limit", limiter.wait_if_needed)
+
+    async def scenario():
+        for url in ("https://a.example/", "https://b.example/"):
+            await scraper.wait_for_website_rate_limit(url)
+        return await limiter.is_allowed("website_scrape")
+
+    assert asyncio.run(scenario()) is False
+    assert set(limiter.windows) == {"website_scrape:default", "website_scrape_host:a.example", "website_scrape_host:b.example"}
+
+
+def test_rate_limiter_prunes_windows_of_idle_identifiers(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limiter.time, "time", lambda: now[0])
+    limiter = rate_limiter.RateLimiter(prune_interval=60)
+    limiter.configure("website_scrape_host", max_requests=10, window_seconds=60)
+
+    async def scenario():
+        for host in ("a.example", "b.example"):
+            await limiter.is_allowed("website_scrape_host", host)
+        now[0] += 61
+        await limiter.is_allowed("website_scrape_host", "c.example")
+
+    asyncio.run(scenario())
+
+    assert set(limiter.windows) == {"website_scrape_host:c.example"}
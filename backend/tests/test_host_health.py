@@ -0,0 +1,91 @@
+import asyncio
+
+import dns.resolver
+import httpx
+
+from app.services.host_health import HostHealth
+
+
+class FakeResolver:
+    """Raises the given dnspython error for every query"""
+
+    def __init__(self, error):
+        self.error = error
+        self.queries = 0
+
+    async def resolve(self, host, record_type):
+        self.queries += 1
+        raise self.error
+
+
+def health_with(error, **kwargs):
+    health = HostHealth(**kwargs)
+    health.resolver = FakeResolver(error)
+    return health
+
+
+def test_nxdomain_is_negative_cached():
+    health = health_with(dns.resolver.NXDOMAIN())
+
+    assert asyncio.run(health.check("https://gone.example")) == "dns: nxdomain"
+    assert asyncio.run(health.check("https://gone.example")) == "negative cache: nxdomain"
+    assert health.resolver.queries == 1
+
+
+def test_no_answer_is_negative_cached():
+    health = health_with(dns.resolver.NoAnswer())
+
+    assert asyncio.run(health.check("https://parked.example")) == "dns: no address records"
+    assert "parked.example" in health.negative
+
+
+def test_servfail_is_not_negative_cached():
+    health = health_with(dns.resolver.NoNameservers(), failure_threshold=3)
+
+    assert asyncio.run(health.check("https://flaky.example")) == "dns: servfail"
+    assert "flaky.example" not in health.negative
+    assert health.circuits["flaky.example"].failures == 1
+    # The next check asks the resolver again
+    asyncio.run(health.check("https://flaky.example"))
+    assert health.resolver.queries == 4  # A and AAAA, twice
+
+
+def test_circuit_opens_after_threshold_and_success_closes_it():
+    health = HostHealth(failure_threshold=2, cooldown=300)
+    error = httpx.ReadTimeout("slow")
+
+    health.record_failure("https://slow.example", error)
+    assert health.get_stats()["open_circuits"] == 0
+    health.record_failure("https://slow.example", error)
+    assert health.get_stats()["open_circuits"] == 1
+    assert asyncio.run(health.check("https://slow.example")) == "circuit open"
+
+    health.record_success("https://slow.example")
+    assert "slow.example" not in health.circuits
+
+
+def test_circuits_are_bounded():
+    health = HostHealth(dns_cache_size=10)
+    for index in range(50):
+        health.record_failure(f"https://host{index}.example", httpx.ReadTimeout("slow"))
+
+    assert len(health.circuits) == 10
+
+
+def test_passed_dns_check_is_reused_until_its_ttl():
+    health = HostHealth()
+    lookups = []
+
+    async def lookup(host):
+        lookups.append(host)
+        return ["192.0.2.1"], 300
+
+    health._lookup = lookup
+
+    async def scenario():
+        return [await health.check("https://joespizzanyc.com/menu") for _ in range(3)]
+
+    assert asyncio.run(scenario()) == [None, None, None]
+    assert lookups == ["joespizzanyc.com"]
+    assert health.get_stats()["dns_checks_reused"] == 2
+    assert health.get_stats()["dns_live_hosts"] == 1
@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+
+from app.services.http_client import HttpClient
+from app.utils.host_slots import HostSlots
+
+
+def test_host_slot_caps_concurrency_and_is_dropped_when_idle(run):
+    slots = HostSlots(per_host=2)
+    running = []
+    peak = []
+
+    async def fetch():
+        async with slots.hold("example.com"):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.pop()
+
+    async def scenario():
+        await asyncio.gather(*(fetch() for _ in range(6)))
+
+    run(scenario())
+
+    assert max(peak) == 2
+    assert len(slots) == 0
+
+
+def test_cancelled_waiter_releases_its_host(run):
+    slots = HostSlots(per_host=1)
+
+    async def scenario():
+        release = asyncio.Event()
+
+        async def holder():
+            async with slots.hold("example.com"):
+                await release.wait()
+
+        async def waiter():
+            async with slots.hold("example.com"):
+                pass
+
+        first = asyncio.create_task(holder())
+        second = asyncio.create_task(waiter())
+        await asyncio.sleep(0)
+        waiting = slots.slots["example.com"].users
+        second.cancel()
+        release.set()
+        await asyncio.gather(first, second, return_exceptions=True)
+        return waiting
+
+    assert run(scenario()) == 2
+    assert len(slots) == 0
+
+
+def mock_client(handler) -> HttpClient:
+    client = HttpClient(max_connections_per_host=1, http2=False)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_requests_and_errors_are_counted_per_call(run):
+    def handler(request):
+        if request.url.host == "down.example":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(200, text="<html></html>")
+
+    client = mock_client(handler)
+
+    async def scenario():
+        response = await client.get("https://up.example/")
+        try:
+            await client.get("https://down.example/")
+        except httpx.ConnectError:
+            pass
+        async with client.stream("https://up.example/contact") as streamed:
+            body = await streamed.aread()
+        await client.stop()
+        return response, body
+
+    response, body = run(scenario())
+
+    assert response.status_code == 200
+    assert body == b"<html></html>"
+    stats = client.get_stats()
+    assert stats["requests"] == 3
+    assert stats["errors"] == 1
+    assert stats["hosts_active"] == 0
+    assert stats["started"] is False
@@ -0,0 +1,178 @@
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import JobCheckpoint, SearchJob
+from app.schemas import SearchRequest
+from app.services import scraper, search_jobs
+from app.services.job_checkpoints import JobCheckpoints
+from app.services.scraper import _extract_listing_async, is_skipped_place, place_key
+
+PLACE_ID = "ChIJN1t_tDeuEmsRUsoyG83frY4"
+# URL the page lands on after clicking the listing
+CLICKED_URL = f"https://www.google.com/maps/place/Joe's+Pizza/@40.73,-73.99,17z/data=!4m6!3m5!1s0x0:0x1!8m2!3d40.73!4d-73.99!19s{PLACE_ID}"
+# href of the same listing in the result feed, as the URL path collects it on resume
+FEED_URL = f"https://www.google.com/maps/place/Joe's+Pizza/data=!4m7!3m6!1s0x0:0x1!8m2!3d40.73!4d-73.99!16s%2Fg%2F1!19s{PLACE_ID}?authuser=0&hl=en&rclk=1"
+# URL of the listing clicked before it
+PREVIOUS_URL = "https://www.google.com/maps/place/Prince+St+Pizza/data=!4m7!3m6!1s0x0:0x2!19sChIJprevious"
+
+
+class FakeAnchor:
+    def __init__(self, href):
+        self.href = href
+
+    @property
+    def first(self):
+        return self
+
+    async def evaluate(self, script, timeout=None):
+        if self.href is None:
+            raise TimeoutError("no anchor")
+        return self.href
+
+
+class FakeListing:
+    def __init__(self, page: "FakePage", href=FEED_URL, navigates_to=CLICKED_URL):
+        self.page = page
+        self.href = href
+        self.navigates_to = navigates_to
+
+    def locator(self, selector):
+        return FakeAnchor(self.href)
+
+    async def click(self):
+        self.page.url = self.navigates_to
+
+
+class FakePage:
+    def __init__(self):
+        self.url = "https://www.google.com/maps/search/pizza"
+
+    async def evaluate(self, script, arg=None):
+        return {}
+
+
+def extract_clicked_listing(monkeypatch, run, **listing) -> dict:
+    async def details_loaded(page):
+        return True
+
+    monkeypatch.setattr(scraper, "_wait_for_details_async", details_loaded)
+    monkeypatch.setattr(scraper, "parse_detail_panel", lambda raw: {"name": "Joe's Pizza", "address": "7 Carmine St"})
+    page = FakePage()
+    return run(_extract_listing_async(page, FakeListing(page, **listing), 0, 1))
+
+
+def test_clicked_listing_is_keyed_by_its_own_anchor(monkeypatch, run):
+    business = extract_clicked_listing(monkeypatch, run)
+
+    assert business["place_url"] == FEED_URL
+    assert business["place_id"] == PLACE_ID
+    assert place_key(business) == PLACE_ID
+
+
+def test_stale_page_url_does_not_leak_the_previous_place(monkeypatch, run):
+    # Maps has not updated the URL yet, it still shows the previously clicked place
+    business = extract_clicked_listing(monkeypatch, run, navigates_to=PREVIOUS_URL)
+
+    assert business["place_id"] == PLACE_ID
+
+
+def test_page_url_is_the_fallback_without_an_anchor(monkeypatch, run):
+    business = extract_clicked_listing(monkeypatch, run, href=None)
+
+    assert business["place_url"] == CLICKED_URL
+    assert business["place_id"] == PLACE_ID
+
+
+def test_resumed_job_skips_listings_clicked_by_the_first_run(database, monkeypatch, run):
+    business = extract_clicked_listing(monkeypatch, run)
+    checkpoints = JobCheckpoints()
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            job = SearchJob(query="pizza", limit=5, source="google_maps", mode="scrape_only", status="running")
+            db.add(job)
+            await db.commit()
+        await checkpoints.record_extracted(job.id, business)
+        async with AsyncSessionLocal() as db:
+            await checkpoints.mark_done(db, job.id, business)
+            await db.commit()
+        return await checkpoints.load(job.id)
+
+    progress = run(scenario())
+
+    assert progress.resumed
+    assert [done["name"] for done in progress.done] == ["Joe's Pizza"]
+    assert not progress.pending
+    assert is_skipped_place(FEED_URL, progress.skip_places)
+    assert not is_skipped_place(FEED_URL.replace(PLACE_ID, "ChIJother"), progress.skip_places)
+
+
+def test_extracted_listing_is_replayed_once(database, run):
+    checkpoints = JobCheckpoints()
+    business = {"name": "Joe's Pizza", "address": "7 Carmine St", "place_id": PLACE_ID}
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            job = SearchJob(query="pizza", limit=5, source="google_maps", mode="scrape_only", status="running")
+            db.add(job)
+            await db.commit()
+        await checkpoints.record_extracted(job.id, business)
+        await checkpoints.record_extracted(job.id, business)
+        progress = await checkpoints.load(job.id)
+        await checkpoints.clear(job.id)
+        async with AsyncSessionLocal() as db:
+            remaining = (await db.execute(select(JobCheckpoint))).scalars().all()
+        return progress, remaining
+
+    progress, remaining = run(scenario())
+
+    assert [pending["place_id"] for pending in progress.pending] == [PLACE_ID]
+    assert checkpoints.stats["extracted"] == 1
+    assert remaining == []
+
+
+def test_failed_save_keeps_the_checkpoint_and_fails_the_job(database, monkeypatch, run):
+    class Enrichment:
+        async def contacts(self, website):
+            return {"emails": [], "phones": []}
+
+        def cancel(self):
+            pass
+
+    async def stream(query, max_results, options=None):
+        yield {"name": "Joe's Pizza", "address": "7 Carmine St", "phone": "", "place_id": PLACE_ID}
+        yield {"name": "Prince St Pizza", "address": "27 Prince St", "phone": "", "place_id": "ChIJprevious"}
+
+    def save(job_id, business):
+        if business["place_id"] == PLACE_ID:
+            raise RuntimeError("connection reset")
+        return original_save(job_id, business)
+
+    original_save = search_jobs.scrape_result_from_business
+    monkeypatch.setattr(search_jobs, "stream_google_maps", stream)
+    monkeypatch.setattr(search_jobs, "scrape_result_from_business", save)
+    monkeypatch.setattr(search_jobs.website_enricher, "batch", lambda region=None: Enrichment())
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            job = SearchJob(query=request.query, limit=request.limit, source=request.source, mode=request.mode)
+            db.add(job)
+            await db.commit()
+        try:
+            await search_jobs.process_search_job(job.id, request)
+        except RuntimeError as e:
+            error = e
+        else:
+            error = None
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(SearchJob).where(SearchJob.id == job.id))).scalar_one()
+        return error, job, await JobCheckpoints().load(job.id)
+
+    error, job, progress = run(scenario())
+
+    assert error is not None
+    assert job.status.startswith("failed")
+    assert not job.cacheable
+    assert [pending["place_id"] for pending in progress.pending] == [PLACE_ID]
+    assert [done["place_id"] for done in progress.done] == ["ChIJprevious"]
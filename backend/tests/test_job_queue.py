@@ -0,0 +1,274 @@
+import asyncio
+
+import pytest
+from sqlalchemy.future import select
+
+from app.config import settings
+from app.database import AsyncSessionLocal, default_pool_size, engine
+from app.models import JobQueueEntry, SearchJob
+from app.services import job_queue as job_queue_module
+from app.services import search_jobs
+from app.services.job_queue import JobQueue, JobWorkerPool
+
+
+async def create_job(queue: JobQueue, kind: str = "search") -> int:
+    async with AsyncSessionLocal() as db:
+        job = SearchJob(query="pizza", limit=5, source="google_maps", mode="scrape_only", status="pending")
+        db.add(job)
+        await db.flush()
+        await queue.enqueue(db, job.id, {"query": "pizza", "limit": 5}, kind=kind)
+        await db.commit()
+        return job.id
+
+
+async def load(job_id: int):
+    async with AsyncSessionLocal() as db:
+        job = (await db.execute(select(SearchJob).where(SearchJob.id == job_id))).scalar_one()
+        entry = (await db.execute(select(JobQueueEntry).where(JobQueueEntry.job_id == job_id))).scalar_one()
+        return job, entry
+
+
+def test_claim_and_complete(database, run):
+    queue = JobQueue()
+
+    async def scenario():
+        job_id = await create_job(queue)
+        claimed = await queue.claim("worker-1")
+        assert claimed.job_id == job_id and claimed.attempts == 1
+        assert await queue.claim("worker-2") is None  # leased
+        await queue.complete(claimed, "worker-1")
+        return await load(job_id)
+
+    _, entry = run(scenario())
+    assert entry.status == "done"
+    assert entry.locked_by is None
+
+
+def test_concurrent_workers_do_not_double_claim(database, run):
+    queue = JobQueue()
+
+    async def scenario():
+        for _ in range(3):
+            await create_job(queue)
+        claims = await asyncio.gather(*(queue.claim(f"worker-{index}") for index in range(6)))
+        return [claimed.id for claimed in claims if claimed]
+
+    claimed_ids = run(scenario())
+    assert len(claimed_ids) == len(set(claimed_ids))
+
+
+def test_failing_handler_is_retried_then_failed(database, monkeypatch, run):
+    queue = JobQueue(max_attempts=2, retry_backoff=0)
+    pool = JobWorkerPool(queue)
+
+    async def failing(job_id, payload):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(job_queue_module.job_handlers, "search", failing)
+
+    async def scenario():
+        job_id = await create_job(queue)
+        await pool._run(await queue.claim("worker-1"), "worker-1")
+        after_first = await load(job_id)
+        await pool._run(await queue.claim("worker-1"), "worker-1")
+        return after_first, await load(job_id)
+
+    (job, entry), (final_job, final_entry) = run(scenario())
+    assert entry.status == "queued" and entry.attempts == 1 and entry.last_error == "boom"
+    assert job.status == "pending"
+    assert final_entry.status == "failed" and final_entry.attempts == 2
+    assert final_job.status == "failed: boom"
+
+
+def test_search_job_errors_reach_the_queue(database, monkeypatch, run):
+    queue = JobQueue(max_attempts=3, retry_backoff=0)
+    pool = JobWorkerPool(queue)
+
+    async def broken_load(job_id):
+        raise RuntimeError("checkpoints unavailable")
+
+    monkeypatch.setattr(search_jobs.job_checkpoints, "load", broken_load)
+
+    async def scenario():
+        job_id = await create_job(queue)
+        await pool._run(await queue.claim("worker-1"), "worker-1")
+        return await load(job_id)
+
+    job, entry = run(scenario())
+    assert entry.status == "queued"
+    assert entry.last_error == "checkpoints unavailable"
+    assert job.status == "pending"
+
+
+def test_lease_expired_on_last_attempt_fails_the_search_job(database, run):
+    queue = JobQueue(lease_seconds=-1, max_attempts=1)
+
+    async def scenario():
+        job_id = await create_job(queue)
+        assert await queue.claim("worker-1") is not None  # the worker dies holding it
+        assert await queue.claim("worker-2") is None
+        return await load(job_id)
+
+    job, entry = run(scenario())
+    assert entry.status == "failed"
+    assert job.status.startswith("failed: Lease expired after 1 attempts")
+
+
+def test_claim_moves_on_after_failing_an_expired_entry(database, run):
+    queue = JobQueue(lease_seconds=-1, max_attempts=1)
+
+    async def scenario():
+        dead_job = await create_job(queue)
+        assert await queue.claim("worker-1") is not None  # the worker dies holding it
+        ready_job = await create_job(queue)
+        claimed = await queue.claim("worker-2")
+        return dead_job, ready_job, claimed, await load(dead_job)
+
+    dead_job, ready_job, claimed, (_, dead_entry) = run(scenario())
+    assert dead_entry.status == "failed"
+    assert claimed is not None and claimed.job_id == ready_job
+
+
+def test_stopping_waits_for_the_job_and_heartbeat_before_handing_it_back(database, monkeypatch, run):
+    queue = JobQueue()
+    pool = JobWorkerPool(queue, heartbeat_interval=0)
+    events = []
+
+    async def slow_to_stop(job_id, payload):
+        try:
+            await asyncio.sleep(60)
+        finally:
+            await asyncio.sleep(0.05)  # e.g. a final write
+            events.append("job unwound")
+
+    async def heartbeat(claimed, worker_id):
+        try:
+            await asyncio.sleep(60)
+        finally:
+            events.append("heartbeat stopped")
+        return True
+
+    async def release(claimed, worker_id):
+        events.append("released")
+
+    monkeypatch.setitem(job_queue_module.job_handlers, "search", slow_to_stop)
+    monkeypatch.setattr(queue, "heartbeat", heartbeat)
+    monkeypatch.setattr(queue, "release", release)
+
+    async def scenario():
+        await create_job(queue)
+        running = asyncio.create_task(pool._run(await queue.claim("worker-1"), "worker-1"))
+        await asyncio.sleep(0.05)
+        running.cancel()
+        await asyncio.gather(running, return_exceptions=True)
+
+    run(scenario())
+    assert sorted(events[:2]) == ["heartbeat stopped", "job unwound"]
+    assert events[2:] == ["released"]
+
+
+def test_worker_keeps_claiming_after_settling_a_job_fails(database, monkeypatch, run):
+    queue = JobQueue()
+    pool = JobWorkerPool(queue, concurrency=1, poll_interval=0.01)
+    handled = []
+    complete = queue.complete
+
+    async def handler(job_id, payload):
+        handled.append(job_id)
+
+    async def complete_once_failing(claimed, worker_id):
+        if len(handled) == 1:
+            raise ConnectionError("connection to the database was lost")
+        await complete(claimed, worker_id)
+
+    monkeypatch.setitem(job_queue_module.job_handlers, "search", handler)
+    monkeypatch.setattr(queue, "complete", complete_once_failing)
+
+    async def scenario():
+        first = await create_job(queue)
+        second = await create_job(queue)
+        await pool.start()
+        for _ in range(100):
+            if len(handled) == 2:
+                break
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.05)
+        await pool.stop()
+        return first, second, await load(second)
+
+    first, second, (_, entry) = run(scenario())
+    assert handled == [first, second]
+    assert entry.status == "done"
+
+
+def test_expired_lease_is_reclaimed(database, run):
+    queue = JobQueue(lease_seconds=-1, max_attempts=3)
+
+    async def scenario():
+        await create_job(queue)
+        first = await queue.claim("worker-1")
+        second = await queue.claim("worker-2")
+        # The first worker lost its lease and can no longer settle the entry
+        await queue.complete(first, "worker-1")
+        return second
+
+    second = run(scenario())
+    assert second.attempts == 2
+    assert queue.stats["reclaimed_expired"] == 1
+    assert queue.stats["leases_lost"] == 1
+
+
+def test_entry_without_handler_fails_the_search_job(database, run):
+    queue = JobQueue()
+    pool = JobWorkerPool(queue)
+
+    async def scenario():
+        job_id = await create_job(queue, kind="unknown")
+        await pool._run(await queue.claim("worker-1"), "worker-1")
+        return await load(job_id)
+
+    job, entry = run(scenario())
+    assert entry.status == "failed"
+    assert job.status == "failed: No handler registered for 'unknown'"
+
+
+def test_heartbeat_does_not_wait_for_a_busy_job_pool(database, run):
+    queue = JobQueue()
+
+    async def scenario():
+        await create_job(queue)
+        claimed = await queue.claim("worker-1")
+        # Scrape jobs hold every connection of the main pool
+        held = [await engine.connect() for _ in range(engine.pool.size())]
+        try:
+            return await asyncio.wait_for(queue.heartbeat(claimed, "worker-1"), timeout=5)
+        finally:
+            for connection in held:
+                await connection.close()
+
+    assert run(scenario()) is True
+
+
+def test_default_pool_fits_the_running_jobs(monkeypatch):
+    monkeypatch.setattr(settings, "JOB_WORKER_PROCESS", True)
+    per_job = settings.PIPELINE_ENRICH_CONCURRENCY + settings.PIPELINE_PERSIST_CONCURRENCY + 2
+    assert default_pool_size() >= settings.JOB_WORKER_CONCURRENCY * per_job
+
+
+def test_released_job_goes_back_to_pending(database, run):
+    queue = JobQueue()
+
+    async def scenario():
+        job_id = await create_job(queue)
+        claimed = await queue.claim("worker-1")
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(SearchJob).where(SearchJob.id == job_id))).scalar_one()
+            job.status = "processing"
+            await db.commit()
+        await queue.release(claimed, "worker-1")
+        return await load(job_id)
+
+    job, entry = run(scenario())
+
+    assert entry.status == "queued" and entry.attempts == 0
+    assert job.status == "pending"
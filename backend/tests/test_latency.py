@@ -0,0 +1,58 @@
+from app.services.latency import LatencyTracker, percentile
+
+
+def test_percentile_is_nearest_rank():
+    assert percentile([4.0, 1.0, 3.0, 2.0], 50) == 2.0
+    assert percentile([1.0, 2.0, 3.0, 4.0], 90) == 4.0
+    assert percentile([5.0], 95) == 5.0
+
+
+def test_defaults_until_enough_samples():
+    tracker = LatencyTracker(min_samples=3, max_timeout=30.0, hedge_delay=3.0)
+    tracker.record("https://example.com", 1.0)
+
+    assert tracker.timeout_for("https://example.com") == 30.0
+    assert tracker.hedge_delay("https://example.com") == 3.0
+
+
+def test_timeout_and_hedge_delay_follow_host_latency():
+    tracker = LatencyTracker(min_samples=3, multiplier=3.0, min_timeout=5.0, max_timeout=30.0)
+    for seconds in (2.0, 2.0, 2.0, 4.0):
+        tracker.record("https://slow.example", seconds)
+
+    timeout = tracker.timeout_for("https://slow.example")
+    assert 5.0 <= timeout <= 12.0
+    assert tracker.hedge_delay("https://slow.example") <= timeout / 2
+
+
+def test_timeout_is_clamped():
+    tracker = LatencyTracker(min_samples=1, multiplier=3.0, min_timeout=5.0, max_timeout=30.0)
+    tracker.record("https://fast.example", 0.1)
+    tracker.record("https://glacial.example", 60.0)
+
+    assert tracker.timeout_for("https://fast.example") == 5.0
+    assert tracker.timeout_for("https://glacial.example") == 30.0
+
+
+def test_new_host_gets_the_full_budget_however_fast_others_are():
+    tracker = LatencyTracker(min_samples=3, multiplier=3.0, min_timeout=5.0, max_timeout=30.0, hedge_delay=3.0)
+    for _ in range(10):
+        tracker.record("https://fast.example", 0.2)
+
+    assert tracker.timeout_for("https://fast.example") == 5.0
+    assert tracker.timeout_for("https://new.example") == 30.0
+    # The hedge delay may still come from the global window
+    assert tracker.hedge_delay("https://new.example") == 0.5
+
+
+def test_timeouts_are_censored_samples_that_raise_the_budget():
+    tracker = LatencyTracker(min_samples=3, multiplier=3.0, min_timeout=5.0, max_timeout=30.0)
+    for _ in range(3):
+        tracker.record("https://slow.example", 1.0)
+    assert tracker.timeout_for("https://slow.example") == 5.0
+
+    tracker.record_timeout("https://slow.example", 5.0)
+
+    assert tracker.timeout_for("https://slow.example") == 15.0
+    assert list(tracker.global_samples) == [1.0, 1.0, 1.0]
+    assert tracker.stats["timeouts"] == 1
@@ -0,0 +1,113 @@
+from app.services.maps_extraction import (
+    merge_details,
+    parse_detail_panel,
+    parse_feed_card,
+    parse_opening_hours,
+    parse_reviews_average,
+    parse_reviews_count,
+    place_id_from_url,
+)
+
+
+PANEL = {
+    "name": "Joe's Pizza",
+    "address": "7 Carmine St, New York, NY 10014",
+    "website": "joespizzanyc.com",
+    "phone": "(212) 366-1182",
+    "reviews_count": "(12,345)",
+    "reviews_average": "4,5",
+    "info1": "Dine-in·\nIn-store shopping",
+    "info2": "Takeout·\nIn-store pickup",
+    "info3": "",
+    "opens_at": "Open ⋅ Closes 4\u202fAM",
+    "place_type": "Pizza restaurant",
+}
+
+
+def test_detail_panel_becomes_a_business_record():
+    assert parse_detail_panel(PANEL) == {
+        "name": "Joe's Pizza",
+        "address": "7 Carmine St, New York, NY 10014",
+        "website": "joespizzanyc.com",
+        "phone": "(212) 366-1182",
+        "reviews_count": 12345,
+        "reviews_average": 4.5,
+        "store_shopping": "Yes",
+        "in_store_pickup": "Yes",
+        "store_delivery": "No",
+        "place_type": "Pizza restaurant",
+        "opening_hours": " Closes 4AM",
+        "introduction": "None Found",
+    }
+
+
+def test_empty_panel_gets_defaults():
+    business = parse_detail_panel({})
+
+    assert business["name"] == ""
+    assert business["reviews_count"] == 0
+    assert business["reviews_average"] == 0.0
+    assert business["opening_hours"] == ""
+    assert business["introduction"] == "None Found"
+
+
+def test_unparseable_numbers_and_hours_fallback():
+    assert parse_reviews_count("No reviews") == 0
+    assert parse_reviews_average("4.8 ") == 4.8
+    assert parse_reviews_average("New") == 0.0
+    assert parse_opening_hours("", "Closed ⋅ Opens 11\u202fAM") == " Opens 11AM"
+    assert parse_opening_hours("Open 24 hours", "") == "Open 24 hours"
+
+
+CARD = {
+    "name": "Joe's Pizza",
+    "place_url": "https://www.google.com/maps/place/Joe's+Pizza/data=!4m7!3m6!1s0x0:0x0!8m2!3d40.7!4d-74.0!16s%2Fg%2F1!19sChIJ1234abcd-_XY?authuser=0",
+    "rating": "4.5",
+    "reviews": "(12,345)",
+    "rows": ["Pizza · $ · 7 Carmine St", "Open · Closes 4 AM"],
+    "phone": "",
+    "website": "",
+}
+
+
+def test_feed_card_reads_category_address_and_counts():
+    business = parse_feed_card(CARD)
+
+    assert business["name"] == "Joe's Pizza"
+    assert business["place_type"] == "Pizza"
+    assert business["address"] == "7 Carmine St"
+    assert business["reviews_count"] == 12345
+    assert business["reviews_average"] == 4.5
+    assert business["place_url"] == CARD["place_url"]
+
+
+def test_feed_card_without_an_address_segment():
+    business = parse_feed_card({"name": " Corner Cafe ", "rows": ["", "Coffee shop · $$"]})
+
+    assert business["name"] == "Corner Cafe"
+    assert business["place_type"] == "Coffee shop"
+    assert business["address"] == ""
+    assert business["reviews_count"] == 0
+    assert business["place_id"] == ""
+
+
+def test_details_only_fill_fields_the_card_left_empty():
+    card = parse_feed_card(CARD)
+    details = parse_detail_panel({**PANEL, "name": "Joe's Pizza Greenwich Village", "address": ""})
+
+    merged = merge_details(card, details)
+
+    assert merged["name"] == "Joe's Pizza"
+    assert merged["address"] == "7 Carmine St"
+    assert merged["phone"] == "(212) 366-1182"
+    assert merged["website"] == "joespizzanyc.com"
+    assert merged["store_shopping"] == "Yes"
+    assert merged["store_delivery"] == "No"
+    assert merged["place_url"] == CARD["place_url"]
+
+
+def test_place_id_comes_from_the_data_segment():
+    assert parse_feed_card(CARD)["place_id"] == "ChIJ1234abcd-_XY"
+    assert place_id_from_url("https://www.google.com/maps/place/Joe's+Pizza/@40.7,-74.0,17z") == ""
+    assert place_id_from_url("https://www.google.com/maps/place/data=!1s0x0:0x0!19s0x0") == ""
+    assert place_id_from_url(None) == ""
@@ -0,0 +1,101 @@
+"""
+The fixture is a synthetic tbm=map response with two place records, built at
+the indexes the decoder reads rather than captured from Maps. Replace it with
+a response saved from a live run with MAPS_PAYLOAD_DUMP_DIR set.
+"""
+from pathlib import Path
+
+import pytest
+
+from app.services import scraper
+from app.services.maps_payloads import DETAIL_FIELDS, decode_payload, fill_missing, load_payload, missing_fields
+
+
+FIXTURE = Path(__file__).resolve().parent / "fixtures" / "maps_search_response.txt"
+
+
+@pytest.fixture
+def decoded():
+    return decode_payload(FIXTURE.read_text(encoding="utf-8"))
+
+
+def test_unwraps_the_search_response():
+    data = load_payload(FIXTURE.read_text(encoding="utf-8"))
+
+    assert data[0][0] == "coffee austin"
+
+
+def test_decodes_every_place_record(decoded):
+    assert [business["place_id"] for business in decoded] == [
+        "ChIJ9T9U6wa1RIYRbNQ0sDl0x7Q",
+        "ChIJ0wqL2lC1RIYRk2m8cG9e1Uc",
+    ]
+    assert decoded[0] == {
+        "name": "Bean There Coffee",
+        "address": "1200 E 6th St, Austin, TX 78702",
+        "website": "https://beanthere.example.com/",
+        "phone": "(512) 555-0142",
+        "reviews_count": 1287,
+        "reviews_average": 4.6,
+        "store_shopping": "No",
+        "in_store_pickup": "No",
+        "store_delivery": "No",
+        "place_type": "Coffee shop",
+        "opening_hours": "Open ⋅ Closes 6 PM",
+        "introduction": "Small-batch roaster with a patio.",
+        "place_id": "ChIJ9T9U6wa1RIYRbNQ0sDl0x7Q",
+        "place_url": "https://www.google.com/maps/place/?q=place_id:ChIJ9T9U6wa1RIYRbNQ0sDl0x7Q",
+    }
+
+
+def test_values_that_fail_their_check_are_left_unknown(decoded):
+    business = decoded[1]
+
+    assert business["address"] == "901 E Cesar Chavez St, Austin, TX 78702"
+    assert business["reviews_average"] == 4.2
+    # A number where the phone text should be is not trusted
+    assert set(missing_fields(business)) == {"website", "phone", "opening_hours", "introduction"}
+    assert missing_fields(business, DETAIL_FIELDS) == ["website", "phone"]
+
+
+def test_not_a_place_payload_decodes_to_nothing():
+    assert decode_payload(")]}'\n[[1, 2, [\"ChIJ-not-a-record\"]]]") == []
+    assert decode_payload("<html></html>") == []
+
+
+def test_missing_fields_come_from_the_detail_panel_then_defaults(decoded):
+    details = {"website": "https://espresso.example.com", "phone": "", "store_shopping": "Yes", "name": "Ignored"}
+
+    filled = fill_missing(decoded[1], details)
+
+    assert filled["name"] == "Eastside Espresso"
+    assert filled["website"] == "https://espresso.example.com"
+    assert filled["phone"] == ""
+    assert filled["store_shopping"] == "Yes"
+    assert filled["store_delivery"] == "No"
+    assert filled["introduction"] == "None Found"
+    assert not missing_fields(filled)
+
+
+def test_only_businesses_without_website_or_phone_are_opened(decoded, monkeypatch, run):
+    opened = []
+
+    async def details(context, place_urls, tabs):
+        for url in place_urls:
+            opened.append(url)
+            yield {"store_shopping": "Yes", "phone": "(512) 555-0199"}
+
+    monkeypatch.setattr(scraper, "_iter_details_concurrently", details)
+
+    async def collect():
+        return [business async for business in scraper._iter_payload_async(None, decoded, tabs=2)]
+
+    businesses = run(collect())
+
+    # Bean There's payload already carried its website and phone, so it is never opened
+    assert opened == [decoded[1]["place_url"]]
+    assert [business["name"] for business in businesses] == ["Bean There Coffee", "Eastside Espresso"]
+    assert businesses[0]["store_shopping"] == "No"
+    assert businesses[1]["phone"] == "(512) 555-0199"
+    assert businesses[1]["store_shopping"] == "Yes"
+    assert not any(missing_fields(business) for business in businesses)
@@ -0,0 +1,178 @@
+import asyncio
+import threading
+from contextlib import asynccontextmanager
+
+import pytest
+
+from app.config import settings
+from app.services import scraper
+from app.services.request_blocking import ResourceBlocker
+from app.services.scraper import GoogleMapsScraper, MapsScrapeOptions
+
+
+BUSINESS = {"name": "Joe's Pizza", "address": "7 Carmine St", "phone": ""}
+
+
+def test_unavailable_async_engine_falls_back_to_the_shared_sync_executor(monkeypatch, run):
+    threads = []
+
+    async def scrape_maps_async(query, max_results, options=None):
+        raise RuntimeError("browser pool failed to start")
+
+    def scrape_google_maps_sync(query, max_results):
+        threads.append(threading.current_thread().name)
+        return [BUSINESS]
+
+    monkeypatch.setattr(GoogleMapsScraper, "scrape_maps_async", staticmethod(scrape_maps_async))
+    monkeypatch.setattr(scraper, "scrape_google_maps_sync", scrape_google_maps_sync)
+    GoogleMapsScraper.shutdown_sync_executor()
+
+    async def scenario():
+        first = await GoogleMapsScraper.scrape_maps("pizza", engine="async")
+        executor = GoogleMapsScraper._get_sync_executor()
+        second = await GoogleMapsScraper.scrape_maps("pizza", engine="sync")
+        return first, second, executor
+
+    try:
+        first, second, executor = run(scenario())
+        assert executor is GoogleMapsScraper._get_sync_executor()
+        assert executor._max_workers == settings.MAPS_SYNC_FALLBACK_WORKERS
+    finally:
+        GoogleMapsScraper.shutdown_sync_executor()
+
+    assert first == second == [BUSINESS]
+    assert all(name.startswith("maps-sync") for name in threads)
+    assert GoogleMapsScraper._sync_executor is None
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        self.pages = []
+
+    async def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+
+def test_detail_tabs_are_bounded_and_results_keep_feed_order(monkeypatch, run):
+    context = FakeContext()
+    open_tabs = []
+    peak = []
+
+    async def fetch_place_details(page, place_url):
+        open_tabs.append(page)
+        peak.append(len(open_tabs))
+        # Later listings finish first, the output must still follow the feed
+        await asyncio.sleep(0.01 * (5 - int(place_url[-1])))
+        open_tabs.remove(page)
+        if place_url.endswith("3"):
+            raise TimeoutError("detail panel did not load")
+        return {"name": place_url}
+
+    monkeypatch.setattr(scraper, "_fetch_place_details_async", fetch_place_details)
+    place_urls = [f"https://maps.example/place/{number}" for number in range(5)]
+
+    async def scenario():
+        return [result async for result in scraper._iter_details_concurrently(context, place_urls, tabs=2)]
+
+    results = run(scenario())
+
+    assert results == [{"name": url} for url in place_urls[:3]] + [None, {"name": place_urls[4]}]
+    assert max(peak) == 2
+    assert len(context.pages) == 2
+    assert all(page.closed for page in context.pages)
+
+
+def test_businesses_are_yielded_as_they_are_extracted(monkeypatch, run):
+    events = []
+    listings = [
+        {"name": "Joe's Pizza", "address": "7 Carmine St", "phone": ""},
+        {"name": "Joe's Pizza", "address": "7 Carmine St", "phone": ""},
+        {"name": "Prince St Pizza", "address": "27 Prince St", "phone": ""},
+    ]
+
+    async def open_search(page, search_query):
+        return True
+
+    async def load_listings(page, max_results):
+        return listings
+
+    async def iter_listings(page, loaded):
+        for business in loaded:
+            events.append(f"extracted {business['name']}")
+            yield dict(business)
+
+    monkeypatch.setattr(scraper, "resource_blocker", ResourceBlocker(enabled=False))
+    monkeypatch.setattr(scraper, "_open_search_async", open_search)
+    monkeypatch.setattr(scraper, "_load_listings_async", load_listings)
+    monkeypatch.setattr(scraper, "_iter_listings_async", iter_listings)
+    options = MapsScrapeOptions(parse_payloads=False)
+
+    async def scenario():
+        context = FakeContext()
+        async for business in scraper.iter_google_maps_async("pizza", 3, context, options):
+            events.append(f"received {business['name']}")
+        return context
+
+    context = run(scenario())
+
+    assert events == [
+        "extracted Joe's Pizza",
+        "received Joe's Pizza",
+        "extracted Joe's Pizza",
+        "extracted Prince St Pizza",
+        "received Prince St Pizza",
+    ]
+    assert context.pages[0].closed
+
+
+class FakePool:
+    @asynccontextmanager
+    async def acquire(self):
+        yield FakeContext()
+
+
+def fake_stream(monkeypatch, yielded_before_failing):
+    """Async engine that yields some businesses and then fails; the sync engine returns two"""
+    async def iter_google_maps(query, max_results, context, options=None):
+        for business in [BUSINESS][:yielded_before_failing]:
+            yield business
+        raise RuntimeError("page crashed")
+
+    async def scrape_maps_sync(query, max_results=20):
+        return [BUSINESS, {"name": "Prince St Pizza", "address": "27 Prince St", "phone": "", "place_id": "ChIJprince"}]
+
+    monkeypatch.setattr(scraper, "browser_pool", FakePool())
+    monkeypatch.setattr(scraper, "iter_google_maps_async", iter_google_maps)
+    monkeypatch.setattr(GoogleMapsScraper, "scrape_maps_sync", staticmethod(scrape_maps_sync))
+
+
+def test_stream_falls_back_to_sync_only_before_anything_was_yielded(monkeypatch, run):
+    fake_stream(monkeypatch, yielded_before_failing=0)
+    options = MapsScrapeOptions(skip_places=frozenset({"ChIJprince"}))
+
+    async def scenario():
+        return [business async for business in GoogleMapsScraper.stream_maps("pizza", engine="async", options=options)]
+
+    assert run(scenario()) == [BUSINESS]
+
+
+def test_stream_failing_midway_is_not_restarted_on_the_sync_engine(monkeypatch, run):
+    fake_stream(monkeypatch, yielded_before_failing=1)
+    received = []
+
+    async def scenario():
+        async for business in GoogleMapsScraper.stream_maps("pizza", engine="async"):
+            received.append(business)
+
+    with pytest.raises(RuntimeError):
+        run(scenario())
+    assert received == [BUSINESS]
@@ -0,0 +1,122 @@
+import asyncio
+
+from app.services.maps_waits import SearchRequestTracker, wait_for_selectors_or_fallback
+
+
+class FakePage:
+    """Just enough of a Playwright page to emit request events"""
+
+    def __init__(self):
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    def emit(self, event, request):
+        for handler in list(self.listeners.get(event, [])):
+            handler(request)
+
+
+class FakeRequest:
+    def __init__(self, url, resource_type="xhr"):
+        self.url = url
+        self.resource_type = resource_type
+
+
+def xhr(url):
+    return FakeRequest(url)
+
+
+SEARCH_URL = "https://www.google.com/search?tbm=map&q=pizza"
+
+
+def test_counts_search_request_started_before_the_wait():
+    page = FakePage()
+    tracker = SearchRequestTracker(page)
+    tracker.attach()
+    request = xhr(SEARCH_URL)
+    page.emit("request", request)
+
+    async def run():
+        wait = asyncio.create_task(tracker.wait_quiet(quiet_ms=50, timeout_ms=1000))
+        await asyncio.sleep(0.2)
+        assert not wait.done()
+        page.emit("requestfinished", request)
+        return await wait
+
+    assert asyncio.run(run()) is True
+
+
+def test_ignores_unrelated_background_traffic():
+    page = FakePage()
+    tracker = SearchRequestTracker(page)
+    tracker.attach()
+    page.emit("request", xhr("https://www.google.com/maps/vt/stream?foo=1"))
+    page.emit("request", FakeRequest(SEARCH_URL, resource_type="image"))
+
+    assert asyncio.run(tracker.wait_quiet(quiet_ms=10, timeout_ms=500)) is True
+
+
+def test_times_out_while_search_is_in_flight():
+    page = FakePage()
+    tracker = SearchRequestTracker(page)
+    tracker.attach()
+    page.emit("request", xhr(SEARCH_URL))
+
+    assert asyncio.run(tracker.wait_quiet(quiet_ms=10, timeout_ms=150)) is False
+
+
+def test_detach_removes_listeners():
+    page = FakePage()
+    tracker = SearchRequestTracker(page)
+    tracker.attach()
+    tracker.detach()
+    assert all(not handlers for handlers in page.listeners.values())
+    page.emit("request", xhr(SEARCH_URL))
+    assert not tracker.inflight
+
+
+class FakeLocator:
+    def __init__(self, page, selectors):
+        self.page = page
+        self.selectors = selectors
+
+    def or_(self, other):
+        return FakeLocator(self.page, self.selectors + other.selectors)
+
+    @property
+    def first(self):
+        return self
+
+    async def wait_for(self, state, timeout):
+        self.page.waits.append(self.selectors)
+        if not any(selector in self.page.visible for selector in self.selectors):
+            raise TimeoutError(f"Timeout {timeout}ms exceeded")
+
+
+class SelectorPage:
+    """A page where only the selectors in visible match"""
+
+    def __init__(self, visible):
+        self.visible = visible
+        self.waits = []
+
+    def locator(self, selector):
+        return FakeLocator(self, [selector])
+
+
+def test_loose_fallback_is_not_raced_with_specific_selectors():
+    page = SelectorPage(visible={"//h1", "h1.DUwDvf"})
+
+    assert asyncio.run(wait_for_selectors_or_fallback(page, ["h1.DUwDvf", "[data-attrid]"], ["//h1"], 100, 100))
+    assert page.waits == [["h1.DUwDvf", "[data-attrid]"]]
+
+
+def test_loose_fallback_is_tried_after_specific_selectors_time_out():
+    page = SelectorPage(visible={"//h1"})
+
+    assert asyncio.run(wait_for_selectors_or_fallback(page, ["h1.DUwDvf"], ["//h1"], 100, 100))
+    assert page.waits == [["h1.DUwDvf"], ["//h1"]]
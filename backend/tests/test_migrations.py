@@ -0,0 +1,47 @@
+import os
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+from sqlalchemy import create_engine
+
+from app.models import Base
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# The last released revision; the ones after it change tables in batch mode and also run on SQLite
+RELEASED_HEAD = "0c8b3cd35538"
+
+
+def alembic(database: Path, *args: str):
+    env = {**os.environ, "DATABASE_URL": f"sqlite+aiosqlite:///{database}"}
+    subprocess.run(
+        [sys.executable, "-m", "alembic", *args], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    )
+
+
+def search_job_columns(database: Path) -> set:
+    with sqlite3.connect(database) as connection:
+        return {row[1] for row in connection.execute("PRAGMA table_info(search_jobs)")}
+
+
+def test_new_migrations_run_on_sqlite(tmp_path):
+    database = tmp_path / "migrations.db"
+    engine = create_engine(f"sqlite:///{database}")
+    Base.metadata.create_all(engine)
+    engine.dispose()
+    alembic(database, "stamp", "head")
+
+    alembic(database, "downgrade", RELEASED_HEAD)
+    with sqlite3.connect(database) as connection:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert {"job_queue", "job_checkpoints", "worker_metrics", "enrichment_cache"}.isdisjoint(tables)
+    assert {"query_key", "completed_at", "cached_from_job_id", "cacheable"}.isdisjoint(search_job_columns(database))
+
+    alembic(database, "upgrade", "head")
+    with sqlite3.connect(database) as connection:
+        tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        indexes = {row[1] for row in connection.execute("PRAGMA index_list(search_jobs)")}
+    assert {"job_queue", "job_checkpoints", "worker_metrics", "enrichment_cache"} <= tables
+    assert {"query_key", "completed_at", "cached_from_job_id", "cacheable"} <= search_job_columns(database)
+    assert "ix_search_jobs_query_key" in indexes
@@ -0,0 +1,63 @@
+import importlib
+
+import pytest
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import OutreachMessage
+from app.services.phone_normalization import _region_from_text, normalize_phone, region_hint, unique_phones
+
+
+@pytest.mark.parametrize("text, region", [
+    ("Dentist in Melbourne, FL 32901", "US"),
+    ("123 Main St, Dublin, OH 43017", "US"),
+    ("plumbers in London, KY 40741", "US"),
+    ("cafes Paris TX", "US"),
+    ("restaurants in New South Wales", "AU"),
+    ("Pizza in New Mexico", "US"),
+    ("10 Downing St, London SW1A 2AA, UK", "GB"),
+    ("pubs in Cardiff, Wales", "GB"),
+    ("1 Yonge St, Toronto, ON M5E 1W7", "CA"),
+    ("Dublin, Ireland", "IE"),
+    ("cafes in Mumbai", "IN"),
+])
+def test_region_from_text(text, region):
+    assert _region_from_text(text) == region
+
+
+@pytest.mark.parametrize("text", ["cafes in Paris", "bakeries in London", "dentists in Melbourne"])
+def test_ambiguous_city_names_give_no_region(text):
+    assert _region_from_text(text) is None
+
+
+def test_region_hint_uses_first_text_with_a_place():
+    assert region_hint(None, "", "Dentist in Melbourne, FL 32901") == "US"
+    assert region_hint("restaurants in New South Wales", "12 George St, Sydney NSW 2000") == "AU"
+
+
+def test_us_national_number_parses_with_us_address_hint():
+    region = region_hint("Dentist in Melbourne, FL 32901")
+    assert normalize_phone("(321) 555-0142", region) == "+13215550142"
+    assert unique_phones(["(321) 555-0142", "321.555.0142", "not a phone"], region) == ["+13215550142"]
+
+
+def test_normalize_phone_prefixes():
+    assert normalize_phone("tel:+44 20 7946 0018") == "+442079460018"
+    assert normalize_phone("0044 20 7946 0018") == "+442079460018"
+    assert normalize_phone("") is None
+    assert normalize_phone("12345") is None
+
+
+def test_bulk_message_numbers_parse_with_each_contacts_region(database, run):
+    send_bulk_messages = importlib.import_module("app.routers.import").send_bulk_messages
+    contacts = [
+        {"name": "Dishoom", "phone": "020 7420 9320", "country": "United Kingdom"},
+        {"name": "Joe's Pizza", "phone": "(212) 366-1182", "address": "7 Carmine St, New York, NY 10014"},
+    ]
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            await send_bulk_messages(contacts, "Hi {name}", contact_method="whatsapp", db=db)
+            return (await db.execute(select(OutreachMessage.recipient).order_by(OutreachMessage.id))).scalars().all()
+
+    assert run(scenario()) == ["+442074209320", "+12123661182"]
@@ -0,0 +1,106 @@
+import asyncio
+
+from app.services.pipeline import Pipeline
+
+
+async def numbers(count: int, pulled: list, delay: float = 0):
+    """Source that records every item the pipeline pulls from it"""
+    for number in range(count):
+        pulled.append(number)
+        yield number
+        if delay:
+            await asyncio.sleep(delay)
+
+
+async def passthrough(item):
+    return item
+
+
+def test_full_queue_stops_pulling_the_source(run):
+    pulled = []
+    released = asyncio.Event()
+    saved = []
+
+    async def slow_save(item):
+        await released.wait()
+        saved.append(item)
+        return item
+
+    pipeline = Pipeline("backpressure").add_stage("save", slow_save, concurrency=1, queue_size=3)
+
+    async def scenario():
+        task = asyncio.create_task(pipeline.run(numbers(100, pulled)))
+        await asyncio.sleep(0.2)
+        # One item in the worker, queue_size in the queue, one waiting in put()
+        stalled_at = len(pulled)
+        released.set()
+        return stalled_at, await asyncio.wait_for(task, timeout=5)
+
+    stalled_at, stats = run(scenario())
+
+    assert stalled_at <= 3 + 2
+    assert len(saved) == 100
+    assert stats["save"]["max_queue_depth"] <= 3
+
+
+def test_stages_overlap_with_the_source(run):
+    pulled = []
+    first_saved_after = []
+
+    async def save(item):
+        first_saved_after.append(len(pulled))
+        return item
+
+    pipeline = (
+        Pipeline("overlap")
+        .add_stage("enrich", passthrough, concurrency=2)
+        .add_stage("save", save, concurrency=1)
+    )
+
+    run(pipeline.run(numbers(10, pulled, delay=0.02)))
+
+    # The first item was saved while the source was still producing
+    assert first_saved_after[0] < 10
+
+
+def test_every_worker_stops_with_concurrent_stages(run):
+    saved = []
+
+    async def save(item):
+        await asyncio.sleep(0)
+        saved.append(item)
+        return item
+
+    pipeline = (
+        Pipeline("drain")
+        .add_stage("enrich", passthrough, concurrency=3, queue_size=2)
+        .add_stage("persist", passthrough, concurrency=4, queue_size=2)
+        .add_stage("save", save, concurrency=2, queue_size=2)
+    )
+
+    stats = run(asyncio.wait_for(pipeline.run(numbers(50, [])), timeout=5))
+
+    assert sorted(saved) == list(range(50))
+    assert stats["save"]["emitted"] == 50
+    assert "drain" not in Pipeline.active
+
+
+def test_counters_per_stage(run):
+    async def check(item):
+        if item % 5 == 0:
+            raise ValueError(f"bad item {item}")
+        return None if item % 2 else item
+
+    pipeline = (
+        Pipeline("counters", source_name="scrape")
+        .add_stage("check", check, concurrency=2)
+        .add_stage("save", passthrough)
+    )
+
+    stats = run(pipeline.run(numbers(20, [])))
+
+    # 0, 5, 10, 15 fail; of the rest the odd ones are dropped
+    assert stats["scrape"]["emitted"] == 20
+    assert stats["check"] == {**stats["check"], "received": 20, "failed": 4, "dropped": 8, "emitted": 8}
+    assert stats["save"] == {**stats["save"], "received": 8, "emitted": 8, "dropped": 0}
+    assert Pipeline.totals["check"]["failed"] >= 4
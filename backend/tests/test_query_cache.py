@@ -0,0 +1,190 @@
+import datetime
+
+from sqlalchemy.future import select
+
+from app.database import AsyncSessionLocal
+from app.models import JobQueueEntry, ScrapeResult, SearchJob
+from app.schemas import SearchRequest
+from app.services import search_jobs
+from app.services.query_cache import QueryResultCache
+from app.services.scraper import blocked_fallback_results
+
+
+async def completed_job(cache: QueryResultCache, request: SearchRequest, names, cacheable: bool = True) -> int:
+    async with AsyncSessionLocal() as db:
+        job = SearchJob(
+            query=request.query, limit=request.limit, source=request.source, mode=request.mode,
+            query_key=cache.key(request), status="completed", cacheable=cacheable,
+            completed_at=datetime.datetime.utcnow(),
+        )
+        db.add(job)
+        await db.flush()
+        for name in names:
+            db.add(ScrapeResult(job_id=job.id, name=name, address="7 Carmine St", source="Google Maps"))
+        await db.commit()
+        return job.id
+
+
+async def start(cache: QueryResultCache, request: SearchRequest):
+    """What the search router does: create the job, then try the cache"""
+    async with AsyncSessionLocal() as db:
+        job = SearchJob(
+            query=request.query, limit=request.limit, source=request.source, mode=request.mode,
+            query_key=cache.key(request),
+        )
+        db.add(job)
+        await db.flush()
+        source_id = await cache.materialize(db, job, request)
+        await db.commit()
+        names = (await db.execute(select(ScrapeResult.name).where(ScrapeResult.job_id == job.id))).scalars().all()
+        return source_id, job, names
+
+
+def test_key_folds_case_and_whitespace_of_the_maps_query():
+    cache = QueryResultCache()
+
+    assert cache.key(SearchRequest(query="Pizza  Shop")) == cache.key(SearchRequest(query=" pizza shop"))
+    # preprocess_business_query runs first, as the scrape does
+    assert cache.key(SearchRequest(query="pizza")).startswith("pizza business|")
+
+
+def test_key_separates_deep_fetch_contacts_on_feed_depth():
+    cache = QueryResultCache()
+    feed = SearchRequest(query="pizza shop", depth="feed")
+    deep = SearchRequest(query="pizza shop", depth="feed", deep_fetch_contacts=True)
+    full = SearchRequest(query="pizza shop", depth="full", deep_fetch_contacts=True)
+
+    assert cache.key(feed) != cache.key(deep)
+    assert cache.key(full) == cache.key(SearchRequest(query="pizza shop"))
+
+
+def test_hit_copies_results_of_a_recent_identical_search(database, run):
+    cache = QueryResultCache()
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        source_id = await completed_job(cache, request, ["Joe's Pizza", "Prince St Pizza"])
+        return source_id, await start(cache, request)
+
+    source_id, (cached_from, job, names) = run(scenario())
+
+    assert cached_from == source_id
+    assert job.status == "completed"
+    assert job.cached_from_job_id == source_id
+    assert sorted(names) == ["Joe's Pizza", "Prince St Pizza"]
+    assert cache.stats["hits"] == 1
+
+
+def test_hit_still_exports_the_job_to_its_own_worksheet(database, monkeypatch, run):
+    cache = QueryResultCache()
+    request = SearchRequest(query="pizza shop", limit=5)
+    exported = []
+    monkeypatch.setattr(search_jobs.sheets_service, "save_scraper_results_sync", lambda **kwargs: exported.append(kwargs) or True)
+
+    async def scenario():
+        await completed_job(cache, request, ["Joe's Pizza", "Prince St Pizza"])
+        _, job, _ = await start(cache, request)
+        async with AsyncSessionLocal() as db:
+            entry = (await db.execute(select(JobQueueEntry))).scalar_one()
+        await search_jobs.run_queued_sheets_export(entry.job_id, entry.payload)
+        return job, entry
+
+    job, entry = run(scenario())
+
+    assert entry.kind == "sheets_export" and entry.job_id is None
+    assert [(call["job_id"], call["query"]) for call in exported] == [(job.id, "pizza shop")]
+    assert [row["Name"] for row in exported[0]["results"]] == ["Joe's Pizza", "Prince St Pizza"]
+
+
+def test_miss_on_different_options_and_expired_results(database, run):
+    cache = QueryResultCache(ttl=60)
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        await completed_job(cache, request.model_copy(update={"limit": 10}), ["Joe's Pizza"])
+        expired = await completed_job(cache, request, ["Joe's Pizza"])
+        async with AsyncSessionLocal() as db:
+            job = (await db.execute(select(SearchJob).where(SearchJob.id == expired))).scalar_one()
+            job.completed_at = datetime.datetime.utcnow() - datetime.timedelta(seconds=120)
+            await db.commit()
+        return await start(cache, request)
+
+    cached_from, job, names = run(scenario())
+
+    assert cached_from is None
+    assert job.status == "pending"
+    assert names == []
+    assert cache.stats["misses"] == 1
+
+
+def test_fallback_sample_data_is_not_served(database, run):
+    cache = QueryResultCache()
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        await completed_job(cache, request, ["Sample Business"], cacheable=False)
+        return await start(cache, request)
+
+    cached_from, job, names = run(scenario())
+
+    assert cached_from is None
+    assert names == []
+
+
+def test_force_refresh_skips_the_cache(database, run):
+    cache = QueryResultCache()
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        await completed_job(cache, request, ["Joe's Pizza"])
+        return await start(cache, request.model_copy(update={"force_refresh": True}))
+
+    cached_from, job, names = run(scenario())
+
+    assert cached_from is None
+    assert names == []
+    assert cache.stats["forced_refreshes"] == 1
+
+
+class FakeEnrichment:
+    async def contacts(self, website):
+        return {"emails": [], "phones": []}
+
+    def cancel(self):
+        pass
+
+
+def scrape_job(monkeypatch, run, businesses) -> SearchJob:
+    async def stream(query, max_results, options=None):
+        for business in businesses:
+            yield dict(business)
+
+    monkeypatch.setattr(search_jobs, "stream_google_maps", stream)
+    monkeypatch.setattr(search_jobs.website_enricher, "batch", lambda region=None: FakeEnrichment())
+    monkeypatch.setattr(search_jobs.sheets_service, "save_scraper_results_sync", lambda **kwargs: True)
+    request = SearchRequest(query="pizza shop", limit=5)
+
+    async def scenario():
+        async with AsyncSessionLocal() as db:
+            job = SearchJob(query=request.query, limit=request.limit, source=request.source, mode=request.mode)
+            db.add(job)
+            await db.commit()
+        await search_jobs.process_search_job(job.id, request)
+        async with AsyncSessionLocal() as db:
+            return (await db.execute(select(SearchJob).where(SearchJob.id == job.id))).scalar_one()
+
+    return run(scenario())
+
+
+def test_job_completed_with_fallback_data_is_not_cacheable(database, monkeypatch, run):
+    job = scrape_job(monkeypatch, run, blocked_fallback_results("pizza shop"))
+
+    assert job.status == "completed"
+    assert job.cacheable is False
+
+
+def test_job_completed_with_scraped_listings_is_cacheable(database, monkeypatch, run):
+    job = scrape_job(monkeypatch, run, [{"name": "Joe's Pizza", "address": "7 Carmine St", "phone": ""}])
+
+    assert job.status == "completed"
+    assert job.cacheable is True
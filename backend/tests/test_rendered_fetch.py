@@ -0,0 +1,57 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+from app.services import rendered_fetch
+from app.services.rendered_fetch import RenderedFetcher, looks_js_rendered
+from app.services.scraper import WebsiteScraper
+
+
+class BusyPool:
+    """A browser pool whose slots are all held by Maps jobs"""
+
+    def __init__(self):
+        self.timeouts = []
+
+    @asynccontextmanager
+    async def acquire(self, timeout=None):
+        self.timeouts.append(timeout)
+        await asyncio.wait_for(asyncio.Event().wait(), timeout=timeout)
+        yield None
+
+
+def test_busy_pool_falls_back_to_static_result_quickly(monkeypatch):
+    pool = BusyPool()
+    fetcher = RenderedFetcher(acquire_timeout=0.2)
+    monkeypatch.setattr(rendered_fetch, "browser_pool", pool)
+    monkeypatch.setattr("app.services.scraper.rendered_fetcher", fetcher)
+    static = {"emails": [], "phones": ["+15125550142"]}
+
+    started = time.monotonic()
+    contacts = asyncio.run(WebsiteScraper.render_contacts("https://app.example", static))
+
+    assert contacts == static
+    assert time.monotonic() - started < 2
+    assert pool.timeouts == [0.2]
+    assert fetcher.stats["acquire_timeouts"] == 1
+
+
+def test_render_slot_wait_is_capped():
+    fetcher = RenderedFetcher(max_concurrent=1, acquire_timeout=0.1)
+
+    async def run():
+        await fetcher.semaphore.acquire()  # another render holds the only slot
+        try:
+            await fetcher.fetch("https://app.example")
+        except asyncio.TimeoutError:
+            return True
+        return False
+
+    assert asyncio.run(run()) is True
+    assert fetcher.stats["acquire_timeouts"] == 1
+
+
+def test_looks_js_rendered():
+    assert looks_js_rendered('<html><body><div id="root"></div><script src="/app.js"></script></body></html>')
+    assert not looks_js_rendered("<html><body>" + "<p>Plenty of server rendered text here.</p>" * 50 + "</body></html>")
+    assert not looks_js_rendered("")
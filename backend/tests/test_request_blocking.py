@@ -0,0 +1,144 @@
+from app.services import scraper
+from app.services.request_blocking import ESTIMATED_BYTES_BY_TYPE, BlockingStats, ResourceBlocker
+
+
+class FakeRequest:
+    def __init__(self, resource_type, url):
+        self.resource_type = resource_type
+        self.url = url
+
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = FakeRequest(resource_type, url)
+        self.outcome = None
+
+    async def abort(self):
+        self.outcome = "aborted"
+
+    async def continue_(self):
+        self.outcome = "continued"
+
+
+class FakeSyncRoute(FakeRoute):
+    def abort(self):
+        self.outcome = "aborted"
+
+    def continue_(self):
+        self.outcome = "continued"
+
+
+class FakeContext:
+    def __init__(self):
+        self.handler = None
+
+    async def route(self, pattern, handler):
+        self.handler = handler
+
+
+REQUESTS = [
+    ("image", "https://lh3.googleusercontent.com/p/photo"),
+    ("xhr", "https://www.google.com/maps/vt/pb=tile"),
+    ("font", "https://fonts.gstatic.com/s/roboto.woff2"),
+    ("xhr", "https://www.google.com/search?tbm=map&q=pizza"),
+    ("document", "https://www.google.com/maps"),
+]
+
+
+def test_blocks_by_resource_type_and_url_pattern():
+    blocker = ResourceBlocker()
+
+    assert [blocker.should_block(*request) for request in REQUESTS] == [True, True, True, False, False]
+
+
+def test_installed_handler_counts_and_aborts(run):
+    blocker = ResourceBlocker()
+    context = FakeContext()
+
+    async def scenario():
+        stats = await blocker.install(context)
+        routes = [FakeRoute(*request) for request in REQUESTS]
+        for route in routes:
+            await context.handler(route)
+        return stats, routes
+
+    stats, routes = run(scenario())
+
+    assert [route.outcome for route in routes] == ["aborted", "aborted", "aborted", "continued", "continued"]
+    assert stats.to_dict() == {
+        "allowed_requests": 2,
+        "blocked_requests": 3,
+        "estimated_bytes_saved": ESTIMATED_BYTES_BY_TYPE["image"] + ESTIMATED_BYTES_BY_TYPE["xhr"] + ESTIMATED_BYTES_BY_TYPE["font"],
+        "blocked_by_type": {"image": 1, "xhr": 1, "font": 1},
+    }
+
+
+def test_reports_add_up_across_jobs():
+    blocker = ResourceBlocker()
+    first, second = BlockingStats(), BlockingStats()
+    first.record_blocked("image")
+    second.record_blocked("font")
+    second.allowed_requests = 4
+
+    blocker.report(first)
+    blocker.report(second)
+
+    totals = blocker.get_stats()
+    assert totals["jobs"] == 2
+    assert totals["blocked_requests"] == 2
+    assert totals["allowed_requests"] == 4
+    assert totals["blocked_by_type"] == {"image": 1, "font": 1}
+
+
+def test_disabled_blocker_installs_nothing(run):
+    blocker = ResourceBlocker(enabled=False)
+    context = FakeContext()
+
+    stats = run(blocker.install(context))
+    blocker.report(stats)
+
+    assert context.handler is None
+    assert blocker.get_stats()["jobs"] == 0
+
+
+class FakeSyncPlaywright:
+    """sync_playwright() whose Maps page fails to load after blocking was installed"""
+
+    def __init__(self):
+        self.chromium = self
+
+    def __call__(self):
+        return self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def launch(self, **kwargs):
+        return self
+
+    def new_context(self, **kwargs):
+        return self
+
+    def route(self, pattern, handler):
+        handler(FakeSyncRoute("image", "https://lh3.googleusercontent.com/p/photo"))
+
+    def new_page(self):
+        return self
+
+    def goto(self, url, timeout=None):
+        raise TimeoutError("Maps did not load")
+
+
+def test_failed_sync_scrape_still_reports(monkeypatch):
+    blocker = ResourceBlocker()
+    monkeypatch.setattr(scraper, "resource_blocker", blocker)
+    monkeypatch.setattr(scraper, "sync_playwright", FakeSyncPlaywright())
+
+    results = scraper.scrape_google_maps_sync("pizza", max_results=5)
+
+    assert results == scraper.error_fallback_results()
+    assert blocker.get_stats()["jobs"] == 1
+    assert blocker.get_stats()["blocked_requests"] == 1
@@ -0,0 +1,219 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import scraper
+from app.services.http_client import HttpClient
+from app.services.host_health import HostHealth
+from app.services.latency import LatencyTracker
+from app.services.scraper import WebsiteScraper
+
+
+HOMEPAGE_HTML = '<a href="/contact">Contact us</a><a href="/about">About</a>'
+
+
+async def no_rate_limit(service, identifier="default"):
+    return 0.0
+
+
+@pytest.fixture
+def health(monkeypatch):
+    health = HostHealth(failure_threshold=1)
+
+    async def lookup(host):
+        return ["192.0.2.1"], 300
+
+    # Every host resolves, tests put the ones they want unhealthy in the negative cache
+    monkeypatch.setattr(health, "_lookup", lookup)
+    monkeypatch.setattr(scraper, "host_health", health)
+    monkeypatch.setattr(scraper, "wait_for_rate_limit", no_rate_limit)
+    return health
+
+
+def test_contact_page_timeout_does_not_open_the_circuit(monkeypatch, health):
+    async def fetch_contacts(url):
+        raise httpx.ReadTimeout(f"slow {url}")
+
+    monkeypatch.setattr(WebsiteScraper, "fetch_contacts", staticmethod(fetch_contacts))
+    homepage = {"emails": [], "phones": ["+15550100"]}
+
+    contacts = asyncio.run(WebsiteScraper.crawl_contacts("https://example.com", homepage, HOMEPAGE_HTML))
+
+    assert contacts == {"emails": [], "phones": ["+15550100"]}
+    assert health.circuits == {}
+
+
+def test_contact_page_email_is_returned(monkeypatch, health):
+    async def fetch_contacts(url):
+        if url.endswith("/contact"):
+            return {"emails": ["hello@example.com"], "phones": []}
+        return {"emails": [], "phones": []}
+
+    monkeypatch.setattr(WebsiteScraper, "fetch_contacts", staticmethod(fetch_contacts))
+
+    contacts = asyncio.run(
+        WebsiteScraper.crawl_contacts("https://example.com", {"emails": [], "phones": []}, HOMEPAGE_HTML)
+    )
+
+    assert contacts["emails"] == ["hello@example.com"]
+
+
+@pytest.fixture
+def latency(monkeypatch):
+    tracker = LatencyTracker(hedge_delay=0.5)
+    monkeypatch.setattr(scraper, "latency_tracker", tracker)
+    return tracker
+
+
+def fake_fetch_page(pages, delays=None):
+    """fetch_page replacement: pages maps URL -> contacts or an exception to raise"""
+    fetched = []
+
+    async def fetch_page(url, keep_html_bytes=0):
+        fetched.append(url)
+        await asyncio.sleep((delays or {}).get(url, 0))
+        result = pages.get(url, httpx.ConnectError(f"no route to {url}"))
+        if isinstance(result, Exception):
+            raise result
+        return result, "<html></html>"
+
+    return fetch_page, fetched
+
+
+def test_hedge_url_variants():
+    assert WebsiteScraper.hedge_url("https://example.com", hedge_scheme=True) == "http://example.com"
+    assert WebsiteScraper.hedge_url("https://example.com/", hedge_scheme=False) == "https://www.example.com/"
+    assert WebsiteScraper.hedge_url("https://www.example.com", hedge_scheme=False) == "https://example.com"
+    assert WebsiteScraper.hedge_url("https://shop.example.com", hedge_scheme=False) is None
+
+
+def test_stalled_homepage_is_won_by_the_hedge(monkeypatch, health, latency):
+    found = {"emails": ["hi@example.com"], "phones": []}
+    fetch_page, fetched = fake_fetch_page(
+        {"https://example.com": found, "https://www.example.com": found},
+        delays={"https://example.com": 5},
+    )
+    monkeypatch.setattr(WebsiteScraper, "fetch_page", staticmethod(fetch_page))
+
+    contacts, _, page_url = asyncio.run(WebsiteScraper.fetch_homepage("https://example.com", "https://www.example.com"))
+
+    assert contacts == found
+    assert page_url == "https://www.example.com"
+    assert latency.stats == {**latency.stats, "hedges_started": 1, "hedges_won": 1}
+
+
+def test_hedge_is_not_started_on_an_unhealthy_host(monkeypatch, health, latency):
+    health.negative["www.example.com"] = "nxdomain"
+    fetch_page, fetched = fake_fetch_page({})
+    monkeypatch.setattr(WebsiteScraper, "fetch_page", staticmethod(fetch_page))
+
+    with pytest.raises(httpx.ConnectError):
+        asyncio.run(WebsiteScraper.fetch_homepage("https://example.com", "https://www.example.com"))
+
+    assert fetched == ["https://example.com"]
+    assert latency.stats["hedges_started"] == 0
+
+
+def test_bare_domain_without_address_falls_back_to_www(monkeypatch, health, latency):
+    async def check(url):
+        return "dns: no address records" if urlsplit(url).hostname == "example.com" else None
+
+    monkeypatch.setattr(health, "check", check)
+    found = {"emails": ["hi@example.com"], "phones": []}
+    fetch_page, fetched = fake_fetch_page({"https://www.example.com": found})
+    monkeypatch.setattr(WebsiteScraper, "fetch_page", staticmethod(fetch_page))
+
+    contacts = asyncio.run(WebsiteScraper.scrape_website("example.com"))
+
+    assert contacts == found
+    assert fetched[0] == "https://www.example.com"
+    assert "example.com" not in fetched and "https://example.com" not in fetched
+
+
+def test_unhealthy_host_without_alternative_is_skipped(monkeypatch, health, latency):
+    health.negative["shop.example.com"] = "nxdomain"
+    fetch_page, fetched = fake_fetch_page({})
+    monkeypatch.setattr(WebsiteScraper, "fetch_page", staticmethod(fetch_page))
+
+    assert asyncio.run(WebsiteScraper.scrape_website("https://shop.example.com"))["failed"] is True
+    assert fetched == []
+
+
+CONTACTS_HTML = "".join(
+    f"<p>Write to team{i}@joespizzanyc.com or call +1 212 555 010{i}</p>" for i in range(5)
+)
+
+
+class Chunks(httpx.AsyncByteStream):
+    """Streamed body that records how many chunks were read"""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk
+
+
+def serve(monkeypatch, content_type, chunks):
+    body = Chunks(chunks)
+    client = HttpClient(http2=False)
+
+    def handler(request):
+        return httpx.Response(200, headers={"content-type": content_type}, stream=body)
+
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    monkeypatch.setattr(scraper, "http_client", client)
+    monkeypatch.setattr(WebsiteScraper, "stats", dict.fromkeys(WebsiteScraper.stats, 0))
+    return body
+
+
+def test_disallowed_content_type_is_skipped_before_the_body(monkeypatch, latency):
+    body = serve(monkeypatch, "application/pdf", [b"%PDF-1.7"] * 10)
+
+    contacts = asyncio.run(WebsiteScraper.fetch_contacts("https://joespizzanyc.com/menu.pdf"))
+
+    assert contacts == {"emails": [], "phones": []}
+    assert body.read == 0
+    assert WebsiteScraper.stats["skipped_content_type"] == 1
+    assert WebsiteScraper.stats["pages_fetched"] == 0
+
+
+def test_reading_stops_at_the_body_cap(monkeypatch, latency):
+    monkeypatch.setattr(settings, "ENRICHMENT_MAX_BODY_BYTES", 100_000)
+    body = serve(monkeypatch, "text/html; charset=utf-8", [b"<p>" + b"x" * 16_000 + b"</p>"] * 20)
+
+    asyncio.run(WebsiteScraper.fetch_contacts("https://joespizzanyc.com"))
+
+    assert body.read < 20
+    assert WebsiteScraper.stats["truncated_at_cap"] == 1
+    assert 100_000 <= WebsiteScraper.stats["bytes_read"] < 120_000
+
+
+def test_reading_stops_once_enough_contacts_were_found(monkeypatch, latency):
+    body = serve(monkeypatch, "", [CONTACTS_HTML.encode()] + [b"<p>more</p>"] * 20)
+
+    contacts = asyncio.run(WebsiteScraper.fetch_contacts("https://joespizzanyc.com"))
+
+    assert len(contacts["emails"]) == 5
+    assert len(contacts["phones"]) == 3
+    assert body.read < 21
+    assert WebsiteScraper.stats["early_exits"] == 1
+
+
+def test_reading_stops_at_the_first_email_and_phone_well_before_the_cap(monkeypatch, latency):
+    page = b'<p>Reservations: <a href="mailto:hello@joespizzanyc.com">email us</a> or +1 212 366 1182</p>'
+    body = serve(monkeypatch, "text/html", [page] + [b"<p>" + b"x" * 16_000 + b"</p>"] * 200)
+
+    contacts = asyncio.run(WebsiteScraper.fetch_contacts("https://joespizzanyc.com"))
+
+    assert contacts == {"emails": ["hello@joespizzanyc.com"], "phones": ["+12123661182"]}
+    assert body.read <= 2
+    assert WebsiteScraper.stats["early_exits"] == 1
+    assert WebsiteScraper.stats["truncated_at_cap"] == 0
+    assert WebsiteScraper.stats["bytes_read"] < settings.ENRICHMENT_MAX_BODY_BYTES
@@ -0,0 +1,47 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# Runs `python -m app.worker --concurrency 8` without starting the event loop,
+# then reports how the pools and workers were sized
+RUN_WORKER = """
+import asyncio, runpy, sys
+asyncio.run = lambda coroutine: coroutine.close()
+sys.argv = ["app.worker", "--concurrency", "8"]
+runpy.run_module("app.worker", run_name="__main__")
+from app.database import engine, queue_engine
+from app.services.job_queue import job_workers
+print(job_workers.concurrency, queue_engine.pool.size(), engine.pool.size())
+"""
+
+# Imports the database like the API does, without running workers
+RUN_API = """
+from app.database import engine
+print(engine.pool.size())
+"""
+
+
+def run_backend(script: str, **env_overrides) -> list:
+    env = {**os.environ, **env_overrides}
+    for name in ("JOB_WORKER_CONCURRENCY", "DATABASE_POOL_SIZE", "JOB_WORKER_PROCESS", "JOB_WORKERS_IN_API"):
+        if name not in env_overrides:
+            env.pop(name, None)
+    return subprocess.run(
+        [sys.executable, "-c", script], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True
+    ).stdout.splitlines()[-1].split()  # the app logger writes to stdout too
+
+
+def test_concurrency_flag_sizes_the_database_pools():
+    # 5 for API requests, plus 8 jobs * (10 enrich + 2 persist + 2)
+    assert run_backend(RUN_WORKER) == ["8", "9", "117"]
+
+
+def test_api_without_job_workers_keeps_a_small_pool():
+    assert run_backend(RUN_API) == ["5"]
+
+
+def test_api_running_job_workers_gets_the_job_sized_pool():
+    assert run_backend(RUN_API, JOB_WORKERS_IN_API="true") == ["33"]
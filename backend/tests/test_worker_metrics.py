@@ -0,0 +1,64 @@
+import asyncio
+import datetime
+import json
+
+from app.database import AsyncSessionLocal
+from app.models import WorkerMetrics
+from app.services.worker_metrics import WorkerMetricsPublisher, process_stats
+
+
+def test_process_stats_are_json_serializable():
+    stats = process_stats()
+    assert {"browser_pool", "enrichment", "pipelines", "job_checkpoints"} <= set(stats)
+    json.dumps(stats)
+
+
+def test_published_snapshot_is_visible_until_stale(database):
+    publisher = WorkerMetricsPublisher(interval=15)
+    publisher.worker_id = "worker-host:1"
+
+    async def scenario():
+        await publisher.publish()
+        live = await publisher.live_workers()
+
+        async with AsyncSessionLocal() as db:
+            row = await db.get(WorkerMetrics, "worker-host:1")
+            row.updated_at = datetime.datetime.utcnow() - datetime.timedelta(minutes=5)
+            await db.commit()
+        return live, await publisher.live_workers()
+
+    live, after_stale = asyncio.run(scenario())
+    assert live["worker-host:1"]["role"] == "worker"
+    assert "browser_pool" in live["worker-host:1"]
+    assert after_stale == {}
+
+
+def test_stop_removes_the_snapshot(database):
+    publisher = WorkerMetricsPublisher(interval=15)
+
+    async def scenario():
+        await publisher.start()
+        await asyncio.sleep(0.1)
+        published = await publisher.live_workers()
+        await publisher.stop()
+        return published, await publisher.live_workers()
+
+    published, after_stop = asyncio.run(scenario())
+    assert list(published) == [publisher.worker_id]
+    assert after_stop == {}
+
+
+def test_api_metrics_label_the_process_and_include_workers(database):
+    from app.routers.metrics import get_metrics
+
+    publisher = WorkerMetricsPublisher(interval=15)
+    publisher.worker_id = "worker-host:2"
+
+    async def scenario():
+        await publisher.publish()
+        return await get_metrics()
+
+    metrics = asyncio.run(scenario())
+    assert metrics["process"]["role"] == "api"
+    assert "depth" in metrics["job_queue"]
+    assert list(metrics["workers"]) == ["worker-host:2"]